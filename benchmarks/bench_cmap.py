@@ -0,0 +1,49 @@
+"""Building and resolving colormaps
+
+"cold" timings empty the colormap cache before each call, so that they
+measure building the colormap; the other timings measure a cached lookup.
+"""
+from common import measure, report
+
+from colormap import Colormap, cmap_builder, cmap_cache
+from colormap.lut import lut_builder
+
+SPECS = {
+    "matplotlib name": ("viridis",),
+    "diverging_black name": ("red_black_blue",),
+    "2 colors": ("red", "white"),
+    "3 colors": ("red", "white", "#0000FF"),
+}
+
+
+def _cold(func):
+    def wrapper():
+        cmap_cache.clear()
+        return func()
+
+    return wrapper
+
+
+def run():
+    c = Colormap()
+    heat = {"blue": [0, 0, 0, 0, 1], "green": [0, 0.35, 0.7, 1, 1], "red": [1, 1, 1, 1, 1]}
+    results = {}
+    for label, spec in SPECS.items():
+        results[f"cmap_builder {label} (cold)"] = measure(_cold(lambda: cmap_builder(*spec)))
+        results[f"cmap_builder {label}"] = measure(lambda: cmap_builder(*spec))
+    results["Colormap.cmap dict (cold)"] = measure(_cold(lambda: c.cmap(heat)))
+    results["Colormap.cmap dict"] = measure(lambda: c.cmap(heat))
+    results["Colormap.cmap dict reversed"] = measure(lambda: c.cmap(heat, reverse=True))
+    results["Colormap.cmap_linear (cold)"] = measure(_cold(lambda: c.cmap_linear("red", "white", "blue")))
+    results["Colormap.cmap_linear oklab (cold)"] = measure(
+        _cold(lambda: c.cmap_linear("red", "white", "blue", interp_space="oklab"))
+    )
+    results["Colormap.colormaps"] = measure(lambda: c.colormaps)
+    results["colormap N=256 evaluated (cold)"] = measure(_cold(lambda: cmap_builder("red", "white", "blue")(0.5)))
+    results["lut_builder 3 colors (cold)"] = measure(_cold(lambda: lut_builder(["red", "white", "blue"])))
+    results["lut_builder 3 colors"] = measure(lambda: lut_builder(["red", "white", "blue"]))
+    return results
+
+
+if __name__ == "__main__":
+    report(run())
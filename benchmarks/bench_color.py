@@ -0,0 +1,25 @@
+"""Creation of Color instances from each kind of input and attribute access"""
+from common import measure, report
+
+from colormap import Color
+
+
+def run():
+    red = Color("red")
+    results = {
+        "Color(name)": measure(lambda: Color("red")),
+        "Color(name with spaces)": measure(lambda: Color("dark slate gray")),
+        "Color(hex 6 digits)": measure(lambda: Color("#FF0000")),
+        "Color(hex 3 digits)": measure(lambda: Color("#F00")),
+        "Color(rgb=...)": measure(lambda: Color(rgb=(1, 0, 0))),
+        "Color(hsv=...)": measure(lambda: Color(hsv=(0, 1, 1))),
+        "Color(hls=...)": measure(lambda: Color(hls=(0, 0.5, 1))),
+        "Color(Color)": measure(lambda: Color(red)),
+        "Color.hsv (cached)": measure(lambda: red.hsv),
+        "Color.lightness setter": measure(lambda: setattr(red, "lightness", 0.4)),
+    }
+    return results
+
+
+if __name__ == "__main__":
+    report(run())
@@ -0,0 +1,33 @@
+"""Scaling of apply_colormap with the number of threads
+
+Usage::
+
+    python bench_colorize.py [size]
+
+colorizes a size x size float32 array (default 4000) with 1 to N workers,
+N being the number of CPUs.
+"""
+import os
+import sys
+
+import numpy as np
+from common import measure, report
+
+from colormap.colorize import apply_colormap
+
+
+def run(size=4000):
+    data = np.random.default_rng(0).random((size, size), dtype=np.float32)
+    out = np.empty(data.shape + (4,), dtype=np.uint8)
+    ncpus = os.cpu_count() or 1
+    workers = sorted({1, 2, 4, 8, 16, ncpus} & set(range(1, ncpus + 1)))
+    results = {}
+    for n in workers:
+        results[f"apply_colormap {size}x{size} workers={n}"] = measure(
+            lambda: apply_colormap(data, "viridis", 0, 1, out=out, workers=n), repeat=3
+        )
+    return results
+
+
+if __name__ == "__main__":
+    report(run(*[int(x) for x in sys.argv[1:]]))
@@ -0,0 +1,53 @@
+"""Scalar and vectorised color conversions
+
+Usage::
+
+    python bench_conversions.py [size]
+
+scalar functions convert a single triplet; the *_array functions convert
+size triplets at once (default 1000000).
+"""
+import sys
+
+import numpy as np
+from common import measure, report
+
+from colormap import colors
+
+
+def run(size=1000000):
+    rgb = np.random.default_rng(0).random((size, 3))
+    rgb255 = np.round(rgb * 255).astype(np.uint8)
+    hexes = colors.rgb2hex_array(rgb255)
+    hsv = colors.rgb2hsv_array(rgb)
+    hls = colors.rgb2hls_array(rgb)
+    out = np.empty_like(rgb)
+
+    results = {
+        "hex2rgb": measure(lambda: colors.hex2rgb("#FFAA11")),
+        "hex2rgb (normalise)": measure(lambda: colors.hex2rgb("#FFAA11", normalise=True)),
+        "rgb2hex": measure(lambda: colors.rgb2hex(255, 170, 17)),
+        "hex2web": measure(lambda: colors.hex2web("#FFAA11")),
+        "web2hex": measure(lambda: colors.web2hex("#FA1")),
+        "rgb2hsv": measure(lambda: colors.rgb2hsv(0.2, 0.4, 0.6)),
+        "hsv2rgb": measure(lambda: colors.hsv2rgb(0.2, 0.4, 0.6)),
+        "rgb2hls": measure(lambda: colors.rgb2hls(0.2, 0.4, 0.6)),
+        "hls2rgb": measure(lambda: colors.hls2rgb(0.2, 0.4, 0.6)),
+        "rgb2yuv": measure(lambda: colors.rgb2yuv(0.2, 0.4, 0.6)),
+    }
+    batch = {
+        "hex2rgb_array": lambda: colors.hex2rgb_array(hexes),
+        "rgb2hex_array": lambda: colors.rgb2hex_array(rgb255),
+        "rgb2hsv_array": lambda: colors.rgb2hsv_array(rgb, out=out),
+        "hsv2rgb_array": lambda: colors.hsv2rgb_array(hsv, out=out),
+        "rgb2hls_array": lambda: colors.rgb2hls_array(rgb, out=out),
+        "hls2rgb_array": lambda: colors.hls2rgb_array(hls, out=out),
+        "rgb2yuv_array": lambda: colors.rgb2yuv_array(rgb, out=out),
+    }
+    for name, func in batch.items():
+        results[f"{name} x{size}"] = measure(func, repeat=3)
+    return results
+
+
+if __name__ == "__main__":
+    report(run(*[int(x) for x in sys.argv[1:]]))
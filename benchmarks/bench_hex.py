@@ -0,0 +1,69 @@
+"""Validation of hexadecimal strings
+
+Compares parse_hex_color (compiled regular expression, no exception) with
+the previous implementation of HEX.is_valid_hex_color, which called
+get_standard_hex_color and caught the exception raised for invalid values
+(e.g. color names passed to Color).
+
+Usage::
+
+    python bench_hex.py
+"""
+from common import measure, report
+
+from colormap.colors import HEX, Color, hex2rgb, parse_hex_color
+
+
+def _legacy_standard_hex(value):
+    # get_standard_hex_color before parse_hex_color was introduced
+    if isinstance(value, str) == False:
+        raise TypeError("value must be a string")
+    if len(value) <= 3:
+        raise ValueError("input string must be of type 0xFFF, 0xFFFFFF or #FFF or #FFFFFF")
+    if value.startswith("0x") or value.startswith("0X"):
+        value = value[2:]
+    elif value.startswith("#"):
+        value = value[1:]
+    else:
+        raise ValueError("hexa string must start with a '#' sign or '0x' string")
+    value = value.upper()
+    for x in value:
+        if x not in "0123456789ABCDEF":
+            raise ValueError("Found invalid hexa character {0}".format(x))
+    if len(value) == 6 or len(value) == 8:
+        value = "#" + value[0:6]
+    elif len(value) == 3:
+        value = "#" + value[0] * 2 + value[1] * 2 + value[2] * 2
+    else:
+        raise ValueError("hexa string should be 3, 6 or 8 digits. if 8 digits, last 2 are ignored")
+    return value
+
+
+def _legacy_is_valid(value):
+    try:
+        _legacy_standard_hex(value)
+        return True
+    except Exception:
+        return False
+
+
+def _legacy_hex2rgb(value):
+    value = _legacy_standard_hex(value)[1:]
+    return int(value[0:2], 16), int(value[2:4], 16), int(value[4:6], 16)
+
+
+def run():
+    results = {}
+    for label, value in (("valid", "#ffaa11"), ("invalid name", "dark slate gray")):
+        results[f"legacy is_valid_hex_color ({label})"] = measure(lambda: _legacy_is_valid(value))
+        results[f"HEX.is_valid_hex_color ({label})"] = measure(lambda: HEX().is_valid_hex_color(value, verbose=False))
+        results[f"parse_hex_color ({label})"] = measure(lambda: parse_hex_color(value))
+    results["legacy hex2rgb"] = measure(lambda: _legacy_hex2rgb("#ffaa11"))
+    results["hex2rgb"] = measure(lambda: hex2rgb("#ffaa11"))
+    results["Color(name)"] = measure(lambda: Color("dark slate gray"))
+    results["Color(hex)"] = measure(lambda: Color("#ffaa11"))
+    return results
+
+
+if __name__ == "__main__":
+    report(run())
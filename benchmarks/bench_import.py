@@ -0,0 +1,43 @@
+"""Cold import time of the colormap package
+
+Each statement runs in a fresh interpreter. The second statement accesses
+colormap.colormap_names, which is what "import colormap" used to do
+eagerly (importing matplotlib) before version 1.4.0.
+"""
+import os
+import subprocess
+import sys
+
+from common import SRC, report
+
+STATEMENTS = {
+    "import colormap": "import colormap",
+    "import colormap + colormap_names": "import colormap; colormap.colormap_names",
+    "import colormap + hex2rgb": "import colormap; colormap.hex2rgb('#FFF')",
+    "import colormap + version": "import colormap; colormap.version",
+}
+
+TEMPLATE = """import time
+t0 = time.perf_counter()
+{statement}
+print(time.perf_counter() - t0)
+"""
+
+
+def cold_import(statement, repeat=10):
+    """Return the best time (seconds) to run *statement* in a new interpreter"""
+    env = dict(os.environ, PYTHONPATH=SRC, MPLBACKEND="Agg")
+    code = TEMPLATE.format(statement=statement)
+    timings = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", code], env=env, check=True, capture_output=True, text=True)
+        timings.append(float(output.stdout))
+    return min(timings)
+
+
+def run():
+    return {name: cold_import(statement) for name, statement in STATEMENTS.items()}
+
+
+if __name__ == "__main__":
+    report(run())
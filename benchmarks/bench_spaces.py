@@ -0,0 +1,50 @@
+"""Conversions between sRGB and the perceptual color spaces
+
+Usage::
+
+    python bench_spaces.py [width height]
+
+converts an image of width x height pixels (default 1920 x 1080) with the
+vectorised functions, and a single triplet with the scalar functions.
+"""
+import sys
+
+import numpy as np
+from common import measure, report
+
+from colormap.colors import (
+    Color,
+    delta_e2000,
+    lab2rgb_array,
+    oklab2rgb_array,
+    rgb2lab,
+    rgb2lab_array,
+    rgb2lch_array,
+    rgb2oklab,
+    rgb2oklab_array,
+)
+
+
+def run(width=1920, height=1080):
+    image = np.random.default_rng(0).random((height, width, 3))
+    lab = rgb2lab_array(image)
+    oklab = rgb2oklab_array(image)
+    out = np.empty_like(image)
+    size = f"{width}x{height}"
+    results = {
+        f"rgb2lab_array {size}": measure(lambda: rgb2lab_array(image, out=out), repeat=3),
+        f"lab2rgb_array {size}": measure(lambda: lab2rgb_array(lab, out=out), repeat=3),
+        f"rgb2lch_array {size}": measure(lambda: rgb2lch_array(image, out=out), repeat=3),
+        f"rgb2oklab_array {size}": measure(lambda: rgb2oklab_array(image, out=out), repeat=3),
+        f"oklab2rgb_array {size}": measure(lambda: oklab2rgb_array(oklab, out=out), repeat=3),
+        f"delta_e2000 {size}": measure(lambda: delta_e2000(lab, lab[::-1]), repeat=3),
+        "rgb2lab (scalar)": measure(lambda: rgb2lab(0.2, 0.4, 0.6)),
+        "rgb2oklab (scalar)": measure(lambda: rgb2oklab(0.2, 0.4, 0.6)),
+    }
+    color = Color("red")
+    results["Color.lab"] = measure(lambda: color.lab)
+    return results
+
+
+if __name__ == "__main__":
+    report(run(*[int(x) for x in sys.argv[1:]]))
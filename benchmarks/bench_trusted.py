@@ -0,0 +1,26 @@
+"""Scalar conversions and Color setters with and without trusted()"""
+from common import measure, report
+
+from colormap import Color
+from colormap.colors import hls2rgb, rgb2hex, rgb2hls, trusted
+
+
+def run():
+    color = Color("red")
+    cases = {
+        "rgb2hex": lambda: rgb2hex(0.2, 0.4, 0.6, normalised=True),
+        "rgb2hls": lambda: rgb2hls(0.2, 0.4, 0.6),
+        "hls2rgb": lambda: hls2rgb(0.2, 0.4, 0.6),
+        "Color.hue setter": lambda: setattr(color, "hue", 0.3),
+        "Color.rgb setter": lambda: setattr(color, "rgb", (0.2, 0.4, 0.6)),
+    }
+    results = {}
+    for name, stmt in cases.items():
+        results[name] = measure(stmt)
+        with trusted():
+            results[f"{name} (trusted)"] = measure(stmt)
+    return results
+
+
+if __name__ == "__main__":
+    report(run())
@@ -0,0 +1,35 @@
+"""Helpers shared by the benchmark scripts
+
+The benchmarks run against the source tree (src/ directory) rather than an
+installed version of colormap.
+"""
+import os
+import sys
+import timeit
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+sys.path.insert(0, SRC)
+
+
+def measure(stmt, setup="pass", repeat=5, globals=None):
+    """Return the best time per call (in seconds) of *stmt*
+
+    *stmt* and *setup* can be strings or callables as in :mod:`timeit`.
+    """
+    timer = timeit.Timer(stmt, setup, globals=globals)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number
+
+
+def format_time(seconds):
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:8.2f} {unit}"
+    return f"{seconds / 1e-9:8.2f} ns"
+
+
+def report(results):
+    """Print the results (a dictionary of timings in seconds)"""
+    width = max(len(name) for name in results)
+    for name, seconds in results.items():
+        print(f"{name:<{width}}  {format_time(seconds)}")
@@ -0,0 +1,109 @@
+"""Run the benchmarks and save the timings in a JSON file
+
+Each bench_*.py module of this directory provides a run() function
+returning a dictionary of timings (seconds). This script runs them all (or
+those matching -k) and saves the results with the versions of the
+software, so that runs of different releases can be compared::
+
+    python run.py -o results-1.4.0.json
+    python run.py -k color -k cmap
+    python run.py -o new.json --compare results-1.4.0.json
+
+The benchmarks do not need a network connection. The JSON file looks like::
+
+    {"colormap": "1.4.0", "python": "3.12.1", ..., "date": "...",
+     "results": {"bench_color": {"Color(name)": 3.5e-06, ...}, ...}}
+"""
+import argparse
+import datetime
+import glob
+import importlib
+import json
+import os
+import platform
+import sys
+
+from common import format_time, report
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def find_benchmarks(patterns=None):
+    """Return the names of the benchmark modules (matching one of *patterns*)"""
+    names = sorted(os.path.basename(x)[:-3] for x in glob.glob(os.path.join(HERE, "bench_*.py")))
+    if patterns:
+        names = [name for name in names if any(pattern in name for pattern in patterns)]
+    return names
+
+
+def source_version():
+    """Return the version of colormap declared in pyproject.toml
+
+    The benchmarks run against the source tree, which may not be installed.
+    """
+    import re
+
+    with open(os.path.join(os.path.dirname(HERE), "pyproject.toml")) as fin:
+        match = re.search(r'^version\s*=\s*"([^"]+)"', fin.read(), re.MULTILINE)
+    return match.group(1) if match else "unknown"
+
+
+def environment():
+    """Return the versions of the software and the machine description"""
+    import matplotlib
+    import numpy
+
+    return {
+        "colormap": source_version(),
+        "python": platform.python_version(),
+        "numpy": numpy.__version__,
+        "matplotlib": matplotlib.__version__,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+    }
+
+
+def run(names):
+    results = {}
+    for name in names:
+        print(f"# {name}", flush=True)
+        module = importlib.import_module(name)
+        results[name] = module.run()
+        report(results[name])
+    return results
+
+
+def compare(results, previous):
+    """Print the ratio of the timings with those of a previous run"""
+    print(f"\n# compared with {previous.get('colormap')} ({previous.get('date')})")
+    for module, timings in results.items():
+        for name, seconds in timings.items():
+            before = previous["results"].get(module, {}).get(name)
+            if before:
+                print(f"{module}: {name:<45} {format_time(before)} -> {format_time(seconds)}  x{before / seconds:.2f}")
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-o", "--output", help="JSON file where to save the results")
+    parser.add_argument("-k", dest="patterns", action="append", help="run the modules whose name contains this string")
+    parser.add_argument("--compare", help="JSON file of a previous run to compare with")
+    options = parser.parse_args(args)
+
+    names = find_benchmarks(options.patterns)
+    if not names:
+        parser.error("no benchmark found")
+    data = dict(environment(), results=run(names))
+    if options.output:
+        with open(options.output, "w") as fout:
+            json.dump(data, fout, indent=2)
+    if options.compare:
+        with open(options.compare) as fin:
+            compare(data["results"], json.load(fin))
+    return data
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, HERE)
+    main()
@@ -15,10 +15,12 @@
 #
 ##############################################################################
 """main colormap module"""
-from importlib import metadata
 
 
 def get_package_version(package_name):
+    # importlib.metadata is slow to import, so keep it local
+    from importlib import metadata
+
     try:
         version = metadata.version(package_name)
         return version
@@ -26,16 +28,49 @@ def get_package_version(package_name):
         return f"{package_name} not found"
 
 
-version = get_package_version("colormap")
-
-
 from . import colors
+from .cache import *
 from .colors import *
 from .get_cmap import *
 from .xfree86 import *
 
 c = Colormap()
-colormap_names = c.colormaps + c.diverging_black
-# create an alias to test_colormap methiod
-test_colormap = c.test_colormap
-test_cmap = c.test_colormap
+
+# attributes of the modules relying on numpy, imported on first access
+_lazy_imports = {
+    "lut_builder": "lut",
+    "listed_cmap": "lut",
+    "apply_colormap": "colorize",
+    "ColorArray": "colorarray",
+    "nearest_name": "nearest",
+    "quantize": "quantize",
+    "extract_palette": "quantize",
+    "ColorCube": "cube",
+    "DiscreteColormap": "discrete",
+    "render_async": "aio",
+    "colorize_files": "batch",
+}
+
+
+def __getattr__(name):
+    # colormap_names requires matplotlib, and version importlib.metadata, which
+    # are slow to import. Those attributes are computed on first access only.
+    if name == "version":
+        value = get_package_version("colormap")
+    elif name == "colormap_names":
+        value = c.colormaps + c.diverging_black
+    elif name in ("test_colormap", "test_cmap"):
+        # create an alias to test_colormap method
+        value = c.test_colormap
+    elif name in _lazy_imports:
+        from importlib import import_module
+
+        value = getattr(import_module(f".{_lazy_imports[name]}", __name__), name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + ["version", "colormap_names", "test_colormap", "test_cmap"] + list(_lazy_imports))
@@ -0,0 +1,180 @@
+# -*- python -*-
+#
+#  This file is part of colormap software
+#
+#  Copyright (c) 2011-2024
+#
+#  File author(s): Thomas Cokelaer <cokelaer@gmail.com>
+#
+#  Distributed under the terms of the 3-clause BSD license.
+#  The full license is in the LICENSE file, distributed with this software.
+#
+##############################################################################
+"""Colorize arrays from asyncio code without blocking the event loop
+
+:func:`render_async` is the asyncio version of
+:func:`~colormap.colorize.apply_colormap`. Building the lookup table and
+colorizing the data are run in a bounded pool of threads::
+
+    >>> from colormap.aio import render_async
+    >>> async def tile(data):
+    ...     rgba = await render_async(data, "viridis", vmin=0, vmax=1)
+    ...     return rgba
+
+The colormaps are resolved as in :func:`~colormap.lut.lut_builder` (names
+known by :func:`~colormap.get_cmap.cmap_builder`, dictionaries or lists of
+colors) and the tables are cached in :data:`colormap.cache.cmap_cache`.
+Concurrent requests for the same colormap that is not cached yet wait for a
+single build.
+
+The data are colorized chunk by chunk, one task of the pool per chunk, so
+that other requests are served in between. If the calling task is
+cancelled, the remaining chunks are not processed.
+
+A :class:`RenderService` holds the pool of threads. The functions of this
+module use a default service with at most 4 threads; create your own to
+choose the number of threads.
+"""
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from colormap.cache import cmap_cache
+from colormap.colorize import _chunk_range, _colorize, _get_lut, _limits, _prepare
+from colormap.lut import _lut_key
+
+__all__ = ["RenderService", "render_async", "lut_async", "cmap_async"]
+
+
+class RenderService:
+    """Run the colormap builds and the colorization in a pool of threads
+
+    :param int max_workers: number of threads. Defaults to the number of
+        CPUs, at most 4.
+    :param executor: an existing concurrent.futures executor to use instead
+        (it is not shut down by :meth:`shutdown`)
+
+    ::
+
+        >>> service = RenderService(max_workers=2)
+        >>> rgba = await service.render(data, "viridis")  # doctest: +SKIP
+        >>> service.shutdown()
+    """
+
+    def __init__(self, max_workers=None, executor=None):
+        if executor is None:
+            if max_workers is None:
+                max_workers = min(4, os.cpu_count() or 1)
+            executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="colormap")
+            self._owns_executor = True
+        else:
+            self._owns_executor = False
+        self.executor = executor
+        # (event loop, key) -> future of the build in progress
+        self._pending = {}
+
+    def shutdown(self, wait=True):
+        """Shut down the pool of threads (if created by the service)"""
+        if self._owns_executor:
+            self.executor.shutdown(wait=wait)
+
+    def _run(self, func, *args):
+        return asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    async def _coalesce(self, key, func, *args):
+        # call func in the pool once for all the concurrent calls with the
+        # same key. The shared future is shielded so that cancelling one of
+        # the callers does not cancel the build awaited by the others.
+        if key is None:
+            return await self._run(func, *args)
+        pending = (asyncio.get_running_loop(), key)
+        future = self._pending.get(pending)
+        if future is None:
+            future = self._run(func, *args)
+            self._pending[pending] = future
+            future.add_done_callback(lambda _: self._pending.pop(pending, None))
+        return await asyncio.shield(future)
+
+    async def lut(self, cmap, N=256):
+        """Return the uint8 (N, 4) lookup table of a colormap
+
+        :param cmap: any colormap accepted by :func:`~colormap.lut.lut_builder`
+            or a (N, 4) lookup table
+        """
+        if isinstance(cmap, np.ndarray):
+            return _get_lut(cmap, N)
+        key = _lut_key(cmap, N, np.dtype(np.uint8), "rgb")
+        if key is not None and key in cmap_cache:
+            # already built: a dictionary lookup is not worth a thread
+            return _get_lut(cmap, N)
+        return await self._coalesce(key, _get_lut, cmap, N)
+
+    async def cmap(self, name, name2=None, name3=None, reverse=False, N=256):
+        """Return the colormap of :func:`~colormap.get_cmap.cmap_builder`
+
+        The colormap is built in the pool of threads; concurrent calls with
+        the same parameters share the same build (and get their own copy).
+        """
+        from colormap.get_cmap import cmap_builder
+
+        key = ("cmap_builder", name, name2, name3, reverse, N)
+        try:
+            hash(key)
+        except TypeError:
+            key = None
+        cmap = await self._coalesce(key, cmap_builder, name, name2, name3, reverse, N)
+        # concurrent callers share the result of the build: each gets a copy
+        return cmap.copy()
+
+    async def render(self, data, cmap, vmin=None, vmax=None, N=256, out=None, chunksize=2**20):
+        """Map the values of *data* onto the RGBA colors of a colormap
+
+        The parameters and the result are those of
+        :func:`~colormap.colorize.apply_colormap`. Each chunk is processed
+        by a task of the pool.
+        """
+        lut = await self.lut(cmap, N)
+        data, out, chunks = _prepare(data, out, chunksize)
+        ranges = []
+        if vmin is None or vmax is None:
+            for chunk in chunks:
+                ranges.append(await self._run(_chunk_range, data[chunk]))
+        vmin, vmax = _limits(vmin, vmax, ranges)
+
+        for chunk in chunks:
+            await self._run(_colorize, data[chunk], lut, vmin, vmax, out[chunk])
+        return out
+
+
+_default_service = None
+_default_lock = threading.Lock()
+
+
+def _get_service():
+    global _default_service
+    with _default_lock:
+        if _default_service is None:
+            _default_service = RenderService()
+        return _default_service
+
+
+async def render_async(data, cmap, vmin=None, vmax=None, N=256, out=None, chunksize=2**20):
+    """Colorize an array in the default :class:`RenderService`
+
+    See :func:`~colormap.colorize.apply_colormap` for the parameters.
+    """
+    return await _get_service().render(data, cmap, vmin=vmin, vmax=vmax, N=N, out=out, chunksize=chunksize)
+
+
+async def lut_async(cmap, N=256):
+    """Return the uint8 lookup table of a colormap (see :meth:`RenderService.lut`)"""
+    return await _get_service().lut(cmap, N)
+
+
+async def cmap_async(name, name2=None, name3=None, reverse=False, N=256):
+    """Return the colormap built by :func:`~colormap.get_cmap.cmap_builder`
+    in the default :class:`RenderService`"""
+    return await _get_service().cmap(name, name2, name3, reverse, N)
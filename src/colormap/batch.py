@@ -0,0 +1,201 @@
+# -*- python -*-
+#
+#  This file is part of colormap software
+#
+#  Copyright (c) 2011-2024
+#
+#  File author(s): Thomas Cokelaer <cokelaer@gmail.com>
+#
+#  Distributed under the terms of the 3-clause BSD license.
+#  The full license is in the LICENSE file, distributed with this software.
+#
+##############################################################################
+"""Colorize many files in a pool of processes
+
+:func:`colorize_files` applies a colormap to arrays stored in numpy files
+(.npy) and saves the uint8 RGBA results in other .npy files::
+
+    >>> from colormap.batch import colorize_files
+    >>> colorize_files(["a.npy", "b.npy"], "viridis", vmin=0, vmax=1)  # doctest: +SKIP
+    ['a_rgba.npy', 'b_rgba.npy']
+
+The lookup table of the colormap is built once in the main process (see
+:func:`~colormap.lut.lut_builder`) and published in a shared memory block
+(:mod:`multiprocessing.shared_memory`) read by all the workers. Only the
+file names are sent to the workers: the inputs are memory-mapped and the
+outputs are written by the workers chunk by chunk, so that neither the data
+nor the colormap are pickled.
+
+To process several batches with the same colormap and processes, use a
+:class:`BatchColorizer`::
+
+    >>> with BatchColorizer("viridis", vmin=0, vmax=1, processes=4) as colorizer:  # doctest: +SKIP
+    ...     for output in colorizer.imap(inputs):
+    ...         print(output)
+"""
+import multiprocessing
+import os
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from colormap.colorize import _get_lut, apply_colormap
+
+__all__ = ["BatchColorizer", "colorize_files"]
+
+
+def _output_name(filename):
+    root, _ = os.path.splitext(filename)
+    return f"{root}_rgba.npy"
+
+
+def _attach(name):
+    # the block is owned (and unlinked) by the main process: do not let the
+    # resource tracker of the workers unlink it (Python >= 3.13)
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+# shared memory block and lookup table of a worker process
+_shm = None
+_lut = None
+
+
+def _init_worker(name, shape, dtype):
+    global _shm, _lut
+    _shm = _attach(name)
+    _lut = np.ndarray(shape, dtype=dtype, buffer=_shm.buf)
+
+
+def _colorize_file(task):
+    source, target, vmin, vmax, chunksize = task
+    data = np.load(source, mmap_mode="r")
+    out = np.lib.format.open_memmap(target, mode="w+", dtype=np.uint8, shape=data.shape + (4,))
+    apply_colormap(data, _lut, vmin=vmin, vmax=vmax, out=out, chunksize=chunksize)
+    out.flush()
+    del out
+    return target
+
+
+class BatchColorizer:
+    """Pool of processes colorizing numpy files with one colormap
+
+    :param cmap: any colormap accepted by :func:`~colormap.lut.lut_builder`
+        (e.g. a name known by :func:`~colormap.get_cmap.cmap_builder`) or a
+        (N, 4) lookup table
+    :param vmin: value mapped on the first color. Defaults to the minimum of
+        each file.
+    :param vmax: value mapped on the last color. Defaults to the maximum of
+        each file.
+    :param int N: number of colors in the colormap
+    :param int processes: number of worker processes. Defaults to the number
+        of CPUs.
+    :param int chunksize: approximate number of values of a file processed at
+        once by a worker
+    :param str start_method: "fork", "spawn" or "forkserver". Defaults to the
+        multiprocessing default.
+
+    The processes and the shared memory block are released by :meth:`close`
+    (called at the end of a with block).
+    """
+
+    def __init__(self, cmap, vmin=None, vmax=None, N=256, processes=None, chunksize=2**20, start_method=None):
+        lut = _get_lut(cmap, N)
+        self.vmin = vmin
+        self.vmax = vmax
+        self.chunksize = chunksize
+        self._shm = shared_memory.SharedMemory(create=True, size=lut.nbytes)
+        try:
+            self.lut = np.ndarray(lut.shape, dtype=lut.dtype, buffer=self._shm.buf)
+            self.lut[:] = lut
+            context = multiprocessing.get_context(start_method)
+            self._pool = context.Pool(
+                processes or os.cpu_count() or 1,
+                initializer=_init_worker,
+                initargs=(self._shm.name, lut.shape, lut.dtype.str),
+            )
+        except BaseException:
+            self.lut = None
+            self._shm.close()
+            self._shm.unlink()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Stop the worker processes and free the shared memory block"""
+        if self._pool is None:
+            return
+        self._pool.close()
+        self._pool.join()
+        self._pool = None
+        # the array must be released before the block is closed
+        self.lut = None
+        self._shm.close()
+        self._shm.unlink()
+
+    def imap(self, inputs, outputs=None, files_per_task=1):
+        """Colorize numpy files and yield the output file names in order
+
+        :param inputs: names of .npy files (arrays of any shape)
+        :param outputs: names of the .npy files where to save the RGBA
+            arrays. Defaults to the input names with a _rgba suffix.
+        :param int files_per_task: number of files sent to a worker at once
+        """
+        if self._pool is None:
+            raise ValueError("the BatchColorizer is closed")
+        inputs = [os.fspath(x) for x in inputs]
+        if outputs is None:
+            outputs = [_output_name(x) for x in inputs]
+        else:
+            outputs = [os.fspath(x) for x in outputs]
+            if len(outputs) != len(inputs):
+                raise ValueError("inputs and outputs must have the same length")
+        tasks = [(source, target, self.vmin, self.vmax, self.chunksize) for source, target in zip(inputs, outputs)]
+        return self._pool.imap(_colorize_file, tasks, chunksize=files_per_task)
+
+    def map(self, inputs, outputs=None, files_per_task=1):
+        """Colorize numpy files and return the list of the output file names
+
+        See :meth:`imap` for the parameters.
+        """
+        return list(self.imap(inputs, outputs, files_per_task=files_per_task))
+
+
+def colorize_files(
+    inputs,
+    cmap,
+    outputs=None,
+    vmin=None,
+    vmax=None,
+    N=256,
+    processes=None,
+    files_per_task=1,
+    chunksize=2**20,
+    start_method=None,
+):
+    """Colorize numpy files in a pool of processes
+
+    :param inputs: names of .npy files
+    :param cmap: any colormap accepted by :func:`~colormap.lut.lut_builder`
+        or a (N, 4) lookup table
+    :param outputs: names of the output .npy files (uint8 RGBA arrays).
+        Defaults to the input names with a _rgba suffix.
+    :param int files_per_task: number of files sent to a worker at once
+    :param int chunksize: approximate number of values of a file processed
+        at once by a worker
+    :return: the list of the output file names, in the order of the inputs
+
+    See :class:`BatchColorizer` for the other parameters. The files are
+    colorized as with :func:`~colormap.colorize.apply_colormap`.
+    """
+    with BatchColorizer(
+        cmap, vmin=vmin, vmax=vmax, N=N, processes=processes, chunksize=chunksize, start_method=start_method
+    ) as colorizer:
+        return colorizer.map(inputs, outputs, files_per_task=files_per_task)
@@ -0,0 +1,323 @@
+# -*- python -*-
+#
+#  This file is part of colormap software
+#
+#  Copyright (c) 2011-2024
+#
+#  File author(s): Thomas Cokelaer <cokelaer@gmail.com>
+#
+#  Distributed under the terms of the 3-clause BSD license.
+#  The full license is in the LICENSE file, distributed with this software.
+#
+##############################################################################
+"""Caches used to avoid building the same colormaps again and again
+
+Colormaps built by :meth:`~colormap.colors.Colormap.cmap` (and therefore
+:func:`~colormap.get_cmap.cmap_builder`), and the lookup tables returned by
+:func:`~colormap.lut.lut_builder` are kept in :data:`cmap_cache`, a bounded
+least-recently-used cache::
+
+    >>> from colormap import cmap_builder, cmap_cache
+    >>> cmap_cache.clear()         # empty the cache and reset the statistics
+    >>> cmap = cmap_builder("red", "white", "blue")
+    >>> cmap = cmap_builder("red", "white", "blue")
+    >>> cmap_cache.info()
+    CacheInfo(hits=1, misses=1, maxsize=128, currsize=1)
+    >>> cmap_cache.maxsize = 512   # change the size of the cache
+
+Colormaps are returned as copies of the cached ones, so that they can be
+modified (e.g. with set_bad()) without affecting the other callers. Cached
+lookup tables are read-only arrays.
+
+Lookup tables of dictionaries and lists of colors (see
+:func:`~colormap.lut.lut_builder`) can also be stored on disk with
+:data:`disk_cache` so that they are not computed again by the next
+processes. The tables of named colormaps, built by matplotlib, are not
+stored on disk. The disk cache is
+disabled unless the COLORMAP_CACHE_DIR environment variable is set or a
+directory is provided::
+
+    >>> from colormap.cache import disk_cache
+    >>> disk_cache.directory = os.path.expanduser("~/.cache/colormap")  # doctest: +SKIP
+
+Tables are stored in the numpy format (one .npy file per table, named after
+a hash of the specification) in a colormap-* sub-directory named after the
+version of colormap and a hash of its source code, and are memory-mapped
+(not read) when loaded. Tables built by a previous version or by modified
+sources are therefore never used. :meth:`DiskCache.clear` only removes the
+files created by the cache.
+"""
+import os
+import threading
+from collections import OrderedDict, namedtuple
+
+__all__ = ["LRUCache", "DiskCache", "cmap_cache", "disk_cache"]
+
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+class LRUCache:
+    """Bounded and thread-safe least-recently-used cache
+
+    ::
+
+        >>> cache = LRUCache(maxsize=2)
+        >>> cache.get_or_build("a", lambda: 1)
+        1
+        >>> cache.info()
+        CacheInfo(hits=0, misses=1, maxsize=2, currsize=1)
+
+    :param int maxsize: number of items to keep. 0 disables the cache.
+    """
+
+    def __init__(self, maxsize=128):
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+
+    def _get_maxsize(self):
+        return self._maxsize
+
+    def _set_maxsize(self, maxsize):
+        if maxsize < 0:
+            raise ValueError("maxsize must be positive")
+        with self._lock:
+            self._maxsize = maxsize
+            self._trim()
+
+    maxsize = property(_get_maxsize, _set_maxsize, doc="getter/setter of the maximum number of items")
+
+    def _trim(self):
+        # must be called with the lock acquired
+        while len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
+
+    def get(self, key, default=None):
+        """Return the item stored for *key* (or *default*) and update the statistics"""
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """Store *value* for *key*. The least recently used item may be dropped."""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            self._trim()
+
+    def get_or_build(self, key, builder):
+        """Return the item stored for *key*; call *builder()* to create it if needed
+
+        The builder is called without holding the lock. If two threads build
+        the same item at the same time, the first one stored is returned to
+        both.
+        """
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+        value = builder()
+        with self._lock:
+            value = self._data.setdefault(key, value)
+            self._data.move_to_end(key)
+            self._trim()
+        return value
+
+    def info(self):
+        """Return the hits, misses, maxsize and current size of the cache"""
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self._maxsize, len(self._data))
+
+    def clear(self):
+        """Remove all items and reset the statistics"""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+
+# prefix of the sub-directories created by the disk cache
+_PREFIX = "colormap-"
+
+
+def _package_version():
+    # importlib.metadata is slow to import, so keep it local
+    import hashlib
+    from importlib import metadata
+
+    try:
+        version = metadata.version("colormap")
+    except metadata.PackageNotFoundError:  # pragma: no cover
+        version = "unknown"
+    # the installed version may not match the code (e.g. source checkouts):
+    # the hash of the sources of the package is part of the name as well
+    digest = hashlib.sha1()
+    here = os.path.dirname(os.path.abspath(__file__))
+    for name in sorted(os.listdir(here)):
+        if name.endswith(".py"):
+            with open(os.path.join(here, name), "rb") as fin:
+                digest.update(fin.read())
+    return f"{version}-{digest.hexdigest()[:12]}"
+
+
+class DiskCache:
+    """Persistent cache of arrays (e.g. colormap lookup tables)
+
+    ::
+
+        >>> cache = DiskCache("/tmp/colormap")  # doctest: +SKIP
+        >>> lut = cache.get_or_build(("lut", "viridis", 256), build)  # doctest: +SKIP
+
+    :param str directory: root directory of the cache. None disables the
+        cache. Arrays are stored in a sub-directory named after the version
+        of colormap and a hash of its source code, so that a new version (or
+        modified sources) does not use stale tables.
+
+    Arrays are written atomically (to a temporary file then renamed) so that
+    several processes can share the same directory. Loaded arrays are
+    read-only memory-mapped arrays. Errors while reading or writing the
+    cache (e.g. read-only file system) are ignored: the arrays are built
+    instead.
+    """
+
+    def __init__(self, directory=None):
+        self._directory = directory
+        self._version = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _get_directory(self):
+        return self._directory
+
+    def _set_directory(self, directory):
+        self._directory = directory
+
+    directory = property(_get_directory, _set_directory, doc="getter/setter of the root directory (None to disable)")
+
+    def _get_enabled(self):
+        return self._directory is not None
+
+    enabled = property(_get_enabled, doc="True if a directory is set")
+
+    def _get_path(self):
+        if self._version is None:
+            self._version = _package_version()
+        return os.path.join(self._directory, _PREFIX + self._version)
+
+    path = property(_get_path, doc="directory of the arrays of the current version")
+
+    def filename(self, key):
+        """Return the file where the array of *key* (a hashable specification) is stored"""
+        import hashlib
+
+        digest = hashlib.sha1(repr(key).encode()).hexdigest()
+        return os.path.join(self.path, digest + ".npy")
+
+    def get(self, key):
+        """Return the array stored for *key* (memory-mapped) or None"""
+        import numpy as np
+
+        if not self.enabled:
+            return None
+        try:
+            value = np.load(self.filename(key), mmap_mode="r")
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """Store the array *value* for *key*"""
+        # tempfile is slow to import, so keep it local
+        import tempfile
+
+        import numpy as np
+
+        if not self.enabled:
+            return
+        filename = self.filename(key)
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as fout:
+                    np.save(fout, np.ascontiguousarray(value))
+                os.replace(tmp, filename)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+        except OSError:
+            pass
+
+    def get_or_build(self, key, builder):
+        """Return the array stored for *key*; call *builder()* to create and store it if needed"""
+        value = self.get(key)
+        if value is None:
+            value = builder()
+            self.put(key, value)
+        return value
+
+    def info(self):
+        """Return the hits and misses of the cache, and the number of stored arrays"""
+        size = 0
+        if self.enabled and os.path.isdir(self.path):
+            size = sum(name.endswith(".npy") for name in os.listdir(self.path))
+        return CacheInfo(self.hits, self.misses, None, size)
+
+    def clear(self):
+        """Remove the arrays stored by all versions and reset the statistics
+
+        Only the files created by the cache (.npy and .tmp files of the
+        colormap-* sub-directories) are removed, so that the directory can be
+        shared with other applications.
+        """
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+        if not (self.enabled and os.path.isdir(self._directory)):
+            return
+        for name in os.listdir(self._directory):
+            path = os.path.join(self._directory, name)
+            if not name.startswith(_PREFIX) or os.path.islink(path) or not os.path.isdir(path):
+                continue
+            for filename in os.listdir(path):
+                if filename.endswith((".npy", ".tmp")):
+                    try:
+                        os.unlink(os.path.join(path, filename))
+                    except OSError:
+                        pass
+            try:
+                os.rmdir(path)
+            except OSError:
+                # not empty: other files were added by someone else
+                pass
+
+
+#: cache of the matplotlib colormaps built by :class:`~colormap.colors.Colormap`
+#: and :func:`~colormap.get_cmap.cmap_builder`
+cmap_cache = LRUCache(maxsize=128)
+
+#: cache of the lookup tables built by :func:`~colormap.lut.lut_builder`,
+#: disabled unless the COLORMAP_CACHE_DIR environment variable is set
+disk_cache = DiskCache(os.environ.get("COLORMAP_CACHE_DIR") or None)
@@ -0,0 +1,213 @@
+# -*- python -*-
+#
+#  This file is part of colormap software
+#
+#  Copyright (c) 2011-2024
+#
+#  File author(s): Thomas Cokelaer <cokelaer@gmail.com>
+#
+#  Distributed under the terms of the 3-clause BSD license.
+#  The full license is in the LICENSE file, distributed with this software.
+#
+##############################################################################
+"""Columnar container for many colors"""
+import numpy as np
+
+from colormap.colors import (
+    Color,
+    _check_range_array,
+    hex2rgb_array,
+    hls2rgb_array,
+    hsv2rgb_array,
+    rgb2hex_array,
+    rgb2hls_array,
+    rgb2hsv_array,
+)
+from colormap.xfree86 import XFree86_index
+
+__all__ = ["ColorArray"]
+
+
+def _strings2rgb(values):
+    # names and hexadecimal strings are resolved once per distinct value
+    unique, inverse = np.unique(np.asarray(values, dtype=str), return_inverse=True)
+    hexes = []
+    for value in unique.tolist():
+        if value in XFree86_index.aliases:
+            hexes.append(XFree86_index.names[XFree86_index.aliases[value]])
+        elif value.startswith(("#", "0x", "0X")):
+            hexes.append(value)
+        else:
+            raise ValueError(f"Invalid color {value}. Use a valid XFree86 name or an hexadecimal string")
+    return hex2rgb_array(hexes, normalise=True)[inverse.ravel()]
+
+
+class ColorArray:
+    """Columnar container for many colors with vectorised getters and setters
+
+    A :class:`ColorArray` is the equivalent of a list of
+    :class:`~colormap.colors.Color` stored as a single (N, 3) array of
+    normalised RGB values. Getters (e.g. :attr:`hls`) and setters (e.g.
+    :attr:`lightness`) work on all colors at once::
+
+        >>> from colormap.colorarray import ColorArray
+        >>> colors = ColorArray(["red", "#00FF00", "Spring Green"])
+        >>> colors.lightness = 0.25
+        >>> colors.hex.tolist()
+        ['#7F0000', '#007F00', '#007F3F']
+
+    You can create an instance from a list of names and/or hexadecimal strings
+    (resolved in one pass with the XFree86 table), a list of
+    :class:`~colormap.colors.Color`, or arrays of RGB, HSV or HLS triplets
+    (normalised values).
+    """
+
+    def __init__(self, colors=None, rgb=None, hls=None, hsv=None):
+        if colors is not None:
+            if isinstance(colors, ColorArray):
+                self.rgb = colors.rgb
+            elif all(isinstance(x, str) for x in colors):
+                self.rgb = _strings2rgb(colors).reshape(-1, 3)
+            else:
+                self.rgb = np.array([Color(x).rgb for x in colors], dtype=float).reshape(-1, 3)
+        elif rgb is not None:
+            self.rgb = rgb
+        elif hls is not None:
+            self.hls = hls
+        elif hsv is not None:
+            self.hsv = hsv
+        else:
+            raise ValueError("You must set one of the parameter")
+
+    def __len__(self):
+        return len(self._rgb)
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            return Color(rgb=tuple(self._rgb[index].tolist()))
+        return ColorArray(rgb=self._rgb[index])
+
+    def __iter__(self):
+        for rgb in self._rgb.tolist():
+            yield Color(rgb=tuple(rgb))
+
+    def __repr__(self):
+        return f"ColorArray({self.hex.tolist()})"
+
+    def _get_rgb(self):
+        return self._rgb
+
+    def _set_rgb(self, values):
+        values = np.array(values, dtype=float).reshape(-1, 3)
+        # same validation as Color (values rounded to 8 bits must be valid)
+        _check_range_array(np.trunc(values * 255), 0, 255)
+        self._rgb = values
+
+    rgb = property(_get_rgb, _set_rgb, doc="getter/setter the (N, 3) array of RGB values")
+
+    def _get_hex(self):
+        return rgb2hex_array(self._rgb, normalised=True)
+
+    def _set_hex(self, values):
+        self.rgb = hex2rgb_array(values, normalise=True)
+
+    hex = property(_get_hex, _set_hex, doc="getter/setter the array of hexadecimal values")
+
+    def _get_names(self):
+        return np.array([XFree86_index.hexes.get(x, "undefined") for x in self.hex.tolist()])
+
+    names = property(_get_names, doc="getter of the XFree86 names ('undefined' if not an XFree86 color)")
+
+    def _get_hsv(self):
+        return rgb2hsv_array(self._rgb)
+
+    def _set_hsv(self, values):
+        self._rgb = hsv2rgb_array(np.asarray(values, dtype=float).reshape(-1, 3))
+
+    hsv = property(_get_hsv, _set_hsv, doc="getter/setter the (N, 3) array of HSV values")
+
+    def _get_hls(self):
+        return rgb2hls_array(self._rgb)
+
+    def _set_hls(self, values):
+        self._rgb = hls2rgb_array(np.asarray(values, dtype=float).reshape(-1, 3))
+
+    hls = property(_get_hls, _set_hls, doc="getter/setter the (N, 3) array of HLS values")
+
+    def _get_yiq(self):
+        r, g, b = self._rgb.T
+        y = 0.30 * r + 0.59 * g + 0.11 * b
+        i = 0.74 * (r - y) - 0.27 * (b - y)
+        q = 0.48 * (r - y) + 0.41 * (b - y)
+        return np.stack([y, i, q], axis=-1)
+
+    yiq = property(_get_yiq, doc="getter of the (N, 3) array of YIQ values")
+
+    def _set_channel(self, space, channel, values):
+        # set one channel (scalar or N values) of the HSV or HLS triplets
+        triplets = getattr(self, space)
+        triplets[:, channel] = values
+        setattr(self, space, triplets)
+
+    def _get_lightness(self):
+        return self.hls[:, 1]
+
+    def _set_lightness(self, lightness):
+        self._set_channel("hls", 1, lightness)
+
+    lightness = property(_get_lightness, _set_lightness, doc="getter/setter the lightness in the HLS triplets")
+
+    def _get_saturation_hls(self):
+        return self.hls[:, 2]
+
+    def _set_saturation_hls(self, saturation):
+        self._set_channel("hls", 2, saturation)
+
+    saturation_hls = property(
+        _get_saturation_hls, _set_saturation_hls, doc="getter/setter the saturation in the HLS triplets"
+    )
+
+    def _get_hue(self):
+        return self.hls[:, 0]
+
+    def _set_hue(self, hue):
+        self._set_channel("hls", 0, hue)
+
+    hue = property(_get_hue, _set_hue, doc="getter/setter the hue in the HLS triplets")
+
+    def _get_value(self):
+        return self.hsv[:, 2]
+
+    def _set_value(self, value):
+        self._set_channel("hsv", 2, value)
+
+    value = property(_get_value, _set_value, doc="getter/setter the value in the HSV triplets")
+
+    def _set_rgb_channel(self, channel, values):
+        rgb = self._rgb.copy()
+        rgb[:, channel] = values
+        self.rgb = rgb
+
+    def _get_red(self):
+        return self._rgb[:, 0]
+
+    def _set_red(self, red):
+        self._set_rgb_channel(0, red)
+
+    red = property(_get_red, _set_red, doc="getter/setter for the red color in RGB triplets")
+
+    def _get_green(self):
+        return self._rgb[:, 1]
+
+    def _set_green(self, green):
+        self._set_rgb_channel(1, green)
+
+    green = property(_get_green, _set_green, doc="getter/setter for the green color in RGB triplets")
+
+    def _get_blue(self):
+        return self._rgb[:, 2]
+
+    def _set_blue(self, blue):
+        self._set_rgb_channel(2, blue)
+
+    blue = property(_get_blue, _set_blue, doc="getter/setter for the blue color in RGB triplets")
@@ -0,0 +1,173 @@
+# -*- python -*-
+#
+#  This file is part of colormap software
+#
+#  Copyright (c) 2011-2024
+#
+#  File author(s): Thomas Cokelaer <cokelaer@gmail.com>
+#
+#  Distributed under the terms of the 3-clause BSD license.
+#  The full license is in the LICENSE file, distributed with this software.
+#
+##############################################################################
+"""Colorize arrays with a colormap
+
+:func:`apply_colormap` maps the values of an array onto the RGBA colors of a
+colormap. Contrary to calling a matplotlib colormap on the array, the array is
+processed chunk by chunk into a uint8 output so that the peak memory stays
+bounded. Input and output can be memory-mapped arrays (np.memmap)::
+
+    >>> import numpy as np
+    >>> from colormap.colorize import apply_colormap
+    >>> data = np.memmap("data.dat", dtype="float32", shape=(20000, 20000))  # doctest: +SKIP
+    >>> out = np.lib.format.open_memmap("rgba.npy", mode="w+", dtype="uint8",
+    ...                                 shape=data.shape + (4,))  # doctest: +SKIP
+    >>> apply_colormap(data, "viridis", vmin=0, vmax=1, out=out)  # doctest: +SKIP
+
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from colormap.lut import lut_builder
+
+__all__ = ["apply_colormap"]
+
+
+def _get_lut(cmap, N):
+    # a uint8 lookup table may be provided directly
+    if isinstance(cmap, np.ndarray) and cmap.ndim == 2 and cmap.shape[1] == 4:
+        if cmap.dtype != np.uint8:
+            cmap = (cmap * 255).astype(np.uint8)
+        return cmap
+    return lut_builder(cmap, N=N, dtype=np.uint8)
+
+
+def _chunks(shape, chunksize):
+    # indices of blocks of at most about chunksize elements. The blocks are
+    # slices along the first axis whose items are small enough; e.g. the rows
+    # of a (1, N) array are sliced along their second axis.
+    axis = 0
+    while axis < len(shape) - 1 and int(np.prod(shape[axis + 1 :])) > chunksize:
+        axis += 1
+    size = int(np.prod(shape[axis + 1 :]))
+    step = max(1, chunksize // max(1, size))
+    for index in np.ndindex(*shape[:axis]):
+        for start in range(0, shape[axis], step):
+            yield index + (slice(start, min(start + step, shape[axis])),)
+
+
+def _chunk_range(values):
+    # minimum and maximum of the finite values (None if there is none)
+    if values.dtype.kind in "fc":
+        values = values[np.isfinite(values)]
+    if values.size:
+        return values.min(), values.max()
+
+
+def _map(func, chunks, workers):
+    # apply func on each chunk, in a thread pool if workers > 1. Results are
+    # returned in the order of the chunks.
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers == 1 or len(chunks) == 1:
+        return [func(chunk) for chunk in chunks]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(func, chunks))
+
+
+def _prepare(data, out, chunksize):
+    # the data as an array, the output (checked or created) and the chunks
+    data = np.asanyarray(data)
+    if data.ndim == 0:
+        data = data.reshape(1)
+    if out is None:
+        out = np.empty(data.shape + (4,), dtype=np.uint8)
+    elif out.shape != data.shape + (4,) or out.dtype != np.uint8:
+        raise ValueError(f"out must be a uint8 array of shape {data.shape + (4,)}")
+    return data, out, list(_chunks(data.shape, chunksize))
+
+
+def _limits(vmin, vmax, ranges):
+    # vmin and vmax defaulting to the range of the finite values. ranges are
+    # the results of _chunk_range on each chunk (only needed if vmin or vmax
+    # is None)
+    ranges = [x for x in ranges if x is not None]
+    if vmin is None:
+        vmin = min(x[0] for x in ranges) if ranges else 0
+    if vmax is None:
+        vmax = max(x[1] for x in ranges) if ranges else 0
+    # as matplotlib Normalize
+    if vmin > vmax:
+        raise ValueError(f"vmin must be less than or equal to vmax. You provided {vmin} and {vmax}")
+    return vmin, vmax
+
+
+def _float_type(dtype):
+    # as matplotlib Normalize: floats are kept, bool and integers of 2 bytes
+    # or less become float32 and the other integers float64
+    if dtype.kind in "biu":
+        return np.promote_types(dtype, np.float32)
+    return dtype
+
+
+def _colorize(data, lut, vmin, vmax, out):
+    # normalisation and indexing as in matplotlib (Normalize then Colormap),
+    # in the same float type so that the colors are identical
+    N = len(lut)
+    x = data.astype(_float_type(data.dtype))
+    # the limits are converted to Python floats by Normalize
+    vmin, vmax = np.float64(vmin), np.float64(vmax)
+    bad = np.isnan(x)
+    if vmax == vmin:
+        x.fill(0)
+    else:
+        x -= vmin
+        x /= vmax - vmin
+        x *= N
+    # values below vmin and above vmax get the first and last colors
+    np.clip(x, 0, N - 1, out=x)
+    x[bad] = 0
+    np.take(lut, x.astype(np.intp), axis=0, out=out, mode="clip")
+    # invalid values are transparent
+    out[bad] = 0
+    return out
+
+
+def apply_colormap(data, cmap, vmin=None, vmax=None, N=256, out=None, chunksize=2**20, workers=1):
+    """Map the values of *data* onto the RGBA colors of a colormap
+
+    :param data: a numpy array (or np.memmap) of any shape.
+    :param cmap: any colormap accepted by :func:`~colormap.lut.lut_builder`
+        (e.g., a matplotlib colormap name, a dictionary of RGB channels or a
+        list of colors) or a (N, 4) lookup table.
+    :param vmin: value mapped on the first color. Defaults to the minimum of
+        the data (computed chunk by chunk).
+    :param vmax: value mapped on the last color. Defaults to the maximum of
+        the data.
+    :param int N: number of colors in the colormap
+    :param out: optional uint8 array of shape data.shape + (4,) (can be a
+        np.memmap) where to store the result.
+    :param int chunksize: approximate number of values processed at once.
+    :param int workers: number of threads processing the chunks. None uses
+        all the CPUs. Numpy releases the GIL so chunks are processed in
+        parallel; the output does not depend on the number of workers.
+    :return: the uint8 RGBA array. NaN are transparent (0, 0, 0, 0).
+    :raises ValueError: if vmin is greater than vmax (e.g. vmax is given and
+        is less than the minimum of the data)
+
+    The data are normalised and mapped chunk by chunk as matplotlib would do
+    (i.e. cmap(Normalize(vmin, vmax)(data), bytes=True), in the same float
+    types), so the temporary memory is bounded by the chunk size (times the
+    number of workers) whatever the shape of the data.
+    """
+    lut = _get_lut(cmap, N)
+    data, out, chunks = _prepare(data, out, chunksize)
+    ranges = []
+    if vmin is None or vmax is None:
+        ranges = _map(lambda chunk: _chunk_range(data[chunk]), chunks, workers)
+    vmin, vmax = _limits(vmin, vmax, ranges)
+
+    _map(lambda chunk: _colorize(data[chunk], lut, vmin, vmax, out[chunk]), chunks, workers)
+    return out
@@ -22,17 +22,26 @@ standard Python module called :mod:`colorsys` or in matplotlib.colors
 """
 # matplotlib dependence is only inside Colormap class
 import colorsys
+import math
+import re
+from contextlib import contextmanager
+from contextvars import ContextVar
 
-from colormap.xfree86 import XFree86_colors
+from colormap.cache import cmap_cache
+from colormap.xfree86 import XFree86_colors, XFree86_index
 
 __all__ = [
     "HEX",
     "Color",
+    "trusted",
+    "parse_hex_color",
     "hex2web",
     "web2hex",
     "hex2rgb",
     "hex2dec",
     "rgb2hex",
+    "hex2rgb_array",
+    "rgb2hex_array",
     "rgb2hsv",
     "hsv2rgb",
     "rgb2hls",
@@ -42,7 +51,42 @@ __all__ = [
     "to_intensity",
     "yuv2rgb_int",
     "rgb2yuv_int",
+    "rgb2hsv_array",
+    "hsv2rgb_array",
+    "rgb2hls_array",
+    "hls2rgb_array",
+    "rgb2yuv_array",
+    "yuv2rgb_array",
+    "rgb2yuv_int_array",
+    "yuv2rgb_int_array",
+    "rgb2xyz",
+    "xyz2rgb",
+    "xyz2lab",
+    "lab2xyz",
+    "lab2lch",
+    "lch2lab",
+    "rgb2lab",
+    "lab2rgb",
+    "rgb2lch",
+    "lch2rgb",
+    "rgb2oklab",
+    "oklab2rgb",
+    "rgb2xyz_array",
+    "xyz2rgb_array",
+    "xyz2lab_array",
+    "lab2xyz_array",
+    "lab2lch_array",
+    "lch2lab_array",
+    "rgb2lab_array",
+    "lab2rgb_array",
+    "rgb2lch_array",
+    "lch2rgb_array",
+    "rgb2oklab_array",
+    "oklab2rgb_array",
+    "delta_e2000",
     "Colormap",
+    "ColormapRegistry",
+    "colormap_registry",
     "plot_category",
     "plot_colormap",
 ]
@@ -53,6 +97,47 @@ def check_range(data, dmin, dmax):
         raise ValueError(f"Value must be in the range [{dmin}-{dmax}]. You provided {data}")
 
 
+# True inside a trusted() block
+_trusted = ContextVar("colormap_trusted", default=False)
+
+
+@contextmanager
+def trusted():
+    """Skip the validation of the input values in a with block
+
+    The scalar conversions (e.g. :func:`rgb2hex`, :func:`hls2rgb`) and the
+    setters of :class:`Color` (e.g. hue, lightness, rgb) check that each value
+    is in the expected range. In inner loops where the values are known to be
+    valid, those checks can be skipped::
+
+        >>> from colormap.colors import Color, trusted
+        >>> color = Color("red")
+        >>> with trusted():
+        ...     for hue in range(100):
+        ...         color.hue = hue / 100
+
+    Invalid values are not detected and give meaningless results. The mode is
+    local to the thread (and asyncio task) that enters the block.
+    """
+    token = _trusted.set(True)
+    try:
+        yield
+    finally:
+        _trusted.reset(token)
+
+
+def _check_triplet(a, b, c, dmax, dmax_first=None):
+    # range checks of the scalar conversions: a in [0, dmax_first] (dmax by
+    # default), b and c in [0, dmax]. Skipped in a trusted() block.
+    if dmax_first is None:
+        dmax_first = dmax
+    if _trusted.get() or (0 <= a <= dmax_first and 0 <= b <= dmax and 0 <= c <= dmax):
+        return
+    check_range(a, 0, dmax_first)
+    check_range(b, 0, dmax)
+    check_range(c, 0, dmax)
+
+
 def swapdict(dic, check_ambiguity=True):
     """Swap keys for values in a dictionary
 
@@ -69,6 +154,43 @@ def swapdict(dic, check_ambiguity=True):
     return dict(zip(dic.values(), dic.keys()))
 
 
+# "#" or "0x" followed by 3, 6 or 8 hexadecimal digits (last 2 of 8 are ignored)
+_hex_regex = re.compile(r"(?:#|0[xX])([0-9a-fA-F]{3}|[0-9a-fA-F]{6}(?:[0-9a-fA-F]{2})?)")
+
+
+def parse_hex_color(value):
+    """Return the standard hexadecimal string (#RRGGBB) of *value* or None
+
+    This is the non-raising version of :meth:`HEX.get_standard_hex_color`:
+    invalid values (including non strings) return None.
+
+    .. doctest::
+
+        >>> from colormap.colors import parse_hex_color
+        >>> parse_hex_color("0xfa1")
+        '#FFAA11'
+        >>> parse_hex_color("red") is None
+        True
+
+    """
+    match = _hex_regex.fullmatch(value) if isinstance(value, str) else None
+    if match is None:
+        return None
+    digits = match.group(1).upper()
+    if len(digits) == 3:
+        return "#" + digits[0] * 2 + digits[1] * 2 + digits[2] * 2
+    return "#" + digits[:6]
+
+
+def _standard_hex(value):
+    # standard hexadecimal string. Invalid values raise the explicit errors of
+    # HEX.get_standard_hex_color
+    hexa = parse_hex_color(value)
+    if hexa is None:
+        hexa = HEX().get_standard_hex_color(value)
+    return hexa
+
+
 def hex2web(hexa):
     """Convert hexadecimal string (6 digits) into *web* version (3 digits)
 
@@ -82,7 +204,7 @@ def hex2web(hexa):
         :func:`rgb2hex`, :func:`rgb2hsv`, :func:`hsv2rgb`, :func:`rgb2hls`,
         :func:`hls2rgb`
     """
-    hexa = HEX().get_standard_hex_color(hexa)
+    hexa = _standard_hex(hexa)
     return "#" + hexa[1::2]
 
 
@@ -99,7 +221,7 @@ def web2hex(web):
         :func:`rgb2hex`, :func:`rgb2hsv`, :func:`hsv2rgb`, :func:`rgb2hls`,
         :func:`hls2rgb`
     """
-    return HEX().get_standard_hex_color(web)
+    return _standard_hex(web)
 
 
 def hex2rgb(hexcolor, normalise=False):
@@ -126,8 +248,7 @@ def hex2rgb(hexcolor, normalise=False):
         :func:`rgb2hex`, :func:`rgb2hsv`, :func:`hsv2rgb`, :func:`rgb2hls`,
         :func:`hls2rgb`
     """
-    hexcolor = HEX().get_standard_hex_color(hexcolor)[1:]
-    r, g, b = int(hexcolor[0:2], 16), int(hexcolor[2:4], 16), int(hexcolor[4:6], 16)
+    r, g, b = bytes.fromhex(_standard_hex(hexcolor)[1:])
     if normalise:
         r, g, b = _normalise(r, g, b)
     return r, g, b
@@ -153,18 +274,128 @@ def rgb2hex(r, g, b, normalised=False):
 
     """
     if normalised:
-        r, g, b = _denormalise(r, g, b, mode="rgb")
-        r = int(r)
-        g = int(g)
-        b = int(b)
+        r, g, b = int(r * 255), int(g * 255), int(b * 255)
 
-    check_range(r, 0, 255)
-    check_range(g, 0, 255)
-    check_range(b, 0, 255)
+    _check_triplet(r, g, b, 255)
 
     return "#%02X%02X%02X" % (r, g, b)
 
 
+def hex2rgb_array(hexcolors, normalise=False):
+    """Convert an array of hexadecimal strings into an array of RGB triplets
+
+    This is the vectorised version of :func:`hex2rgb`. The whole batch is
+    validated at once and the same formats are accepted (#FFF, #FFFFFF,
+    0xFFF, 0xFFFFFF and 8 digits, the last 2 being ignored).
+
+    :param hexcolors: an array-like of strings of any shape.
+    :param bool normalise: if True, returns floats in the range 0-1.
+    :return: an array with an extra trailing dimension of length 3. The dtype
+        is uint8 or float64 if *normalise* is True.
+
+    .. doctest::
+
+        >>> from colormap.colors import hex2rgb_array
+        >>> hex2rgb_array(["#FFF", "0x0000FF"]).tolist()
+        [[255, 255, 255], [0, 0, 255]]
+
+    .. seealso:: :func:`hex2rgb`, :func:`rgb2hex_array`
+    """
+    import numpy as np
+
+    data = np.asarray(hexcolors)
+    shape = data.shape
+    if data.size == 0:
+        rgb = np.empty(shape + (3,), dtype=np.uint8)
+        return rgb / 255 if normalise else rgb
+
+    if data.dtype.kind == "S":
+        data = np.char.decode(data, "ascii")
+    elif data.dtype.kind == "O" and all(isinstance(x, str) for x in data.flat):
+        data = data.astype(str)
+    if data.dtype.kind != "U":
+        raise TypeError("value must be a string")
+    data = np.ascontiguousarray(data.ravel())
+
+    # unicode strings are stored as fixed width UCS4 code points
+    width = data.dtype.itemsize // 4
+    codes = data.view(np.uint32).reshape(-1, width)
+
+    has_hash = codes[:, 0] == ord("#")
+    has_0x = (codes[:, 0] == ord("0")) & np.isin(codes[:, min(1, width - 1)], [ord("x"), ord("X")])
+    if not np.all(has_hash | has_0x):
+        raise ValueError("hexa string must start with a '#' sign or '0x' string")
+    offset = np.where(has_hash, 1, 2)
+    length = np.count_nonzero(codes, axis=1) - offset
+
+    # value of each hexadecimal character, 16 for invalid (or non-ascii) ones
+    table = np.full(128, 16, dtype=np.uint8)
+    table[[ord(x) for x in "0123456789"]] = range(10)
+    table[[ord(x) for x in "ABCDEF"]] = range(10, 16)
+    table[[ord(x) for x in "abcdef"]] = range(10, 16)
+    nibbles = table[np.minimum(codes, 127)]
+
+    position = np.arange(width)
+    inside = (position >= offset[:, None]) & (position < (offset + length)[:, None])
+    invalid = inside & (nibbles == 16)
+    if invalid.any():
+        row, col = np.argwhere(invalid)[0]
+        raise ValueError("Found invalid hexa character {0}".format(chr(codes[row, col]).upper()))
+    if not np.all((length == 3) | (length == 6) | (length == 8)):
+        raise ValueError("hexa string should be 3, 6 or 8 digits. if 8 digits, last 2 are ignored")
+
+    # 3 digits are expanded by duplicating each digit
+    index = np.where((length == 3)[:, None], [0, 0, 1, 1, 2, 2], [0, 1, 2, 3, 4, 5]) + offset[:, None]
+    nibbles = np.take_along_axis(nibbles, index, axis=1)
+    rgb = nibbles[:, 0::2] * np.uint8(16) + nibbles[:, 1::2]
+
+    if normalise:
+        rgb = rgb / 255
+    return rgb.reshape(shape + (3,))
+
+
+def rgb2hex_array(rgb, normalised=False):
+    """Convert an array of RGB triplets into an array of hexadecimal strings
+
+    This is the vectorised version of :func:`rgb2hex`.
+
+    :param rgb: an array-like with a trailing dimension of length 3 (e.g., a
+        uint8 array of shape (N, 3)).
+    :param bool normalised: if True, the RGB values are expected in the range
+        0-1 (0-255 otherwise)
+    :return: an array of strings (e.g. '#0000FF') with the shape of the input
+        without its trailing dimension.
+
+    .. doctest::
+
+        >>> from colormap.colors import rgb2hex_array
+        >>> rgb2hex_array([[0, 0, 255], [255, 255, 255]]).tolist()
+        ['#0000FF', '#FFFFFF']
+
+    .. seealso:: :func:`rgb2hex`, :func:`hex2rgb_array`
+    """
+    import numpy as np
+
+    data = np.asarray(rgb)
+    if data.ndim == 0 or data.shape[-1] != 3:
+        raise ValueError("input must have a trailing dimension of length 3")
+    if normalised:
+        data = np.trunc(data * 255)
+    elif data.dtype.kind not in "biu":
+        raise TypeError("RGB values must be integers if not normalised")
+
+    if data.size and not (np.all(data >= 0) and np.all(data <= 255)):
+        raise ValueError("Value must be in the range [0-255]")
+    data = data.astype(np.uint8).reshape(-1, 3)
+
+    digits = np.array([ord(x) for x in "0123456789ABCDEF"], dtype=np.uint32)
+    codes = np.empty((len(data), 7), dtype=np.uint32)
+    codes[:, 0] = ord("#")
+    codes[:, 1::2] = digits[data >> 4]
+    codes[:, 2::2] = digits[data & 15]
+    return codes.view("U7").reshape(np.shape(rgb)[:-1])
+
+
 def rgb2hls(r, g, b, normalised=True):
     """Convert an RGB value to an HLS value.
 
@@ -190,9 +421,7 @@ def rgb2hls(r, g, b, normalised=True):
         upper = 1
     else:
         upper = 255
-    check_range(r, 0, upper)
-    check_range(g, 0, upper)
-    check_range(b, 0, upper)
+    _check_triplet(r, g, b, upper)
     if normalised == False:
         r, g, b = _normalise(r, g, b)
     h, l, s = colorsys.rgb_to_hls(r, g, b)
@@ -224,9 +453,7 @@ def rgb2hsv(r, g, b, normalised=True):
         upper = 1
     else:
         upper = 255
-    check_range(r, 0, upper)
-    check_range(g, 0, upper)
-    check_range(b, 0, upper)
+    _check_triplet(r, g, b, upper)
     if normalised == False:
         r, g, b = _normalise(r, g, b)
     h, s, v = colorsys.rgb_to_hsv(r, g, b)
@@ -262,9 +489,7 @@ def hsv2rgb(h, s, v, normalised=True):
         uppera = 1
     else:
         uppera = 360
-    check_range(h, 0, uppera)
-    check_range(s, 0, upper)
-    check_range(v, 0, upper)
+    _check_triplet(h, s, v, upper, uppera)
     if normalised == False:
         h, s, v = _normalise(h, s, v, mode="hsv")
     return colorsys.hsv_to_rgb(h, s, v)
@@ -299,9 +524,7 @@ def hls2rgb(h, l, s, normalised=True):
         uppera = 1
     else:
         uppera = 360
-    check_range(h, 0, uppera)
-    check_range(s, 0, upper)
-    check_range(l, 0, upper)
+    _check_triplet(h, s, l, upper, uppera)
     if normalised == False:
         h, l, s = _normalise(h, l, s, mode="hls")
     return colorsys.hls_to_rgb(h, l, s)
@@ -324,9 +547,7 @@ def rgb2yuv(r, g, b):
     .. warning:: expected input must be between 0 and 1
     .. note:: the constants referenc used is  Rec. 601
     """
-    check_range(r, 0, 1)
-    check_range(g, 0, 1)
-    check_range(b, 0, 1)
+    _check_triplet(r, g, b, 1)
 
     # y = int(0.299 * r + 0.587 * g + 0.114 * b)
     # u = int(-0.14713 * r + -0.28886 * g + 0.436 * b)
@@ -346,9 +567,7 @@ def yuv2rgb(y, u, v):
     .. warning:: expected input must be between 0 and 255 (not normalised)
 
     """
-    check_range(y, 0, 1)
-    check_range(u, 0, 1)
-    check_range(v, 0, 1)
+    _check_triplet(y, u, v, 1)
     A, B, C, D = 701 / 615, 25251 / 63983, 209599 / 361005, 443 / 218
     r = y + A * v
     g = y - B * u - C * v
@@ -364,9 +583,7 @@ def rgb2yuv_int(r, g, b):
     .. warning:: expected input must be between 0 and 255 (not normalised)
 
     """
-    check_range(r, 0, 255)
-    check_range(g, 0, 255)
-    check_range(b, 0, 255)
+    _check_triplet(r, g, b, 255)
 
     y = int(0.299 * r + 0.587 * g + 0.114 * b)
     u = int(-32591 / 221500 * r + -63983 / 221500 * g + 0.436 * b)
@@ -383,15 +600,779 @@ def yuv2rgb_int(y, u, v):
     .. warning:: expected input must be between 0 and 255 (not normalised)
 
     """
-    check_range(y, 0, 255)
-    check_range(u, 0, 255)
-    check_range(v, 0, 255)
+    _check_triplet(y, u, v, 255)
     r = int(y + 1.13983 * v)
     g = int(y - 0.39465 * u - 0.58060 * v)
     b = int(y + 2.03211 * u)
     return (r, g, b)
 
 
+def _inverse(matrix):
+    # inverse of a 3x3 matrix (tuple of rows)
+    (a, b, c), (d, e, f), (g, h, i) = matrix
+    cofactors = (
+        (e * i - f * h, c * h - b * i, b * f - c * e),
+        (f * g - d * i, a * i - c * g, c * d - a * f),
+        (d * h - e * g, b * g - a * h, a * e - b * d),
+    )
+    det = a * cofactors[0][0] + b * cofactors[1][0] + c * cofactors[2][0]
+    return tuple(tuple(x / det for x in row) for row in cofactors)
+
+
+# sRGB (D65) to CIE XYZ matrix. XYZ values are scaled so that Y is 1 for white.
+# Inverse matrices are computed rather than rounded so that round trips are exact.
+_RGB2XYZ = (
+    (0.4124564, 0.3575761, 0.1804375),
+    (0.2126729, 0.7151522, 0.0721750),
+    (0.0193339, 0.1191920, 0.9503041),
+)
+_XYZ2RGB = _inverse(_RGB2XYZ)
+# D65 reference white (XYZ of RGB white, so that greys have no chroma in Lab)
+_WHITE = tuple(sum(row) for row in _RGB2XYZ)
+# OKLab matrices (linear sRGB to LMS, cube root of LMS to OKLab) from
+# https://bottosson.github.io/posts/oklab/
+_RGB2LMS = (
+    (0.4122214708, 0.5363325363, 0.0514459929),
+    (0.2119034982, 0.6806995451, 0.1073969566),
+    (0.0883024619, 0.2817188376, 0.6299787005),
+)
+_LMS2OKLAB = (
+    (0.2104542553, 0.7936177850, -0.0040720468),
+    (1.9779984951, -2.4285922050, 0.4505937099),
+    (0.0259040371, 0.7827717662, -0.8086757660),
+)
+_OKLAB2LMS = _inverse(_LMS2OKLAB)
+_LMS2RGB = _inverse(_RGB2LMS)
+_DELTA = 6 / 29
+
+
+def _dot(matrix, x, y, z):
+    return tuple(row[0] * x + row[1] * y + row[2] * z for row in matrix)
+
+
+def _to_linear(c):
+    # sRGB gamma expansion
+    return c / 12.92 if c <= 0.04045 else ((c + 0.055) / 1.055) ** 2.4
+
+
+def _from_linear(c, clip):
+    # sRGB gamma compression (odd extension for out of gamut values)
+    if clip:
+        c = min(1.0, max(0.0, c))
+    if abs(c) <= 0.0031308:
+        return 12.92 * c
+    return math.copysign(1.055 * abs(c) ** (1 / 2.4) - 0.055, c)
+
+
+def _rgb_input(r, g, b, normalised):
+    upper = 1 if normalised else 255
+    _check_triplet(r, g, b, upper)
+    if normalised == False:
+        r, g, b = _normalise(r, g, b)
+    return r, g, b
+
+
+def rgb2xyz(r, g, b, normalised=True):
+    """Convert an sRGB triplet into CIE XYZ (D65 white point)
+
+    :param bool normalised: if *normalised* is True, the input RGB triplet
+        should be in the range 0-1 (0-255 otherwise)
+    :return: the XYZ triplet, scaled so that Y is 1 for white
+
+    .. doctest::
+
+        >>> from colormap.colors import rgb2xyz
+        >>> [round(x, 4) for x in rgb2xyz(1, 1, 1)]
+        [0.9505, 1.0, 1.0888]
+
+    .. seealso:: :func:`xyz2rgb`, :func:`rgb2xyz_array`
+    """
+    r, g, b = _rgb_input(r, g, b, normalised)
+    return _dot(_RGB2XYZ, _to_linear(r), _to_linear(g), _to_linear(b))
+
+
+def xyz2rgb(x, y, z, clip=True):
+    """Convert a CIE XYZ triplet (D65 white point) into sRGB
+
+    :param bool clip: colors outside of the sRGB gamut are clipped to the
+        range 0-1. If False, the RGB values may be out of that range.
+    :return: the normalised RGB triplet
+
+    .. seealso:: :func:`rgb2xyz`, :func:`xyz2rgb_array`
+    """
+    return tuple(_from_linear(c, clip) for c in _dot(_XYZ2RGB, x, y, z))
+
+
+def xyz2lab(x, y, z):
+    """Convert a CIE XYZ triplet (D65 white point) into CIE Lab
+
+    :return: the Lab triplet (L in the range 0-100)
+
+    .. seealso:: :func:`lab2xyz`, :func:`rgb2lab`
+    """
+    fx, fy, fz = (
+        t ** (1 / 3) if t > _DELTA**3 else t / (3 * _DELTA**2) + 4 / 29
+        for t in (x / _WHITE[0], y / _WHITE[1], z / _WHITE[2])
+    )
+    return 116 * fy - 16, 500 * (fx - fy), 200 * (fy - fz)
+
+
+def lab2xyz(L, a, b):
+    """Convert a CIE Lab triplet into CIE XYZ (D65 white point)
+
+    .. seealso:: :func:`xyz2lab`, :func:`lab2rgb`
+    """
+    fy = (L + 16) / 116
+    fx, fz = fy + a / 500, fy - b / 200
+    return tuple(
+        white * (t**3 if t > _DELTA else 3 * _DELTA**2 * (t - 4 / 29)) for t, white in zip((fx, fy, fz), _WHITE)
+    )
+
+
+def lab2lch(L, a, b):
+    """Convert a CIE Lab triplet into CIE LCh (hue in degrees, 0-360)
+
+    .. seealso:: :func:`lch2lab`
+    """
+    return L, math.hypot(a, b), math.degrees(math.atan2(b, a)) % 360
+
+
+def lch2lab(L, c, h):
+    """Convert a CIE LCh triplet (hue in degrees) into CIE Lab
+
+    .. seealso:: :func:`lab2lch`
+    """
+    h = math.radians(h)
+    return L, c * math.cos(h), c * math.sin(h)
+
+
+def rgb2lab(r, g, b, normalised=True):
+    """Convert an sRGB triplet into CIE Lab (D65 white point)
+
+    Lab is designed to be perceptually uniform: the euclidean distance
+    between two Lab triplets approximates the perceived difference between
+    the two colors (see :func:`delta_e2000` for a better approximation).
+
+    :param bool normalised: if *normalised* is True, the input RGB triplet
+        should be in the range 0-1 (0-255 otherwise)
+    :return: the Lab triplet (L in the range 0-100)
+
+    .. doctest::
+
+        >>> from colormap.colors import rgb2lab
+        >>> [round(x, 2) for x in rgb2lab(255, 0, 0, normalised=False)]
+        [53.24, 80.09, 67.2]
+
+    .. seealso:: :func:`lab2rgb`, :func:`rgb2lab_array`
+    """
+    return xyz2lab(*rgb2xyz(r, g, b, normalised=normalised))
+
+
+def lab2rgb(L, a, b, clip=True):
+    """Convert a CIE Lab triplet into sRGB
+
+    :param bool clip: colors outside of the sRGB gamut are clipped to the
+        range 0-1. If False, the RGB values may be out of that range.
+    :return: the normalised RGB triplet
+
+    .. seealso:: :func:`rgb2lab`, :func:`lab2rgb_array`
+    """
+    return xyz2rgb(*lab2xyz(L, a, b), clip=clip)
+
+
+def rgb2lch(r, g, b, normalised=True):
+    """Convert an sRGB triplet into CIE LCh (the polar form of Lab)
+
+    :param bool normalised: if *normalised* is True, the input RGB triplet
+        should be in the range 0-1 (0-255 otherwise)
+    :return: the LCh triplet (L in the range 0-100, hue in degrees)
+
+    .. seealso:: :func:`lch2rgb`, :func:`rgb2lch_array`
+    """
+    return lab2lch(*rgb2lab(r, g, b, normalised=normalised))
+
+
+def lch2rgb(L, c, h, clip=True):
+    """Convert a CIE LCh triplet (hue in degrees) into sRGB
+
+    :param bool clip: colors outside of the sRGB gamut are clipped to the
+        range 0-1. If False, the RGB values may be out of that range.
+    :return: the normalised RGB triplet
+
+    .. seealso:: :func:`rgb2lch`, :func:`lch2rgb_array`
+    """
+    return lab2rgb(*lch2lab(L, c, h), clip=clip)
+
+
+def rgb2oklab(r, g, b, normalised=True):
+    """Convert an sRGB triplet into OKLab
+
+    `OKLab <https://bottosson.github.io/posts/oklab/>`_ is a perceptual
+    color space with a better hue uniformity than CIE Lab.
+
+    :param bool normalised: if *normalised* is True, the input RGB triplet
+        should be in the range 0-1 (0-255 otherwise)
+    :return: the OKLab triplet (L in the range 0-1)
+
+    .. doctest::
+
+        >>> from colormap.colors import rgb2oklab
+        >>> [round(x, 4) for x in rgb2oklab(1, 1, 1)]
+        [1.0, 0.0, 0.0]
+
+    .. seealso:: :func:`oklab2rgb`, :func:`rgb2oklab_array`
+    """
+    r, g, b = _rgb_input(r, g, b, normalised)
+    lms = _dot(_RGB2LMS, _to_linear(r), _to_linear(g), _to_linear(b))
+    return _dot(_LMS2OKLAB, *(math.copysign(abs(c) ** (1 / 3), c) for c in lms))
+
+
+def oklab2rgb(L, a, b, clip=True):
+    """Convert an OKLab triplet into sRGB
+
+    :param bool clip: colors outside of the sRGB gamut are clipped to the
+        range 0-1. If False, the RGB values may be out of that range.
+    :return: the normalised RGB triplet
+
+    .. seealso:: :func:`rgb2oklab`, :func:`oklab2rgb_array`
+    """
+    lms = (c**3 for c in _dot(_OKLAB2LMS, L, a, b))
+    return tuple(_from_linear(c, clip) for c in _dot(_LMS2RGB, *lms))
+
+
+def _check_range_array(data, dmin, dmax):
+    # vectorised version of check_range. NaN are rejected as well.
+    import numpy as np
+
+    if data.size and not (np.all(data >= dmin) and np.all(data <= dmax)):
+        bad = data[~((data >= dmin) & (data <= dmax))].flat[0]
+        raise ValueError(f"Value must be in the range [{dmin}-{dmax}]. You provided {bad}")
+
+
+def _as_triplets(data):
+    # return a float array with a trailing dimension of length 3
+    import numpy as np
+
+    data = np.asarray(data, dtype=float)
+    if data.ndim == 0 or data.shape[-1] != 3:
+        raise ValueError("input must have a trailing dimension of length 3")
+    return data
+
+
+def _store_triplets(out, shape, c1, c2, c3):
+    # write the 3 channels in the *out* buffer (created if None)
+    import numpy as np
+
+    if out is None:
+        out = np.empty(shape)
+    elif out.shape != shape:
+        raise ValueError(f"out buffer must have shape {shape}. You provided {out.shape}")
+    out[..., 0] = c1
+    out[..., 1] = c2
+    out[..., 2] = c3
+    return out
+
+
+def _hue_array(r, g, b, maxc, rangec):
+    # hue as computed by colorsys.rgb_to_hsv / rgb_to_hls (0 for greys)
+    import numpy as np
+
+    grey = rangec == 0
+    rangec = np.where(grey, 1, rangec)
+    rc = (maxc - r) / rangec
+    gc = (maxc - g) / rangec
+    bc = (maxc - b) / rangec
+    h = np.where(r == maxc, bc - gc, np.where(g == maxc, 2.0 + rc - bc, 4.0 + gc - rc))
+    h = (h / 6.0) % 1.0
+    h[grey] = 0.0
+    return h
+
+
+def rgb2hsv_array(rgb, normalised=True, out=None):
+    """Convert an array of RGB triplets into HSV triplets
+
+    This is the vectorised version of :func:`rgb2hsv`.
+
+    :param rgb: an array-like with a trailing dimension of length 3
+    :param bool normalised: if *normalised* is True, the input RGB values
+        should be in the range 0-1 (0-255 otherwise)
+    :param out: an optional float array of the same shape as *rgb* where to
+        store the result. It may be *rgb* itself.
+    :return: the HSV array in the range 0-1
+
+    .. seealso:: :func:`rgb2hsv`, :func:`hsv2rgb_array`
+    """
+    import numpy as np
+
+    data = _as_triplets(rgb)
+    _check_range_array(data, 0, 1 if normalised else 255)
+    if normalised is False:
+        data = data / 255
+    r, g, b = data[..., 0], data[..., 1], data[..., 2]
+    maxc = data.max(axis=-1)
+    rangec = maxc - data.min(axis=-1)
+    h = _hue_array(r, g, b, maxc, rangec)
+    s = np.divide(rangec, maxc, out=np.zeros_like(maxc), where=rangec != 0)
+    return _store_triplets(out, data.shape, h, s, maxc)
+
+
+def rgb2hls_array(rgb, normalised=True, out=None):
+    """Convert an array of RGB triplets into HLS triplets
+
+    This is the vectorised version of :func:`rgb2hls`.
+
+    :param rgb: an array-like with a trailing dimension of length 3
+    :param bool normalised: if *normalised* is True, the input RGB values
+        should be in the range 0-1 (0-255 otherwise)
+    :param out: an optional float array of the same shape as *rgb* where to
+        store the result. It may be *rgb* itself.
+    :return: the HLS array in the range 0-1
+
+    .. seealso:: :func:`rgb2hls`, :func:`hls2rgb_array`
+    """
+    import numpy as np
+
+    data = _as_triplets(rgb)
+    _check_range_array(data, 0, 1 if normalised else 255)
+    if normalised is False:
+        data = data / 255
+    r, g, b = data[..., 0], data[..., 1], data[..., 2]
+    maxc = data.max(axis=-1)
+    minc = data.min(axis=-1)
+    sumc = maxc + minc
+    rangec = maxc - minc
+    l = sumc / 2.0
+    h = _hue_array(r, g, b, maxc, rangec)
+    # as in colorsys, 2 - maxc - minc (not always equal to 2 - sumc)
+    denominator = np.where(l <= 0.5, sumc, 2.0 - maxc - minc)
+    s = np.divide(rangec, denominator, out=np.zeros_like(maxc), where=rangec != 0)
+    return _store_triplets(out, data.shape, h, l, s)
+
+
+def hsv2rgb_array(hsv, normalised=True, out=None):
+    """Convert an array of HSV triplets into RGB triplets
+
+    This is the vectorised version of :func:`hsv2rgb`.
+
+    :param hsv: an array-like with a trailing dimension of length 3
+    :param bool normalised: If *normalised* is True, the input HSV values
+        should be in the range 0-1; otherwise, H in the range 0-360 and SV
+        in the range 0-100.
+    :param out: an optional float array of the same shape as *hsv* where to
+        store the result. It may be *hsv* itself.
+    :return: the RGB array in the range 0-1
+
+    .. seealso:: :func:`hsv2rgb`, :func:`rgb2hsv_array`
+    """
+    import numpy as np
+
+    data = _as_triplets(hsv)
+    h, s, v = data[..., 0], data[..., 1], data[..., 2]
+    _check_range_array(h, 0, 1 if normalised else 360)
+    _check_range_array(s, 0, 1 if normalised else 100)
+    _check_range_array(v, 0, 1 if normalised else 100)
+    if normalised is False:
+        h, s, v = _normalise(h, s, v, mode="hsv")
+
+    h6 = h * 6.0
+    i = np.floor(h6)
+    f = h6 - i
+    i = i.astype(int) % 6
+    p = v * (1.0 - s)
+    q = v * (1.0 - s * f)
+    t = v * (1.0 - s * (1.0 - f))
+    r = np.choose(i, [v, q, p, p, t, v])
+    g = np.choose(i, [t, v, v, q, p, p])
+    b = np.choose(i, [p, p, t, v, v, q])
+    return _store_triplets(out, data.shape, r, g, b)
+
+
+def hls2rgb_array(hls, normalised=True, out=None):
+    """Convert an array of HLS triplets into RGB triplets
+
+    This is the vectorised version of :func:`hls2rgb`.
+
+    :param hls: an array-like with a trailing dimension of length 3
+    :param bool normalised: If *normalised* is True, the input HLS values
+        should be in the range 0-1; otherwise, H in the range 0-360 and LS
+        in the range 0-100.
+    :param out: an optional float array of the same shape as *hls* where to
+        store the result. It may be *hls* itself.
+    :return: the RGB array in the range 0-1
+
+    .. seealso:: :func:`hls2rgb`, :func:`rgb2hls_array`
+    """
+    import numpy as np
+
+    data = _as_triplets(hls)
+    h, l, s = data[..., 0], data[..., 1], data[..., 2]
+    _check_range_array(h, 0, 1 if normalised else 360)
+    _check_range_array(s, 0, 1 if normalised else 100)
+    _check_range_array(l, 0, 1 if normalised else 100)
+    if normalised is False:
+        h, l, s = _normalise(h, l, s, mode="hls")
+
+    m2 = np.where(l <= 0.5, l * (1.0 + s), l + s - (l * s))
+    m1 = 2.0 * l - m2
+
+    def _channel(hue):
+        hue = hue % 1.0
+        return np.where(
+            hue < 1.0 / 6.0,
+            m1 + (m2 - m1) * hue * 6.0,
+            np.where(hue < 0.5, m2, np.where(hue < 2.0 / 3.0, m1 + (m2 - m1) * (2.0 / 3.0 - hue) * 6.0, m1)),
+        )
+
+    return _store_triplets(out, data.shape, _channel(h + 1.0 / 3.0), _channel(h), _channel(h - 1.0 / 3.0))
+
+
+def rgb2yuv_array(rgb, out=None):
+    """Convert an array of RGB triplets into YUV triplets
+
+    This is the vectorised version of :func:`rgb2yuv`. Input values must be
+    between 0 and 1.
+
+    .. seealso:: :func:`rgb2yuv`, :func:`yuv2rgb_array`
+    """
+    data = _as_triplets(rgb)
+    _check_range_array(data, 0, 1)
+    r, g, b = data[..., 0], data[..., 1], data[..., 2]
+    y = 0.299 * r + 0.587 * g + 0.114 * b
+    u = -32591 / 221500 * r + -63983 / 221500 * g + 0.436 * b
+    v = 0.615 * r + -72201 / 140200 * g + -7011 / 70100 * b
+    return _store_triplets(out, data.shape, y, u, v)
+
+
+def yuv2rgb_array(yuv, out=None):
+    """Convert an array of YUV triplets into RGB triplets
+
+    This is the vectorised version of :func:`yuv2rgb`. Input values must be
+    between 0 and 1.
+
+    .. seealso:: :func:`yuv2rgb`, :func:`rgb2yuv_array`
+    """
+    data = _as_triplets(yuv)
+    _check_range_array(data, 0, 1)
+    y, u, v = data[..., 0], data[..., 1], data[..., 2]
+    A, B, C, D = 701 / 615, 25251 / 63983, 209599 / 361005, 443 / 218
+    return _store_triplets(out, data.shape, y + A * v, y - B * u - C * v, y + D * u)
+
+
+def rgb2yuv_int_array(rgb, out=None):
+    """Convert an array of RGB triplets into YUV triplets
+
+    This is the vectorised version of :func:`rgb2yuv_int`. Input values must
+    be between 0 and 255. Values are truncated towards zero as in the scalar
+    version; use an integer *out* buffer to get integers.
+
+    .. seealso:: :func:`rgb2yuv_int`, :func:`yuv2rgb_int_array`
+    """
+    import numpy as np
+
+    data = _as_triplets(rgb)
+    _check_range_array(data, 0, 255)
+    r, g, b = data[..., 0], data[..., 1], data[..., 2]
+    y = np.trunc(0.299 * r + 0.587 * g + 0.114 * b)
+    u = np.trunc(-32591 / 221500 * r + -63983 / 221500 * g + 0.436 * b)
+    v = np.trunc(0.615 * r + -72201 / 140200 * g + -7011 / 70100 * b)
+    return _store_triplets(out, data.shape, y, u, v)
+
+
+def yuv2rgb_int_array(yuv, out=None):
+    """Convert an array of YUV triplets into RGB triplets
+
+    This is the vectorised version of :func:`yuv2rgb_int`. Input values must
+    be between 0 and 255. Values are truncated towards zero as in the scalar
+    version; use an integer *out* buffer to get integers.
+
+    .. seealso:: :func:`yuv2rgb_int`, :func:`rgb2yuv_int_array`
+    """
+    import numpy as np
+
+    data = _as_triplets(yuv)
+    _check_range_array(data, 0, 255)
+    y, u, v = data[..., 0], data[..., 1], data[..., 2]
+    r = np.trunc(y + 1.13983 * v)
+    g = np.trunc(y - 0.39465 * u - 0.58060 * v)
+    b = np.trunc(y + 2.03211 * u)
+    return _store_triplets(out, data.shape, r, g, b)
+
+
+def _to_linear_array(rgb):
+    import numpy as np
+
+    return np.where(rgb <= 0.04045, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+
+
+def _from_linear_array(rgb, clip):
+    import numpy as np
+
+    if clip:
+        rgb = np.clip(rgb, 0, 1)
+    magnitude = np.abs(rgb)
+    # np.maximum avoids warnings in the branch not selected
+    compressed = 1.055 * np.maximum(magnitude, 0.0031308) ** (1 / 2.4) - 0.055
+    return np.where(magnitude <= 0.0031308, 12.92 * rgb, np.copysign(compressed, rgb))
+
+
+def _rgb_input_array(rgb, normalised):
+    data = _as_triplets(rgb)
+    _check_range_array(data, 0, 1 if normalised else 255)
+    if normalised is False:
+        data = data / 255
+    return data
+
+
+def _matrix_product(data, matrix, out):
+    # product of each triplet by a 3x3 matrix stored in the *out* buffer
+    import numpy as np
+
+    result = data @ np.array(matrix).T
+    if out is None:
+        return result
+    return _store_triplets(out, data.shape, result[..., 0], result[..., 1], result[..., 2])
+
+
+def rgb2xyz_array(rgb, normalised=True, out=None):
+    """Convert an array of sRGB triplets into CIE XYZ triplets
+
+    This is the vectorised version of :func:`rgb2xyz`.
+
+    :param rgb: an array-like with a trailing dimension of length 3
+    :param bool normalised: if *normalised* is True, the input RGB values
+        should be in the range 0-1 (0-255 otherwise)
+    :param out: an optional float array of the same shape as *rgb* where to
+        store the result. It may be *rgb* itself.
+
+    .. seealso:: :func:`rgb2xyz`, :func:`xyz2rgb_array`
+    """
+    return _matrix_product(_to_linear_array(_rgb_input_array(rgb, normalised)), _RGB2XYZ, out)
+
+
+def xyz2rgb_array(xyz, clip=True, out=None):
+    """Convert an array of CIE XYZ triplets into sRGB triplets
+
+    This is the vectorised version of :func:`xyz2rgb`.
+
+    .. seealso:: :func:`xyz2rgb`, :func:`rgb2xyz_array`
+    """
+    import numpy as np
+
+    data = _as_triplets(xyz)
+    rgb = _from_linear_array(data @ np.array(_XYZ2RGB).T, clip)
+    return _store_triplets(out, data.shape, rgb[..., 0], rgb[..., 1], rgb[..., 2])
+
+
+def xyz2lab_array(xyz, out=None):
+    """Convert an array of CIE XYZ triplets into CIE Lab triplets
+
+    This is the vectorised version of :func:`xyz2lab`.
+
+    .. seealso:: :func:`xyz2lab`, :func:`lab2xyz_array`
+    """
+    import numpy as np
+
+    data = _as_triplets(xyz)
+    t = data / np.array(_WHITE)
+    f = np.where(t > _DELTA**3, np.cbrt(t), t / (3 * _DELTA**2) + 4 / 29)
+    fx, fy, fz = f[..., 0], f[..., 1], f[..., 2]
+    return _store_triplets(out, data.shape, 116 * fy - 16, 500 * (fx - fy), 200 * (fy - fz))
+
+
+def lab2xyz_array(lab, out=None):
+    """Convert an array of CIE Lab triplets into CIE XYZ triplets
+
+    This is the vectorised version of :func:`lab2xyz`.
+
+    .. seealso:: :func:`lab2xyz`, :func:`xyz2lab_array`
+    """
+    import numpy as np
+
+    data = _as_triplets(lab)
+    fy = (data[..., 0] + 16) / 116
+
+    def _finv(t, white):
+        return white * np.where(t > _DELTA, t**3, 3 * _DELTA**2 * (t - 4 / 29))
+
+    return _store_triplets(
+        out,
+        data.shape,
+        _finv(fy + data[..., 1] / 500, _WHITE[0]),
+        _finv(fy, _WHITE[1]),
+        _finv(fy - data[..., 2] / 200, _WHITE[2]),
+    )
+
+
+def lab2lch_array(lab, out=None):
+    """Convert an array of CIE Lab triplets into CIE LCh triplets
+
+    This is the vectorised version of :func:`lab2lch`.
+    """
+    import numpy as np
+
+    data = _as_triplets(lab)
+    a, b = data[..., 1], data[..., 2]
+    return _store_triplets(out, data.shape, data[..., 0], np.hypot(a, b), np.degrees(np.arctan2(b, a)) % 360)
+
+
+def lch2lab_array(lch, out=None):
+    """Convert an array of CIE LCh triplets into CIE Lab triplets
+
+    This is the vectorised version of :func:`lch2lab`.
+    """
+    import numpy as np
+
+    data = _as_triplets(lch)
+    c, h = data[..., 1], np.radians(data[..., 2])
+    return _store_triplets(out, data.shape, data[..., 0], c * np.cos(h), c * np.sin(h))
+
+
+def rgb2lab_array(rgb, normalised=True, out=None):
+    """Convert an array of sRGB triplets into CIE Lab triplets
+
+    This is the vectorised version of :func:`rgb2lab`.
+
+    :param rgb: an array-like with a trailing dimension of length 3
+    :param bool normalised: if *normalised* is True, the input RGB values
+        should be in the range 0-1 (0-255 otherwise)
+    :param out: an optional float array of the same shape as *rgb* where to
+        store the result. It may be *rgb* itself.
+
+    .. seealso:: :func:`rgb2lab`, :func:`lab2rgb_array`
+    """
+    return xyz2lab_array(rgb2xyz_array(rgb, normalised=normalised), out=out)
+
+
+def lab2rgb_array(lab, clip=True, out=None):
+    """Convert an array of CIE Lab triplets into sRGB triplets
+
+    This is the vectorised version of :func:`lab2rgb`.
+
+    .. seealso:: :func:`lab2rgb`, :func:`rgb2lab_array`
+    """
+    return xyz2rgb_array(lab2xyz_array(lab), clip=clip, out=out)
+
+
+def rgb2lch_array(rgb, normalised=True, out=None):
+    """Convert an array of sRGB triplets into CIE LCh triplets
+
+    This is the vectorised version of :func:`rgb2lch`.
+
+    .. seealso:: :func:`rgb2lch`, :func:`lch2rgb_array`
+    """
+    return lab2lch_array(rgb2lab_array(rgb, normalised=normalised), out=out)
+
+
+def lch2rgb_array(lch, clip=True, out=None):
+    """Convert an array of CIE LCh triplets into sRGB triplets
+
+    This is the vectorised version of :func:`lch2rgb`.
+
+    .. seealso:: :func:`lch2rgb`, :func:`rgb2lch_array`
+    """
+    return lab2rgb_array(lch2lab_array(lch), clip=clip, out=out)
+
+
+def rgb2oklab_array(rgb, normalised=True, out=None):
+    """Convert an array of sRGB triplets into OKLab triplets
+
+    This is the vectorised version of :func:`rgb2oklab`.
+
+    .. seealso:: :func:`rgb2oklab`, :func:`oklab2rgb_array`
+    """
+    import numpy as np
+
+    linear = _to_linear_array(_rgb_input_array(rgb, normalised))
+    lms = np.cbrt(linear @ np.array(_RGB2LMS).T)
+    return _matrix_product(lms, _LMS2OKLAB, out)
+
+
+def oklab2rgb_array(oklab, clip=True, out=None):
+    """Convert an array of OKLab triplets into sRGB triplets
+
+    This is the vectorised version of :func:`oklab2rgb`.
+
+    .. seealso:: :func:`oklab2rgb`, :func:`rgb2oklab_array`
+    """
+    import numpy as np
+
+    data = _as_triplets(oklab)
+    lms = (data @ np.array(_OKLAB2LMS).T) ** 3
+    rgb = _from_linear_array(lms @ np.array(_LMS2RGB).T, clip)
+    return _store_triplets(out, data.shape, rgb[..., 0], rgb[..., 1], rgb[..., 2])
+
+
+def delta_e2000(lab1, lab2, kL=1, kC=1, kH=1):
+    """Return the CIEDE2000 color difference between Lab triplets
+
+    A difference of about 1 is the smallest difference perceived by the
+    human eye. The function is vectorised: *lab1* and *lab2* can be arrays of
+    Lab triplets (trailing dimension of length 3) that are broadcast
+    together.
+
+    :param lab1: a Lab triplet or an array of Lab triplets
+    :param lab2: a Lab triplet or an array of Lab triplets
+    :param kL, kC, kH: weighting factors of the lightness, chroma and hue
+        differences
+    :return: a float if both inputs are triplets, an array otherwise
+
+    .. doctest::
+
+        >>> from colormap.colors import delta_e2000
+        >>> round(delta_e2000((50, 2.6772, -79.7751), (50, 0, -82.7485)), 4)
+        2.0425
+
+    Reference: G. Sharma, W. Wu, E. N. Dalal, "The CIEDE2000 color-difference
+    formula: implementation notes, supplementary test data, and mathematical
+    observations", Color Research and Application, 2005.
+    """
+    import numpy as np
+
+    lab1, lab2 = _as_triplets(lab1), _as_triplets(lab2)
+    L1, a1, b1 = lab1[..., 0], lab1[..., 1], lab1[..., 2]
+    L2, a2, b2 = lab2[..., 0], lab2[..., 1], lab2[..., 2]
+
+    C7 = ((np.hypot(a1, b1) + np.hypot(a2, b2)) / 2) ** 7
+    G = 0.5 * (1 - np.sqrt(C7 / (C7 + 25.0**7)))
+    a1, a2 = (1 + G) * a1, (1 + G) * a2
+    C1, C2 = np.hypot(a1, b1), np.hypot(a2, b2)
+    h1 = np.degrees(np.arctan2(b1, a1)) % 360
+    h2 = np.degrees(np.arctan2(b2, a2)) % 360
+
+    # hue difference and mean hue, 0 if one of the colors is achromatic
+    chromatic = C1 * C2 != 0
+    dh = h2 - h1
+    dh = np.where(dh > 180, dh - 360, np.where(dh < -180, dh + 360, dh))
+    dh = np.where(chromatic, dh, 0)
+    dH = 2 * np.sqrt(C1 * C2) * np.sin(np.radians(dh / 2))
+    hsum = h1 + h2
+    hmean = np.where(np.abs(h1 - h2) > 180, np.where(hsum < 360, hsum + 360, hsum - 360), hsum) / 2
+    hmean = np.where(chromatic, hmean, hsum)
+
+    Lmean = (L1 + L2) / 2
+    Cmean = (C1 + C2) / 2
+    T = (
+        1
+        - 0.17 * np.cos(np.radians(hmean - 30))
+        + 0.24 * np.cos(np.radians(2 * hmean))
+        + 0.32 * np.cos(np.radians(3 * hmean + 6))
+        - 0.20 * np.cos(np.radians(4 * hmean - 63))
+    )
+    SL = 1 + 0.015 * (Lmean - 50) ** 2 / np.sqrt(20 + (Lmean - 50) ** 2)
+    SC = 1 + 0.045 * Cmean
+    SH = 1 + 0.015 * Cmean * T
+    Cmean7 = Cmean**7
+    RT = -2 * np.sqrt(Cmean7 / (Cmean7 + 25.0**7)) * np.sin(np.radians(60 * np.exp(-(((hmean - 275) / 25) ** 2))))
+
+    dL = (L2 - L1) / (kL * SL)
+    dC = (C2 - C1) / (kC * SC)
+    dH = dH / (kH * SH)
+    result = np.sqrt(dL**2 + dC**2 + dH**2 + RT * dC * dH)
+    if result.ndim == 0:
+        return float(result)
+    return result
+
+
 def _denormalise(r, g, b, mode="rgb"):
     assert mode in ["rgb", "hls", "hsv"], f"Please provide valid mode in [rgb, hls, hsv]. you provided {mode}"
     if mode == "rgb":
@@ -414,7 +1395,8 @@ def to_intensity(n):
     :param n: value between 0 and 1
     :return: value between 0 and 255; round(n*127.5+127.5)
     """
-    check_range(n, 0, 1)
+    if not _trusted.get():
+        check_range(n, 0, 1)
     return round(n * 127.5 + 127.5)
 
 
@@ -431,6 +1413,8 @@ class HEX(object):
 
     """
 
+    __slots__ = ()
+
     def __init__(self):
         pass
 
@@ -443,14 +1427,18 @@ class HEX(object):
          * #0000FF
          * 0x0000FF
          * 0xFA1
+
+        If *verbose* is True, the reason why the value is invalid is printed.
+        See also :func:`parse_hex_color`.
         """
-        try:
-            self.get_standard_hex_color(value)
+        if parse_hex_color(value) is not None:
             return True
-        except Exception as err:
-            if verbose:
+        if verbose:
+            try:
+                self.get_standard_hex_color(value)
+            except Exception as err:
                 print(err)
-            return False
+        return False
 
     def get_standard_hex_color(self, value):
         """Return standard hexadecimal color
@@ -458,6 +1446,10 @@ class HEX(object):
         By standard, we mean a string that starts with # sign followed by 6
         character, e.g. #AABBFF
         """
+        hexa = parse_hex_color(value)
+        if hexa is not None:
+            return hexa
+        # invalid value: find out why
         if isinstance(value, str) == False:
             raise TypeError("value must be a string")
         if len(value) <= 3:
@@ -523,32 +1515,37 @@ class Color(HEX):
 
     """
 
-    # Get official color names
+    # the attributes are slots (no __dict__: smaller instances and faster
+    # access). The HSV, HLS and YIQ triplets are computed on demand and
+    # cached until the color changes. normalised is unused but could be set
+    # on the instances before.
+    __slots__ = ("_name", "_rgb", "_hex", "_hsv", "_hls", "_yiq", "normalised")
+
+    # Get official color names. Lookups are made with the read-only XFree86_index
+    # built once for all; those attributes are kept for backward compatibility.
     colors = XFree86_colors.copy()
-    # add color names without spaces
-    aliases = dict([(x.replace(" ", ""), x) for x in colors.keys() if " " in x])
-    # add color names without spaces in lower cases
-    aliases.update([(x.replace(" ", "").lower(), x) for x in colors.keys() if " " in x])
-    # add color names in lower case
-    aliases.update(dict([(x.lower(), x) for x in colors.keys()]))
-    aliases.update(dict([(x, x) for x in colors.keys()]))
+    # color names with and without spaces, in lower cases or not
+    aliases = dict(XFree86_index.aliases)
 
     # keep track of all possible names
-    color_names = sorted(list(set(list(colors.keys()) + list(aliases.keys()))))
+    color_names = sorted(aliases.keys())
 
     def __init__(self, name=None, rgb=None, hls=None, hsv=None):
         super(Color, self).__init__()
         self._name = None
-        self._mode = None
         self._rgb = None
+        self._hsv = None
+        self._hls = None
+        self._yiq = None
 
         # Does the user provided the name argument (first one) as a string ?
         if isinstance(name, str):
             # if so, it can be a valid human name (e.g., red) or an hex
             # assuming that valid hexadecimal starts with # or 0x,
             # if we can interpret the string as an hexadecimal, we are done
-            if self.is_valid_hex_color(name, verbose=False):
-                self.hex = name
+            hexa = parse_hex_color(name)
+            if hexa is not None:
+                self.hex = hexa
             else:
                 # if not, then, the user probably provided a valid color name
                 # the property will check the validity.
@@ -572,11 +1569,11 @@ class Color(HEX):
         return self._name
 
     def _set_name(self, name):
-        assert name in self.color_names, f"Please provide valid name from {self.color_names}. you provided {name}"
-        name = self.aliases[name]
+        assert name in XFree86_index.aliases, f"Please provide valid name from {self.color_names}. you provided {name}"
+        name = XFree86_index.aliases[name]
         self._name = name
         # set hex and rgb at the same time based on the name
-        self.hex = self.colors[name]
+        self.hex = XFree86_index.names[name]
 
     name = property(_get_name, _set_name)
     color = property(_get_name, _set_name)
@@ -586,16 +1583,14 @@ class Color(HEX):
 
     def _set_hex(self, value):
         # hex is an approximation made of 255 bits so do not define rgb here
-        if self.is_valid_hex_color(value):
-            value = self.get_standard_hex_color(value)
-            self._hex = value
-            if self._hex in self.colors.values():
-                self._name = swapdict(self.colors, check_ambiguity=False)[self._hex]
-            else:
-                self._name = "undefined"
+        hexa = parse_hex_color(value)
+        if hexa is not None:
+            self._hex = hexa
+            self._name = XFree86_index.hexes.get(self._hex, "undefined")
             self._rgb = hex2rgb(self._hex, normalise=True)
+            self._hsv = self._hls = self._yiq = None
         else:
-            # just to warn the user
+            # raise an error explaining why the value is invalid
             self.get_standard_hex_color(value)
 
     hex = property(_get_hex, _set_hex, doc="getter/setter the hexadecimal value.")
@@ -605,16 +1600,24 @@ class Color(HEX):
 
     def _set_rgb(self, value):
         # set name, hex and rgb
-        self.hex = rgb2hex(*value, normalised=True)
+        if _trusted.get():
+            # no need to validate and parse the hexadecimal value
+            r, g, b = value
+            self._hex = "#%02X%02X%02X" % (int(r * 255), int(g * 255), int(b * 255))
+            self._name = XFree86_index.hexes.get(self._hex, "undefined")
+        else:
+            self.hex = rgb2hex(*value, normalised=True)
         # must reset rgb with its real value (set_hex may round the rgb)
         # in _set_hex
         self._rgb = value
+        self._hsv = self._hls = self._yiq = None
 
     rgb = property(_get_rgb, _set_rgb, doc="getter/setter the RGB values (3-length tuple)")
 
     def _get_hsv(self):
-        hsv = rgb2hsv(*self.rgb)
-        return hsv
+        if self._hsv is None:
+            self._hsv = rgb2hsv(*self.rgb)
+        return self._hsv
 
     def _set_hsv(self, value):
         # TODO: value must be normalised
@@ -623,8 +1626,9 @@ class Color(HEX):
     hsv = property(_get_hsv, _set_hsv, doc="getter/setter the HSV values (3-length tuple)")
 
     def _get_hls(self):
-        hls = rgb2hls(*self.rgb)
-        return hls
+        if self._hls is None:
+            self._hls = rgb2hls(*self.rgb)
+        return self._hls
 
     def _set_hls(self, value):
         # hls = _normalise(*value, mode="hls")
@@ -700,26 +1704,166 @@ class Color(HEX):
     value = property(_get_value, _set_value, doc="getter/setter the value in the HSV triplet")
 
     def _get_yiq(self):
-        return colorsys.rgb_to_yiq(*self.rgb)
+        if self._yiq is None:
+            self._yiq = colorsys.rgb_to_yiq(*self.rgb)
+        return self._yiq
 
     yiq = property(_get_yiq, doc="Getter for the YIQ triplet")
 
+    def _get_xyz(self):
+        return rgb2xyz(*self.rgb)
+
+    def _set_xyz(self, value):
+        self.rgb = xyz2rgb(*value)
+
+    xyz = property(_get_xyz, _set_xyz, doc="getter/setter the CIE XYZ values (clipped to the sRGB gamut)")
+
+    def _get_lab(self):
+        return rgb2lab(*self.rgb)
+
+    def _set_lab(self, value):
+        self.rgb = lab2rgb(*value)
+
+    lab = property(_get_lab, _set_lab, doc="getter/setter the CIE Lab values (clipped to the sRGB gamut)")
+
+    def _get_lch(self):
+        return rgb2lch(*self.rgb)
+
+    def _set_lch(self, value):
+        self.rgb = lch2rgb(*value)
+
+    lch = property(_get_lch, _set_lch, doc="getter/setter the CIE LCh values (clipped to the sRGB gamut)")
+
+    def _get_oklab(self):
+        return rgb2oklab(*self.rgb)
+
+    def _set_oklab(self, value):
+        self.rgb = oklab2rgb(*value)
+
+    oklab = property(_get_oklab, _set_oklab, doc="getter/setter the OKLab values (clipped to the sRGB gamut)")
+
+    def delta_e(self, other):
+        """Return the CIEDE2000 difference with another color
+
+        :param other: a :class:`Color` or any valid input of :class:`Color`
+        """
+        if not isinstance(other, Color):
+            other = Color(other)
+        return delta_e2000(self.lab, other.lab)
+
     def __str__(self):
+        hsv = self.hsv
+        hls = self.hls
         txt = "Color {0}\n".format(self.name)
         txt += "  hexa code: {0}\n".format(self.hex)
         txt += "  RGB code: {0}\n".format(self.rgb)
         txt += "  RGB code (un-normalised): {0}\n\n".format([x * 255 for x in self.rgb])
-        txt += "  HSV code: {0}\n".format(self.hsv)
-        txt += "  HSV code: (un-normalised) {0} {1} {2}\n\n".format(
-            self.hsv[0] * 360, self.hsv[1] * 100, self.hsv[2] * 100
-        )
-        txt += "  HLS code: {0}\n".format(self.hls)
-        txt += "  HLS code: (un-normalised) {0} {1} {2}\n\n".format(
-            self.hls[0] * 360, self.hls[1] * 100, self.hls[2] * 100
-        )
+        txt += "  HSV code: {0}\n".format(hsv)
+        txt += "  HSV code: (un-normalised) {0} {1} {2}\n\n".format(hsv[0] * 360, hsv[1] * 100, hsv[2] * 100)
+        txt += "  HLS code: {0}\n".format(hls)
+        txt += "  HLS code: (un-normalised) {0} {1} {2}\n\n".format(hls[0] * 360, hls[1] * 100, hls[2] * 100)
         return txt
 
 
+class ColormapRegistry:
+    """Names of the colormaps registered in matplotlib
+
+    Asking matplotlib for its colormap names returns a new list each time and
+    membership tests are then linear. Membership tests of this registry are
+    made on the dictionary of the matplotlib registry directly (O(1), always
+    up to date)::
+
+        >>> from colormap.colors import colormap_registry
+        >>> "viridis" in colormap_registry
+        True
+
+    The list of names is a snapshot (a tuple and a set) refreshed whenever
+    the names registered in matplotlib change (including a colormap
+    unregistered and another one registered). The snapshot is replaced in a
+    single assignment so that the registry can be shared between threads. If
+    matplotlib is not installed, the registry is empty.
+    """
+
+    def __init__(self):
+        self._mpl_colormaps = None
+        # names and set of names
+        self._snapshot = ((), frozenset())
+
+    def _get_mpl_colormaps(self):
+        if self._mpl_colormaps is None:
+            try:
+                from matplotlib import colormaps
+            except Exception:  # pragma: no cover
+                return ()
+            self._mpl_colormaps = colormaps
+        return self._mpl_colormaps
+
+    def _get_snapshot(self):
+        names = tuple(self._get_mpl_colormaps())
+        snapshot = self._snapshot
+        if names != snapshot[0]:
+            snapshot = (names, frozenset(names))
+            self._snapshot = snapshot
+        return snapshot
+
+    def __contains__(self, name):
+        if not isinstance(name, str):
+            return False
+        # the dictionary behind the matplotlib registry (the registry itself
+        # returns a copy of the colormap to test membership)
+        live = getattr(self._get_mpl_colormaps(), "_cmaps", None)
+        if isinstance(live, dict):
+            return name in live
+        return name in self._get_snapshot()[1]  # pragma: no cover
+
+    def __iter__(self):
+        return iter(self._get_snapshot()[0])
+
+    def __len__(self):
+        return len(self._get_mpl_colormaps())
+
+    def _get_names(self):
+        return list(self._get_snapshot()[0])
+
+    names = property(_get_names, doc="list of the matplotlib colormap names")
+
+
+#: registry shared by all :class:`Colormap` instances
+colormap_registry = ColormapRegistry()
+
+
+def _cmap_key(colors, reverse, N):
+    # hashable key describing a colormap specification or None if the
+    # specification cannot be hashed
+    if isinstance(colors, str):
+        # the matplotlib colormaps can be registered again under the same
+        # name: they are looked up each time
+        if colors in colormap_registry:
+            return None
+        return ("cmap", colors, bool(reverse), N)
+    try:
+        channels = tuple(sorted((name, tuple(values)) for name, values in colors.items()))
+        key = ("cmap", channels, bool(reverse), N)
+        hash(key)
+    except (AttributeError, TypeError):
+        return None
+    return key
+
+
+def _initialised(cmap):
+    # matplotlib computes the table of a colormap on first use
+    cmap._init()
+    return cmap
+
+
+def _reversed(cmap):
+    # colormap whose colors are a reversed view of the table of cmap
+    from matplotlib.colors import ListedColormap
+
+    cmap._init()
+    return ListedColormap(cmap._lut[: cmap.N][::-1], name=cmap.name)
+
+
 def plot_category(name):
     c = Colormap()
     assert name in c.categories, f"Use one of {c.categories}. you provided {name}"
@@ -729,7 +1873,7 @@ def plot_category(name):
 
 def plot_colormap(name):
     c = Colormap()
-    assert name in c.colormaps, f"Use one of {c.colormaps}. you provided {name}"
+    assert name in colormap_registry, f"Use one of {c.colormaps}. you provided {name}"
     c.test_colormap(name)
 
 
@@ -801,14 +1945,9 @@ class Colormap:
         ]
 
     def _get_colormap_mpl(self):
-        try:
-            from matplotlib.pyplot import colormaps as _cmaps
-
-            return _cmaps()
-        except Exception:  # pragma: no cover
-            return []
+        return colormap_registry.names
 
-    colormaps = property(_get_colormap_mpl)
+    colormaps = property(_get_colormap_mpl, doc="list of the matplotlib colormap names")
 
     def _get_cyclic(self):
         return ["twilight", "twilight_shifted", "hsv"]
@@ -955,8 +2094,8 @@ class Colormap:
         pylab.plot(x, blue, "bx-", alpha=0.5, markersize=15)
         pylab.ylim([-0.1, 1.1])
 
-    def cmap_bicolor(self, color1, color2, reverse=False, N=256):
-        """Provide 3 colors in format accepted by :class:`Color`
+    def cmap_bicolor(self, color1, color2, reverse=False, N=256, interp_space="rgb"):
+        """Provide 2 colors in format accepted by :class:`Color`
 
         ::
 
@@ -964,13 +2103,11 @@ class Colormap:
             >>> white = Color('white')
             >>> cmap = cmap_bicolor(red, white)
 
+        See :meth:`cmap_colors` for the *interp_space* parameter.
         """
-        c1 = Color(color1)
-        c2 = Color(color2)
-        dico = {"red": [c1.red, c2.red], "green": [c1.green, c2.green], "blue": [c1.blue, c2.blue]}
-        return self.cmap(dico, reverse=reverse, N=N)
+        return self.cmap_colors([color1, color2], reverse=reverse, N=N, interp_space=interp_space)
 
-    def cmap_linear(self, color1, color2, color3, reverse=False, N=256):
+    def cmap_linear(self, color1, color2, color3, reverse=False, N=256, interp_space="rgb"):
         """Provide 3 colors in format accepted by :class:`Color`
 
         ::
@@ -978,29 +2115,115 @@ class Colormap:
             red = Color('red')
             cmap = cmap_linear(red, 'white', '#0000FF')
 
+        See :meth:`cmap_colors` for the *interp_space* parameter.
+        """
+        return self.cmap_colors([color1, color2, color3], reverse=reverse, N=N, interp_space=interp_space)
+
+    def cmap_colors(self, colors, reverse=False, N=256, interp_space="rgb"):
+        """Return a colormap interpolating evenly spaced colors
+
+        :param list colors: any number of colors in format accepted by
+            :class:`Color`
+        :param bool reverse: reverse the colormap
+        :param int N: number of colors of the colormap
+        :param str interp_space: color space where the colors are interpolated:
+            "rgb" (default), or one of the perceptual spaces "lab", "oklab"
+            and "lch". Interpolating in RGB gives dull midpoints (e.g.
+            between red and green).
+
+        ::
+
+            cmap = cmap_colors(["red", "white", "blue", "black"], interp_space="oklab")
+
+        In RGB, a LinearSegmentedColormap is returned. In the other spaces,
+        the N colors are computed at once (see :func:`colormap.lut.lut_builder`)
+        and returned as a ListedColormap.
         """
-        c1 = Color(color1)
-        c2 = Color(color2)
-        c3 = Color(color3)
-        dico = {
-            "red": [c1.red, c2.red, c3.red],
-            "green": [c1.green, c2.green, c3.green],
-            "blue": [c1.blue, c2.blue, c3.blue],
-        }
+        if interp_space == "rgb":
+            colors = [Color(color) for color in colors]
+            dico = {
+                "red": [c.red for c in colors],
+                "green": [c.green for c in colors],
+                "blue": [c.blue for c in colors],
+            }
+            return self.cmap(dico, reverse=reverse, N=N)
+
+        from colormap.lut import _anchors_rgb, listed_cmap, lut_builder
+
+        rgb = _anchors_rgb(colors)
+        key = ("cmap_colors", tuple(map(tuple, rgb.tolist())), bool(reverse), N, interp_space)
+        cmap = cmap_cache.get_or_build(
+            key,
+            lambda: listed_cmap(
+                lut_builder(colors, N=N, reverse=reverse, dtype=float, interp_space=interp_space), name="my_color_map"
+            ),
+        )
+        return cmap.copy()
+
+    def cmap_discrete(self, colors, boundaries, under=None, over=None, bad=(0, 0, 0, 0)):
+        """Return a discrete colormap: one color per bin
+
+        :param list colors: N colors in format accepted by :class:`Color`
+        :param boundaries: N + 1 increasing values. Values in
+            [boundaries[i], boundaries[i + 1]) get the color i.
+        :param under: color of values under the first boundary (defaults to
+            the first color)
+        :param over: color of values over the last boundary (defaults to the
+            last color)
+        :param bad: color of NaN values (defaults to transparent black)
+        :return: a :class:`~colormap.discrete.DiscreteColormap`. Call it on an
+            array to classify and colorize it at once; its *cmap* and *norm*
+            attributes are the equivalent matplotlib ListedColormap and
+            BoundaryNorm.
+
+        ::
 
-        return self.cmap(dico, reverse=reverse, N=N)
+            dcmap = cmap_discrete(["blue", "yellow", "red"], [0, 10, 20, 50])
+            rgba = dcmap(data, bytes=True)
+            plt.imshow(data, cmap=dcmap.cmap, norm=dcmap.norm)
+
+        """
+        from colormap.discrete import DiscreteColormap
+
+        return DiscreteColormap(colors, boundaries, under=under, over=over, bad=bad)
 
     def cmap(self, colors=None, reverse=False, N=256):
         """Return a colormap object to be used within matplotlib
 
         :param dict colors: a dictionary that defines the RGB colors to be
             used in the colormap. See :meth:`get_cmap_heat` for an example.
+            It can also be the name of a matplotlib colormap or one of the
+            :attr:`diverging_black` or heat colormaps.
         :param bool reverse: reverse the colormap is  set to True (defaults to False)
-        :param int N: Defaults to 50
-
+        :param int N: Defaults to 256
+
+        Colormaps are built once and kept in :data:`colormap.cache.cmap_cache`
+        (except the matplotlib colormaps, which are looked up in the
+        matplotlib registry each time as they can be registered again).
+        Each call returns a copy of the cached colormap, which can be modified
+        (e.g. with set_bad()) without affecting the other callers. The
+        dictionary is not modified: a reversed colormap is a ListedColormap
+        whose colors are a reversed view of the table of the (cached) colormap
+        in the original order.
         """
+        return self._cached_cmap(colors, reverse, N).copy()
+
+    def _cached_cmap(self, colors, reverse, N):
+        # the colormap shared by all callers (never returned to the user)
+        key = _cmap_key(colors, reverse, N)
+        if reverse and isinstance(colors, dict):
+            forward = self._cached_cmap(colors, False, N)
+            if key is None:
+                return _reversed(forward)
+            return cmap_cache.get_or_build(key, lambda: _initialised(_reversed(forward)))
+        if key is None:
+            return self._build_cmap(colors, reverse, N)
+        # the table is computed before caching so that the copies reuse it
+        return cmap_cache.get_or_build(key, lambda: _initialised(self._build_cmap(colors, reverse, N)))
+
+    def _build_cmap(self, colors, reverse, N):
         # matplotlib colormaps
-        if colors in self.colormaps:
+        if colors in colormap_registry:
             if reverse and colors.endswith("_r") is False:
                 colors += "_r"
             from matplotlib import colormaps
@@ -1011,11 +2234,11 @@ class Colormap:
             c1, c2, c3 = colors.split("_")
             # special case of sky, which does not exists
             c3 = c3.replace("sky", "deep sky blue")
-            return self.cmap_linear(c1, c2, c3)
+            return self.cmap_linear(c1, c2, c3, reverse=reverse, N=N)
         elif colors == "heat":
-            return self.get_cmap_heat()
+            return self.get_cmap_heat_r() if reverse else self.get_cmap_heat()
         elif colors == "heat_r":
-            return self.get_cmap_heat_r()
+            return self.get_cmap_heat() if reverse else self.get_cmap_heat_r()
 
         # Keep these dependencies inside the function to allow
         # installation of colormap without those dependencies
@@ -1024,10 +2247,6 @@ class Colormap:
 
         # extracted from R, heat.colors(20)
 
-        if reverse:
-            for k in colors.keys():
-                colors[k].reverse()
-
         # If index not given, RGB colors are evenly-spaced in colormap.
         index = np.linspace(0, 1, len(colors["red"]))
 
@@ -1166,7 +2385,7 @@ class Colormap:
                 """input must be a list of srtings or a single string. Each string should be found. For a user-defined cmap, use test_colormap"""
             )
         for this in cmap_list:
-            if this not in self.colormaps and this not in self.diverging_black:
+            if this not in colormap_registry and this not in self.diverging_black:
                 raise ValueError(f"unknown colormap name {this}. Please check valid names in colormaps attribute")
 
         nrows = len(cmap_list)
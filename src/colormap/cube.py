@@ -0,0 +1,208 @@
+# -*- python -*-
+#
+#  This file is part of colormap software
+#
+#  Copyright (c) 2011-2024
+#
+#  File author(s): Thomas Cokelaer <cokelaer@gmail.com>
+#
+#  Distributed under the terms of the 3-clause BSD license.
+#  The full license is in the LICENSE file, distributed with this software.
+#
+##############################################################################
+"""3D lookup tables (cubes) of RGB transforms
+
+A :class:`ColorCube` samples a transform of RGB colors on a regular grid of
+size^3 colors. The transform is computed once; images are then transformed
+with a trilinear (or nearest) interpolation in the cube instead of
+converting every pixel::
+
+    >>> import numpy as np
+    >>> from colormap.colors import hls2rgb_array, rgb2hls_array
+    >>> from colormap.cube import ColorCube
+    >>> def lighter(rgb):
+    ...     hls = rgb2hls_array(rgb)
+    ...     hls[..., 1] = np.minimum(1, hls[..., 1] * 1.2)
+    ...     return hls2rgb_array(hls)
+    >>> cube = ColorCube.from_function(lighter, size=33)
+    >>> image = np.random.randint(0, 256, (1080, 1920, 3), dtype="uint8")  # doctest: +SKIP
+    >>> cube.apply(image)  # doctest: +SKIP
+
+Cubes can be saved in the numpy format and memory-mapped when loaded::
+
+    >>> cube.save("lighter.npy")  # doctest: +SKIP
+    >>> cube = ColorCube.load("lighter.npy")  # doctest: +SKIP
+
+The output of the transform may have any number of channels (e.g. 3 for
+RGB or YUV values) and any dtype. A cube of indices (kind="index", e.g. the
+index of the nearest XFree86 color, see :meth:`ColorCube.nearest_names`) is
+always applied with the nearest interpolation: interpolating indices would
+give meaningless values.
+"""
+import numpy as np
+
+from colormap.colorize import _chunks
+
+__all__ = ["ColorCube"]
+
+
+class ColorCube:
+    """A transform of RGB colors sampled on a regular size^3 grid
+
+    :param table: a (size, size, size, C) array. table[r, g, b] is the
+        transform of the color (r, g, b) / (size - 1). A (size, size, size)
+        array is accepted as well (one channel).
+    :param str kind: "values" (the default) if the table contains values
+        that can be interpolated, or "index" if it contains indices (or
+        labels) that can only be looked up with the nearest interpolation.
+
+    The table may be a memory-mapped array (see :meth:`load`).
+    """
+
+    def __init__(self, table, kind="values"):
+        if kind not in ("values", "index"):
+            raise ValueError(f"kind must be 'values' or 'index'. You provided {kind}")
+        if table.ndim == 3:
+            table = table[..., None]
+        if table.ndim != 4 or not table.shape[0] == table.shape[1] == table.shape[2]:
+            raise ValueError("table must be a (size, size, size, C) array")
+        if table.shape[0] < 2:
+            raise ValueError("size must be at least 2")
+        self.table = table
+        self.kind = kind
+
+    def _get_size(self):
+        return self.table.shape[0]
+
+    size = property(_get_size, doc="number of samples per channel")
+
+    def __repr__(self):
+        return f"ColorCube(size={self.size}, channels={self.table.shape[-1]}, dtype={self.table.dtype}, kind={self.kind})"
+
+    @classmethod
+    def from_function(cls, func, size=33, dtype=None, kind="values"):
+        """Sample a transform of RGB colors on a size^3 grid
+
+        :param func: a function of an (..., 3) array of normalised RGB values
+            returning an (..., C) array (or an (...) array)
+        :param int size: number of samples per channel. With 256, uint8
+            images are transformed exactly (no interpolation).
+        :param dtype: dtype of the table. If "uint8", the output of the
+            function is expected to be normalised and is stored as 0-255
+            values (4 times less memory than float32).
+        :param str kind: "values" or "index" (see :class:`ColorCube`)
+        """
+        values = np.linspace(0, 1, size)
+        table = None
+        # sampled one red plane at a time to bound the memory
+        for red in range(size):
+            grid = np.empty((size, size, 3))
+            grid[..., 0] = values[red]
+            grid[..., 1] = values[:, None]
+            grid[..., 2] = values[None, :]
+            plane = np.asarray(func(grid))
+            if plane.ndim == 2:
+                plane = plane[..., None]
+            if table is None:
+                dtype = plane.dtype if dtype is None else np.dtype(dtype)
+                table = np.empty((size, size, size, plane.shape[-1]), dtype=dtype)
+            if dtype == np.uint8 and plane.dtype != np.uint8:
+                plane = np.round(np.clip(plane, 0, 1) * 255)
+            table[red] = plane
+        return cls(table, kind=kind)
+
+    @classmethod
+    def nearest_names(cls, size=33, space="rgb"):
+        """Cube of the index of the nearest XFree86 color
+
+        The names are in ``NamedColorIndex(space=space).names``
+        (see :mod:`colormap.nearest`). The cube is an index cube: it is
+        applied with the nearest interpolation.
+        """
+        from colormap.nearest import _get_index
+
+        index = _get_index(space)
+        return cls.from_function(
+            lambda rgb: index.query(rgb)[0].reshape(rgb.shape[:-1]), size=size, dtype=np.uint16, kind="index"
+        )
+
+    def save(self, filename):
+        """Save the table in the numpy format (.npy)"""
+        np.save(filename, self.table)
+
+    @classmethod
+    def load(cls, filename, mmap=True, kind="values"):
+        """Load a cube saved with :meth:`save`
+
+        :param bool mmap: memory-map the file (read-only) instead of reading it
+        :param str kind: "values" or "index" (the kind is not saved)
+        """
+        return cls(np.load(filename, mmap_mode="r" if mmap else None), kind=kind)
+
+    def _coordinates(self, pixels):
+        # lower corner and position in the cell of the pixels in the grid
+        size = self.size
+        if pixels.dtype == np.uint8:
+            # computed for the 256 values once
+            coords = np.arange(256) * ((size - 1) / 255)
+            lower = np.minimum(coords.astype(np.intp), size - 2)
+            return lower[pixels], (coords - lower).astype(np.float32)[pixels]
+        coords = np.clip(pixels, 0, 1) * (size - 1)
+        lower = np.minimum(coords.astype(np.intp), size - 2)
+        return lower, (coords - lower).astype(np.float32)
+
+    def _apply(self, pixels, interpolation):
+        # pixels is an (N, 3) array
+        size = self.size
+        flat = self.table.reshape(-1, self.table.shape[-1])
+        if size == 256 and pixels.dtype == np.uint8:
+            index = (pixels[:, 0].astype(np.intp) * size + pixels[:, 1]) * size + pixels[:, 2]
+            return np.take(flat, index, axis=0)
+        lower, frac = self._coordinates(pixels)
+        if interpolation == "nearest":
+            index = lower + (frac >= 0.5)
+            return np.take(flat, (index[:, 0] * size + index[:, 1]) * size + index[:, 2], axis=0)
+
+        # trilinear: weighted sum of the 8 corners of the cell of each pixel
+        base = (lower[:, 0] * size + lower[:, 1]) * size + lower[:, 2]
+        result = np.zeros((len(pixels), flat.shape[1]), dtype=np.float32 if flat.dtype.itemsize < 8 else float)
+        for dr in (0, 1):
+            wr = frac[:, 0] if dr else 1 - frac[:, 0]
+            for dg in (0, 1):
+                wg = wr * (frac[:, 1] if dg else 1 - frac[:, 1])
+                for db in (0, 1):
+                    weight = wg * (frac[:, 2] if db else 1 - frac[:, 2])
+                    result += weight[:, None] * np.take(flat, base + ((dr * size + dg) * size + db), axis=0)
+        if flat.dtype.kind in "ui":
+            result = np.rint(result).astype(flat.dtype)
+        return result
+
+    def apply(self, image, interpolation=None, chunksize=2**18):
+        """Transform the colors of an (..., 3) image
+
+        :param image: uint8 (0-255) or float (0-1) RGB values
+        :param str interpolation: "trilinear" or "nearest". Defaults to
+            trilinear, or nearest for an index cube (trilinear is then
+            rejected).
+        :param int chunksize: approximate number of pixels processed at once
+        :return: an (..., C) array with the dtype of the table (float32 for a
+            float32 table). The last dimension is dropped for a one channel
+            cube.
+        """
+        if interpolation is None:
+            interpolation = "nearest" if self.kind == "index" else "trilinear"
+        if interpolation not in ("trilinear", "nearest"):
+            raise ValueError(f"interpolation must be 'trilinear' or 'nearest'. You provided {interpolation}")
+        if interpolation == "trilinear" and self.kind == "index":
+            raise ValueError("the cube contains indices: use the nearest interpolation")
+        image = np.asarray(image)
+        if image.shape[-1] != 3:
+            raise ValueError("image must have a trailing dimension of length 3")
+        pixels = image.reshape(-1, 3)
+        channels = self.table.shape[-1]
+        out = np.empty((len(pixels), channels), dtype=self.table.dtype)
+        for chunk in _chunks(pixels.shape, chunksize * 3):
+            out[chunk] = self._apply(pixels[chunk], interpolation)
+        if channels == 1:
+            return out.reshape(image.shape[:-1])
+        return out.reshape(image.shape[:-1] + (channels,))
@@ -0,0 +1,151 @@
+# -*- python -*-
+#
+#  This file is part of colormap software
+#
+#  Copyright (c) 2011-2024
+#
+#  File author(s): Thomas Cokelaer <cokelaer@gmail.com>
+#
+#  Distributed under the terms of the 3-clause BSD license.
+#  The full license is in the LICENSE file, distributed with this software.
+#
+##############################################################################
+"""Discrete (binned) colormaps
+
+A :class:`DiscreteColormap` maps the values of an array onto N colors given
+N + 1 boundaries: values in [boundaries[i], boundaries[i + 1]) get the color
+i. It is meant for classified data (e.g. land cover rasters) with a few
+classes::
+
+    >>> import numpy as np
+    >>> from colormap.discrete import DiscreteColormap
+    >>> dcmap = DiscreteColormap(["blue", "#00FF00", "red"], [0, 10, 20, 50])
+    >>> dcmap.digitize([-1, 5, 10, 49, 50, np.nan]).tolist()
+    [3, 0, 1, 2, 4, 5]
+    >>> rgba = dcmap(np.random.rand(1000, 1000) * 50, bytes=True)  # doctest: +SKIP
+
+The indices returned by :meth:`~DiscreteColormap.digitize` are the rows of
+:attr:`~DiscreteColormap.lut`, laid out as in matplotlib: the N colors, then
+the colors of values under the first boundary, over the last boundary and
+of invalid values (NaN). Calling the colormap classifies and colorizes the
+data at once, with a single lookup per value.
+
+The equivalent matplotlib objects (a ListedColormap and a BoundaryNorm)
+are available as :attr:`~DiscreteColormap.cmap` and
+:attr:`~DiscreteColormap.norm`, e.g. for a colorbar.
+"""
+import numpy as np
+
+from colormap.colorize import _chunks
+from colormap.lut import _anchors_rgb
+
+__all__ = ["DiscreteColormap"]
+
+
+def _rgba(color):
+    # RGBA tuple of a color in any format accepted by Color (or an RGBA tuple)
+    if isinstance(color, (tuple, list)) and len(color) == 4:
+        return tuple(float(x) for x in color)
+    return tuple(_anchors_rgb([color])[0].tolist()) + (1.0,)
+
+
+class DiscreteColormap:
+    """N colors mapped onto the N bins defined by N + 1 boundaries
+
+    :param list colors: N colors in any format accepted by
+        :class:`~colormap.colors.Color`
+    :param boundaries: N + 1 increasing values
+    :param under: color of the values below the first boundary. Defaults to
+        the first color.
+    :param over: color of the values above (or equal to) the last boundary.
+        Defaults to the last color.
+    :param bad: color of NaN values. Defaults to transparent black.
+    :param str name: name of the matplotlib colormap
+    """
+
+    def __init__(self, colors, boundaries, under=None, over=None, bad=(0, 0, 0, 0), name="discrete"):
+        boundaries = np.asarray(boundaries, dtype=float)
+        rgba = np.ones((len(colors), 4))
+        rgba[:, :3] = _anchors_rgb(colors)
+        if len(rgba) == 0:
+            raise ValueError("at least one color is required")
+        if boundaries.shape != (len(rgba) + 1,):
+            raise ValueError(f"{len(rgba) + 1} boundaries are required for {len(rgba)} colors")
+        if not (np.diff(boundaries) > 0).all():
+            raise ValueError("boundaries must be increasing")
+
+        self.name = name
+        self.boundaries = boundaries
+        self.colors = rgba
+        self.under = rgba[0] if under is None else np.array(_rgba(under))
+        self.over = rgba[-1] if over is None else np.array(_rgba(over))
+        self.bad = np.array(_rgba(bad))
+        N = len(rgba)
+
+        # rows in the order of np.searchsorted positions: under, the N colors,
+        # over and bad. NaN is appended to the boundaries so that NaN values
+        # (sorted last by numpy) fall in their own bin.
+        self._edges = np.append(boundaries, np.nan)
+        self._table = np.vstack([self.under, rgba, self.over, self.bad])
+        self._table8 = (self._table * 255).astype(np.uint8)
+        self._rows = np.array([N] + list(range(N)) + [N + 1, N + 2])
+
+    def _get_N(self):
+        return len(self.colors)
+
+    N = property(_get_N, doc="number of colors (bins)")
+
+    def _get_lut(self):
+        return np.vstack([self.colors, self.under, self.over, self.bad])
+
+    lut = property(_get_lut, doc="(N + 3, 4) RGBA table: the N colors, under, over and bad colors")
+
+    def _get_cmap(self):
+        from matplotlib.colors import ListedColormap
+
+        cmap = ListedColormap(self.colors, name=self.name)
+        return cmap.with_extremes(under=self.under, over=self.over, bad=self.bad)
+
+    cmap = property(_get_cmap, doc="the equivalent matplotlib ListedColormap")
+
+    def _get_norm(self):
+        from matplotlib.colors import BoundaryNorm
+
+        return BoundaryNorm(self.boundaries, self.N)
+
+    norm = property(_get_norm, doc="the matplotlib BoundaryNorm matching the boundaries")
+
+    def __repr__(self):
+        return f"DiscreteColormap(N={self.N}, boundaries={self.boundaries.tolist()})"
+
+    def _positions(self, data):
+        return np.searchsorted(self._edges, data, side="right")
+
+    def digitize(self, data):
+        """Return the row of :attr:`lut` of each value
+
+        0 to N-1 for the bins, N for values under the first boundary, N + 1
+        for values over the last one and N + 2 for NaN.
+        """
+        return self._rows[self._positions(np.asarray(data))]
+
+    def __call__(self, data, bytes=False, out=None, chunksize=2**20):
+        """Return the RGBA colors of the values of an array
+
+        :param data: an array of any shape (may be memory-mapped)
+        :param bool bytes: return uint8 values (0-255) instead of floats
+        :param out: optional output array of shape data.shape + (4,)
+        :param int chunksize: approximate number of values processed at once
+        """
+        data = np.asarray(data)
+        table = self._table8 if bytes else self._table
+        if out is None:
+            out = np.empty(data.shape + (4,), dtype=table.dtype)
+        elif out.shape != data.shape + (4,):
+            raise ValueError(f"out must have shape {data.shape + (4,)}. You provided {out.shape}")
+        if data.ndim == 0:
+            out[...] = table[self._positions(data)]
+            return out
+        for chunk in _chunks(data.shape, chunksize):
+            np.take(table, self._positions(data[chunk]), axis=0, out=out[chunk])
+        return out
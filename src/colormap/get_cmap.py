@@ -10,12 +10,12 @@
 #  The full license is in the LICENSE file, distributed with this software.
 #
 ##############################################################################
-from colormap import Colormap
+from colormap import Colormap, colormap_registry
 
 __all__ = ["cmap_builder"]
 
 
-def cmap_builder(name, name2=None, name3=None):
+def cmap_builder(name, name2=None, name3=None, reverse=False, N=256):
     """return a colormap object compatible with matplotlib
 
     If only parameter **name** is provided, it should be a known matplotlib
@@ -27,9 +27,14 @@ def cmap_builder(name, name2=None, name3=None):
 
     Matplotlib colormap map names
 
-    """
-    c = Colormap()
+    :param bool reverse: reverse the colormap
+    :param int N: number of colors of the colormaps built from colors (ignored
+        for matplotlib colormaps).
 
+    The colormaps are built by :class:`~colormap.colors.Colormap`, which
+    keeps them in :data:`colormap.cache.cmap_cache`. Each call returns a
+    copy that can be modified without affecting the other callers.
+    """
     # if the colormap is already a colormap, nothing to do
     try:  # pragma: no cover
         name.get_bad()
@@ -37,24 +42,24 @@ def cmap_builder(name, name2=None, name3=None):
     except AttributeError:
         pass
 
+    c = Colormap()
+
     # an R colormap
     if name and name2 and name3:
-        return c.cmap_linear(name, name2, name3)
+        return c.cmap_linear(name, name2, name3, reverse=reverse, N=N)
     elif name and name2:
-        return c.cmap_bicolor(name, name2)
-    elif name == "heat":
-        return c.get_cmap_heat()
-    elif name == "heat_r":
-        return c.get_cmap_heat_r()
+        return c.cmap_bicolor(name, name2, reverse=reverse, N=N)
+    elif name in ("heat", "heat_r"):
+        return c.cmap(name, reverse=reverse)
     # matplotlic colormaps
-    elif name in c.colormaps:
-        return c.cmap(name)
+    elif name in colormap_registry:
+        return c.cmap(name, reverse=reverse)
     # some custom diverging colormaps with black in the middle.
     elif name in c.diverging_black:
-        return c.cmap(name)
+        return c.cmap(name, reverse=reverse, N=N)
     elif name.count("_") == 2:  # pragma: no cover
         name1, name2, name3 = name.split("_")
-        return c.cmap_linear(name1, name2, name3)
+        return c.cmap_linear(name1, name2, name3, reverse=reverse, N=N)
     else:
         # valid = c.colormaps + c.diverging_black
         txt = "name provided {0} is not recognised. ".format(name)
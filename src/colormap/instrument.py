@@ -0,0 +1,229 @@
+# -*- python -*-
+#
+#  This file is part of colormap software
+#
+#  Copyright (c) 2011-2024
+#
+#  File author(s): Thomas Cokelaer <cokelaer@gmail.com>
+#
+#  Distributed under the terms of the 3-clause BSD license.
+#  The full license is in the LICENSE file, distributed with this software.
+#
+##############################################################################
+"""Opt-in instrumentation of the colormap hot paths
+
+Once the instrumentation is enabled, the number of calls and the cumulative
+time spent in :meth:`~colormap.colors.Colormap.cmap`,
+:func:`~colormap.get_cmap.cmap_builder`, :class:`~colormap.colors.Color`
+creation, the hexadecimal parsers and the lookups in the matplotlib registry
+are recorded::
+
+    >>> from colormap import instrument
+    >>> instrument.enable()
+    >>> cmap = cmap_builder("red", "white", "blue")  # doctest: +SKIP
+    >>> instrument.snapshot()["calls"]["cmap_builder"]  # doctest: +SKIP
+    {'count': 1, 'total': 0.0003, 'mean': 0.0003}
+    >>> instrument.disable()
+
+:func:`snapshot` also returns the statistics of the caches (see
+:mod:`colormap.cache`) including their hit rates. To export the timings to
+another metrics system, provide a callback. It is called after each
+instrumented call with the name of the call and its duration in seconds::
+
+    >>> instrument.enable(callback=lambda name, seconds: print(name))  # doctest: +SKIP
+
+The instrumented functions are replaced by timed versions in the colormap
+modules when the instrumentation is enabled, and restored when it is
+disabled (including in the colormap modules imported in between), so that
+there is no cost at all by default. References to the functions taken
+outside of the colormap modules before :func:`enable` (e.g. ``from
+colormap.colors import hex2rgb``) are not instrumented, and those taken
+while it is enabled do not record anything once it is disabled; methods
+are always instrumented.
+
+Times are inclusive: e.g. the time spent creating
+:class:`~colormap.colors.Color` objects while building a colormap is counted
+in both.
+"""
+import functools
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from importlib import import_module
+
+__all__ = ["targets", "enable", "disable", "is_enabled", "recording", "reset", "snapshot"]
+
+
+#: instrumented functions and methods: name -> module
+targets = {
+    "Colormap.cmap": "colormap.colors",
+    "cmap_builder": "colormap.get_cmap",
+    "Color.__init__": "colormap.colors",
+    "HEX.get_standard_hex_color": "colormap.colors",
+    "parse_hex_color": "colormap.colors",
+    "hex2rgb": "colormap.colors",
+    "hex2rgb_array": "colormap.colors",
+    "ColormapRegistry.__contains__": "colormap.colors",
+}
+
+_lock = threading.Lock()
+_enabled = False
+_callback = None
+# (owner, attribute, original) of the replaced methods
+_patched = []
+# id of the timed functions -> (timed function, original)
+_wrappers = {}
+# name -> [count, cumulative time]
+_stats = {}
+
+
+def _record(name, seconds):
+    with _lock:
+        stats = _stats.get(name)
+        if stats is None:
+            _stats[name] = [1, seconds]
+        else:
+            stats[0] += 1
+            stats[1] += seconds
+    callback = _callback
+    if callback is not None:
+        callback(name, seconds)
+
+
+def _timed(name, func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            # references to the timed function may outlive the instrumentation
+            if _enabled:
+                _record(name, time.perf_counter() - start)
+
+    return wrapper
+
+
+def _modules():
+    return [m for key, m in list(sys.modules.items()) if key == "colormap" or key.startswith("colormap.")]
+
+
+def _swap(replacements):
+    # replace the functions imported in the colormap modules (found by
+    # identity). replacements maps id(function) -> (function, replacement)
+    for module in _modules():
+        namespace = vars(module)
+        for attr, value in list(namespace.items()):
+            replacement = replacements.get(id(value))
+            if replacement is not None and replacement[0] is value:
+                namespace[attr] = replacement[1]
+
+
+def enable(callback=None):
+    """Start recording the calls of the instrumented functions
+
+    :param callback: optional function called after each instrumented call
+        with the name of the call and its duration in seconds. It must be
+        fast and thread-safe.
+    """
+    global _callback, _enabled
+    with _lock:
+        _callback = callback
+        if _enabled:
+            return
+        replacements = {}
+        for name, module in targets.items():
+            *path, attr = name.split(".")
+            owner = import_module(module)
+            for step in path:
+                owner = getattr(owner, step)
+            original = owner.__dict__[attr]
+            timed = _timed(name, original)
+            if path:
+                # methods: the class is the only owner
+                _patched.append((owner, attr, original))
+                setattr(owner, attr, timed)
+            else:
+                replacements[id(original)] = (original, timed)
+                _wrappers[id(timed)] = (timed, original)
+        _swap(replacements)
+        _enabled = True
+
+
+def disable():
+    """Stop recording. The statistics are kept (see :func:`reset`)"""
+    global _callback, _enabled
+    with _lock:
+        _callback = None
+        _enabled = False
+        while _patched:
+            owner, attr, original = _patched.pop()
+            setattr(owner, attr, original)
+        # modules imported while enabled hold the timed functions as well
+        _swap(_wrappers)
+        _wrappers.clear()
+
+
+def is_enabled():
+    """Return True if the instrumentation is enabled"""
+    return _enabled
+
+
+@contextmanager
+def recording(callback=None):
+    """Enable the instrumentation in a with block
+
+    ::
+
+        >>> with recording():  # doctest: +SKIP
+        ...     c = Color("red")
+        >>> snapshot()["calls"]["Color.__init__"]["count"]  # doctest: +SKIP
+        1
+
+    The instrumentation is disabled at the end of the block unless it was
+    already enabled (the previous callback is then restored).
+    """
+    previous = _callback if is_enabled() else False
+    enable(callback)
+    try:
+        yield
+    finally:
+        if previous is False:
+            disable()
+        else:
+            enable(previous)
+
+
+def reset():
+    """Clear the recorded statistics (not the cache statistics)"""
+    with _lock:
+        _stats.clear()
+
+
+def _cache_stats(cache):
+    info = cache.info()._asdict()
+    lookups = info["hits"] + info["misses"]
+    info["hit_rate"] = info["hits"] / lookups if lookups else None
+    return info
+
+
+def snapshot():
+    """Return the recorded statistics as a dictionary
+
+    ``snapshot()["calls"]`` maps the name of each instrumented call to its
+    number of calls (count), cumulative time (total) and mean time in
+    seconds. ``snapshot()["caches"]`` contains the statistics of
+    :data:`~colormap.cache.cmap_cache` and :data:`~colormap.cache.disk_cache`
+    (hits, misses, hit_rate...), which are recorded even if the
+    instrumentation is disabled.
+    """
+    from colormap.cache import cmap_cache, disk_cache
+
+    with _lock:
+        calls = {name: {"count": count, "total": total, "mean": total / count} for name, (count, total) in _stats.items()}
+    return {
+        "enabled": is_enabled(),
+        "calls": calls,
+        "caches": {"cmap_cache": _cache_stats(cmap_cache), "disk_cache": _cache_stats(disk_cache)},
+    }
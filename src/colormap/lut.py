@@ -0,0 +1,252 @@
+# -*- python -*-
+#
+#  This file is part of colormap software
+#
+#  Copyright (c) 2011-2024
+#
+#  File author(s): Thomas Cokelaer <cokelaer@gmail.com>
+#
+#  Distributed under the terms of the 3-clause BSD license.
+#  The full license is in the LICENSE file, distributed with this software.
+#
+##############################################################################
+"""Lookup tables (LUT) of colormaps
+
+A matplotlib colormap is a lookup table of N RGBA colors computed lazily on
+first use. When only the table is needed (e.g. to colorize arrays), it can be
+built directly with :func:`lut_builder`::
+
+    >>> from colormap.lut import lut_builder, listed_cmap
+    >>> lut = lut_builder(["red", "white", "blue"], N=5)
+    >>> lut.shape
+    (5, 4)
+    >>> cmap = listed_cmap(lut)   # a matplotlib ListedColormap
+
+Colors are interpolated linearly in RGB by default. Interpolating in a
+perceptual color space (*interp_space* set to "lab", "oklab" or "lch") avoids
+the dull midpoints of RGB interpolation (e.g. between red and green)::
+
+    >>> lut = lut_builder(["red", "green", "blue"], N=256, interp_space="oklab")
+
+"""
+import numpy as np
+
+from colormap.cache import cmap_cache, disk_cache
+from colormap.colors import (
+    Color,
+    colormap_registry,
+    lab2rgb_array,
+    lch2rgb_array,
+    oklab2rgb_array,
+    rgb2lab_array,
+    rgb2lch_array,
+    rgb2oklab_array,
+)
+from colormap.xfree86 import XFree86_index
+
+__all__ = ["lut_builder", "listed_cmap"]
+
+
+def _anchors_rgb(colors):
+    # RGB values (normalised) of a sequence of colors in any format accepted
+    # by Color. Names are looked up in the XFree86 index directly.
+    rgb = []
+    for color in colors:
+        if isinstance(color, str) and color in XFree86_index.aliases:
+            hexa = XFree86_index.names[XFree86_index.aliases[color]]
+            rgb.append([int(hexa[i : i + 2], 16) / 255 for i in (1, 3, 5)])
+        elif isinstance(color, Color):
+            rgb.append(color.rgb)
+        else:
+            rgb.append(Color(color).rgb)
+    return np.array(rgb, dtype=float)
+
+
+def _interpolate(values, N):
+    # linear interpolation of evenly spaced values on N evenly spaced points.
+    # The arithmetic is the one of matplotlib LinearSegmentedColormap so that
+    # the tables are identical (to the last bit).
+    y = np.asarray(values, dtype=float)
+    if len(y) == 1 or N == 1:
+        return np.full(N, y[-1])
+    x = np.linspace(0, 1, len(y)) * (N - 1)
+    xind = (N - 1) * np.linspace(0, 1, N)
+    ind = np.searchsorted(x, xind)[1:-1]
+    distance = (xind[1:-1] - x[ind - 1]) / (x[ind] - x[ind - 1])
+    return np.concatenate([y[:1], distance * (y[ind] - y[ind - 1]) + y[ind - 1], y[-1:]])
+
+
+# conversions from and to RGB of the interpolation spaces
+_spaces = {
+    "rgb": None,
+    "lab": (rgb2lab_array, lab2rgb_array),
+    "oklab": (rgb2oklab_array, oklab2rgb_array),
+    "lch": (rgb2lch_array, lch2rgb_array),
+}
+
+
+def _check_space(interp_space):
+    if interp_space not in _spaces:
+        raise ValueError(f"interp_space must be one of {list(_spaces)}. You provided {interp_space}")
+
+
+def _lch_hues(lch):
+    # the hue of greys is undefined: use the one of the closest colored anchor.
+    # Hues are then unwrapped so that interpolation follows the shortest arc.
+    chromatic = np.flatnonzero(lch[:, 1] > 1e-6)
+    if len(chromatic):
+        closest = chromatic[np.abs(np.arange(len(lch))[:, None] - chromatic).argmin(axis=1)]
+        lch[:, 2] = lch[closest, 2]
+    lch[:, 2] = np.degrees(np.unwrap(np.radians(lch[:, 2])))
+    return lch
+
+
+def _interpolate_rgb(rgb, N, interp_space):
+    # (N, 3) table of the anchors interpolated in the given color space
+    _check_space(interp_space)
+    if interp_space == "rgb":
+        return np.stack([_interpolate(rgb[:, i], N) for i in range(3)], axis=1)
+    to_space, to_rgb = _spaces[interp_space]
+    values = to_space(rgb)
+    if interp_space == "lch":
+        values = _lch_hues(values)
+    table = np.stack([_interpolate(values[:, i], N) for i in range(3)], axis=1)
+    if interp_space == "lch":
+        table[:, 2] %= 360
+    return to_rgb(table, out=table)
+
+
+def _lut_from_channels(channels, N, interp_space="rgb"):
+    lut = np.ones((N, 4))
+    if interp_space == "rgb":
+        for i, name in enumerate(("red", "green", "blue", "alpha")):
+            if name in channels:
+                lut[:, i] = _interpolate(channels[name], N)
+        return np.clip(lut, 0, 1, out=lut)
+
+    try:
+        rgb = np.array([channels[name] for name in ("red", "green", "blue")], dtype=float).T
+    except (KeyError, ValueError):
+        raise ValueError("red, green and blue channels of the same length are required with interp_space")
+    lut[:, :3] = _interpolate_rgb(np.clip(rgb, 0, 1), N, interp_space)
+    if "alpha" in channels:
+        lut[:, 3] = np.clip(_interpolate(channels["alpha"], N), 0, 1)
+    return lut
+
+
+def _lut_from_colors(colors, N, interp_space="rgb"):
+    rgb = _anchors_rgb(colors)
+    if len(rgb) < 2:
+        raise ValueError("at least 2 colors are required")
+    lut = np.ones((N, 4))
+    lut[:, :3] = _interpolate_rgb(rgb, N, interp_space)
+    return np.clip(lut, 0, 1, out=lut)
+
+
+def _lut_from_cmap(cmap, N):
+    # any colormap known by cmap_builder or a matplotlib colormap
+    from colormap.get_cmap import cmap_builder
+
+    cmap = cmap_builder(cmap)
+    return np.asarray(cmap(np.linspace(0, 1, N)), dtype=float)
+
+
+def _lut_key(colors, N, dtype, interp_space):
+    # hashable key of a table specification or None (not cached)
+    if isinstance(colors, dict):
+        try:
+            spec = tuple(sorted((name, tuple(values)) for name, values in colors.items()))
+            hash(spec)
+        except TypeError:
+            return None
+    elif isinstance(colors, (list, tuple)):
+        spec = tuple(map(tuple, _anchors_rgb(colors).tolist()))
+    elif isinstance(colors, str):
+        # see _cmap_key: the matplotlib colormaps are looked up each time
+        if colors in colormap_registry:
+            return None
+        spec = colors
+    else:
+        return None
+    return ("lut", spec, N, dtype.str, interp_space)
+
+
+def _build_lut(colors, N, dtype, interp_space):
+    if isinstance(colors, dict):
+        lut = _lut_from_channels(colors, N, interp_space)
+    elif isinstance(colors, (list, tuple)):
+        lut = _lut_from_colors(colors, N, interp_space)
+    elif interp_space != "rgb":
+        raise ValueError("interp_space can only be used with a dictionary or a list of colors")
+    else:
+        lut = _lut_from_cmap(colors, N)
+
+    if dtype == np.uint8:
+        lut = (lut * 255).astype(np.uint8)
+    else:
+        lut = lut.astype(dtype)
+    lut.flags.writeable = False
+    return lut
+
+
+def lut_builder(colors, N=256, reverse=False, dtype="float32", interp_space="rgb"):
+    """Return the (N, 4) RGBA lookup table of a colormap
+
+    :param colors: either a dictionary with the red, green, blue (and
+        optionally alpha) channels as in :meth:`colormap.colors.Colormap.cmap`,
+        a list of colors in any format accepted by :class:`~colormap.colors.Color`
+        (evenly spaced), or a colormap name accepted by
+        :func:`~colormap.get_cmap.cmap_builder` (or a matplotlib colormap).
+    :param int N: number of colors in the table
+    :param bool reverse: reverse the table
+    :param dtype: float32 (values in the range 0-1), float64 or uint8 (values in
+        the range 0-255). Floats are converted to uint8 as in matplotlib
+        (i.e. truncated after multiplication by 255).
+    :param str interp_space: color space where the colors of a dictionary or
+        of a list are interpolated: "rgb", "lab", "oklab" or "lch"
+        (hues follow the shortest arc).
+
+    For the dictionary and the list of colors, the table is computed with a
+    vectorised linear interpolation. In RGB, it gives the same values as a
+    matplotlib LinearSegmentedColormap (without creating it). In the other
+    spaces, the anchors are converted to that space, interpolated and the
+    table is converted back to RGB at once (clipped to the sRGB gamut).
+
+    The tables are kept in :data:`colormap.cache.cmap_cache`, except those of
+    the colormaps of the matplotlib registry, and are read-only (use
+    copy() to modify them). A reversed table is a reversed
+    view of the table in the original order: both share the same memory and
+    the input colors are never modified. The tables of the dictionaries and
+    of the lists of colors are also stored on disk if
+    :data:`colormap.cache.disk_cache` is enabled.
+    """
+    _check_space(interp_space)
+    dtype = np.dtype(dtype)
+    if dtype != np.uint8 and dtype.kind != "f":
+        raise TypeError(f"dtype must be a float type or uint8. You provided {dtype}")
+
+    key = _lut_key(colors, N, dtype, interp_space)
+    if key is None:
+        lut = _build_lut(colors, N, dtype, interp_space)
+    elif isinstance(colors, str):
+        # named colormaps are built by matplotlib, whose version is not part
+        # of the key of the disk cache: they are cached in memory only
+        lut = cmap_cache.get_or_build(key, lambda: _build_lut(colors, N, dtype, interp_space))
+    else:
+        lut = cmap_cache.get_or_build(
+            key, lambda: disk_cache.get_or_build(key, lambda: _build_lut(colors, N, dtype, interp_space))
+        )
+    return lut[::-1] if reverse else lut
+
+
+def listed_cmap(lut, name="colormap_lut"):
+    """Wrap a lookup table built by :func:`lut_builder` into a ListedColormap
+
+    The table is used as is (uint8 tables are converted to floats).
+    """
+    from matplotlib.colors import ListedColormap
+
+    lut = np.asarray(lut)
+    if lut.dtype == np.uint8:
+        lut = lut / 255
+    return ListedColormap(lut, name=name)
@@ -0,0 +1,117 @@
+# -*- python -*-
+#
+#  This file is part of colormap software
+#
+#  Copyright (c) 2011-2024
+#
+#  File author(s): Thomas Cokelaer <cokelaer@gmail.com>
+#
+#  Distributed under the terms of the 3-clause BSD license.
+#  The full license is in the LICENSE file, distributed with this software.
+#
+##############################################################################
+"""Nearest named color of arbitrary colors
+
+::
+
+    >>> from colormap.nearest import nearest_name
+    >>> nearest_name((1, 0.1, 0))
+    ('Red', 0.1)
+    >>> names, distances = nearest_name([[255, 0, 10], [250, 250, 250]], normalised=False)
+    >>> names.tolist()
+    ['Red', 'Snow']
+
+"""
+import numpy as np
+
+from colormap.colors import hex2rgb_array, rgb2lab_array
+from colormap.xfree86 import XFree86_index
+
+__all__ = ["NamedColorIndex", "nearest_name"]
+
+
+class NamedColorIndex:
+    """Spatial index of named colors
+
+    The index is a KD-tree (scipy.spatial.cKDTree) if scipy is installed, so
+    that queries are sublinear in the number of colors. Otherwise, queries are
+    vectorised over the table (by chunks of points).
+
+    :param dict colors: hexadecimal values as keys and names as values.
+        Defaults to the XFree86 colors (one name per hexadecimal value, the
+        one used by :class:`~colormap.colors.Color`).
+    :param str space: "rgb" or "lab". In "lab", distances are Delta E (CIE76).
+    """
+
+    def __init__(self, colors=None, space="rgb"):
+        if space not in ("rgb", "lab"):
+            raise ValueError(f"space must be 'rgb' or 'lab'. You provided {space}")
+        if colors is None:
+            colors = XFree86_index.hexes
+        self.space = space
+        self.names = np.array(list(colors.values()))
+        self.points = self._transform(hex2rgb_array(list(colors.keys()), normalise=True))
+        try:
+            from scipy.spatial import cKDTree
+        except ImportError:  # pragma: no cover
+            self._tree = None
+        else:
+            self._tree = cKDTree(self.points)
+
+    def _transform(self, rgb):
+        return rgb2lab_array(rgb) if self.space == "lab" else rgb
+
+    def query(self, rgb, chunksize=4096):
+        """Return the indices of the nearest colors and the distances
+
+        :param rgb: (N, 3) array of normalised RGB values
+        """
+        points = self._transform(np.asarray(rgb, dtype=float).reshape(-1, 3))
+        if self._tree is not None:
+            distances, indices = self._tree.query(points)
+            return indices, distances
+
+        indices = np.empty(len(points), dtype=np.intp)
+        distances = np.empty(len(points))
+        for start in range(0, len(points), chunksize):
+            chunk = points[start : start + chunksize]
+            squared = ((chunk[:, None, :] - self.points[None, :, :]) ** 2).sum(axis=-1)
+            indices[start : start + chunksize] = squared.argmin(axis=1)
+            distances[start : start + chunksize] = np.sqrt(squared.min(axis=1))
+        return indices, distances
+
+
+_indexes = {}
+
+
+def _get_index(space):
+    # indexes of the XFree86 colors are built once per space
+    if space not in _indexes:
+        _indexes[space] = NamedColorIndex(space=space)
+    return _indexes[space]
+
+
+def nearest_name(rgb, space="rgb", normalised=True):
+    """Return the XFree86 name of the nearest color(s) and the distance(s)
+
+    :param rgb: an RGB triplet or an array of triplets of shape (..., 3)
+    :param str space: "rgb" (euclidean distance between normalised RGB values)
+        or "lab" (Delta E CIE76, closer to the perceived difference)
+    :param bool normalised: if *normalised* is True, the RGB values should be
+        in the range 0-1 (0-255 otherwise)
+    :return: a name and a distance for a single triplet, or an array of names
+        and an array of distances with the shape of the input (without its
+        last dimension)
+    """
+    rgb = np.asarray(rgb, dtype=float)
+    if rgb.ndim == 0 or rgb.shape[-1] != 3:
+        raise ValueError("input must have a trailing dimension of length 3")
+    if normalised is False:
+        rgb = rgb / 255
+    index = _get_index(space)
+    indices, distances = index.query(rgb)
+    names = index.names[indices].reshape(rgb.shape[:-1])
+    distances = distances.reshape(rgb.shape[:-1])
+    if rgb.ndim == 1:
+        return str(names), float(distances)
+    return names, distances
@@ -0,0 +1,240 @@
+# -*- python -*-
+#
+#  This file is part of colormap software
+#
+#  Copyright (c) 2011-2024
+#
+#  File author(s): Thomas Cokelaer <cokelaer@gmail.com>
+#
+#  Distributed under the terms of the 3-clause BSD license.
+#  The full license is in the LICENSE file, distributed with this software.
+#
+##############################################################################
+"""Quantization of images onto a palette of colors
+
+Every pixel of an (H, W, 3) image is replaced by the nearest color of a
+palette. The palette can be a qualitative matplotlib colormap (see
+:attr:`colormap.colors.Colormap.qualitative`), a list of colors, the XFree86
+table or a palette extracted from an image::
+
+    >>> from colormap.quantize import Quantizer, extract_palette, quantize
+    >>> image = np.random.randint(0, 256, (1080, 1920, 3), dtype="uint8")  # doctest: +SKIP
+    >>> quantize(image, "Set1")  # doctest: +SKIP
+    >>> quantize(image, extract_palette(image, 16, method="kmeans"))  # doctest: +SKIP
+
+To recolor many frames with the same palette, create a :class:`Quantizer`
+once. With *cube_bits*, the nearest color of each cell of a 2^bits per
+channel RGB cube is precomputed, so that quantizing a pixel is a single
+lookup (approximate: pixels of a cell share the color of its center).
+"""
+import numpy as np
+
+from colormap.colorize import _chunks
+
+__all__ = ["Quantizer", "quantize", "extract_palette", "get_palette"]
+
+
+def get_palette(palette):
+    """Return a palette as an (N, 3) array of normalised RGB values
+
+    :param palette: "xfree86" (all XFree86 colors), the name of a matplotlib
+        ListedColormap (e.g. one of the qualitative colormaps such as Set1),
+        a list of colors in any format accepted by
+        :class:`~colormap.colors.Color` or an (N, 3) array (floats in the
+        range 0-1 or uint8).
+    """
+    if isinstance(palette, str):
+        if palette.lower() == "xfree86":
+            from colormap.colors import hex2rgb_array
+            from colormap.xfree86 import XFree86_index
+
+            return hex2rgb_array(list(XFree86_index.hexes), normalise=True)
+
+        from colormap.get_cmap import cmap_builder
+
+        cmap = cmap_builder(palette)
+        if not hasattr(cmap, "colors"):
+            raise ValueError(f"{palette} is not a ListedColormap. Use e.g. a qualitative colormap")
+        return np.asarray(cmap.colors, dtype=float)[:, :3]
+
+    if isinstance(palette, np.ndarray) and palette.dtype != object:
+        _check_dtype(palette)
+        if palette.dtype == np.uint8:
+            palette = palette / 255
+        return np.asarray(palette, dtype=float).reshape(-1, 3)
+
+    from colormap.colorarray import ColorArray
+
+    return ColorArray(palette).rgb
+
+
+def _nearest(points, palette, chunksize=2**18):
+    # index of the nearest palette color of each point. |p - c|^2 is
+    # expanded so that the distances are computed with a matrix product.
+    # Points are processed by blocks of about chunksize distances so that
+    # the memory is bounded whatever the size of the palette.
+    scaled = -2 * palette.T
+    norms = (palette**2).sum(axis=1)
+    out = np.empty(len(points), dtype=np.intp)
+    for block in _chunks((len(points),), max(1, chunksize // len(palette))):
+        squared = points[block] @ scaled
+        squared += norms
+        out[block] = squared.argmin(axis=1)
+    return out
+
+
+def _check_dtype(image):
+    # integers other than uint8 have no implicit range (e.g. 12-bit images
+    # stored as uint16)
+    if image.dtype.kind in "biu" and image.dtype != np.uint8:
+        raise TypeError(f"images must be uint8 (0-255) or float (0-1). You provided {image.dtype}")
+    return image
+
+
+def _as_float(image):
+    return image / 255 if image.dtype == np.uint8 else np.asarray(image, dtype=float)
+
+
+class Quantizer:
+    """Map the pixels of images onto the nearest color of a palette
+
+    :param palette: any palette accepted by :func:`get_palette`
+    :param int cube_bits: if set (e.g. 5 or 6 for a 32^3 or 64^3 cube),
+        precompute the palette index of each cell of an RGB cube. Images are
+        then quantized with a single lookup per pixel.
+    :param int chunksize: approximate number of pixels processed at once. The
+        distances to the palette colors are computed by blocks of about
+        chunksize values (i.e. chunksize / len(palette) pixels).
+    """
+
+    def __init__(self, palette, cube_bits=None, chunksize=2**18):
+        self.palette = get_palette(palette)
+        if len(self.palette) == 0:
+            raise ValueError("palette is empty")
+        self.chunksize = chunksize
+        self.cube = None
+        self.cube_bits = cube_bits
+        if cube_bits is not None:
+            if not 1 <= cube_bits <= 8:
+                raise ValueError("cube_bits must be between 1 and 8")
+            size = 2**cube_bits
+            centers = (np.arange(size) + 0.5) * (256 / size) / 255
+            grid = np.stack(np.meshgrid(centers, centers, centers, indexing="ij"), axis=-1).reshape(-1, 3)
+            dtype = np.uint8 if len(self.palette) <= 256 else np.intp
+            cube = _nearest(grid, self.palette, chunksize)
+            self.cube = cube.astype(dtype).reshape(size, size, size)
+
+    def _indices(self, pixels):
+        # pixels is an (..., 3) chunk of the image
+        if self.cube is not None:
+            if pixels.dtype != np.uint8:
+                pixels = (np.clip(pixels, 0, 1) * 255 + 0.5).astype(np.uint8)
+            shifted = pixels >> (8 - self.cube_bits)
+            return self.cube[shifted[..., 0], shifted[..., 1], shifted[..., 2]]
+        shape = pixels.shape[:-1]
+        return _nearest(_as_float(pixels).reshape(-1, 3), self.palette, self.chunksize).reshape(shape)
+
+    def indices(self, image):
+        """Return the palette index of each pixel of an (..., 3) image
+
+        The image can be uint8 (0-255) or float (0-1); other integer types
+        raise a TypeError (scale them to one of those first).
+        """
+        image = _check_dtype(np.asarray(image))
+        if image.shape[-1] != 3:
+            raise ValueError("image must have a trailing dimension of length 3")
+        if image.ndim == 1:
+            return self._indices(image)
+        out = np.empty(image.shape[:-1], dtype=np.intp if self.cube is None else self.cube.dtype)
+        for chunk in _chunks(image.shape[:-1], self.chunksize):
+            out[chunk] = self._indices(image[chunk])
+        return out
+
+    def quantize(self, image):
+        """Return the image with each pixel replaced by its nearest palette color
+
+        The output has the dtype of the input (uint8 or float).
+        """
+        image = np.asarray(image)
+        palette = self.palette
+        if image.dtype == np.uint8:
+            palette = np.round(palette * 255).astype(np.uint8)
+        return palette[self.indices(image)]
+
+
+def quantize(image, palette, cube_bits=None, chunksize=2**18):
+    """Replace each pixel of an (..., 3) image by the nearest color of a palette
+
+    See :class:`Quantizer` and :func:`get_palette` for the parameters.
+    """
+    return Quantizer(palette, cube_bits=cube_bits, chunksize=chunksize).quantize(image)
+
+
+def _median_cut(pixels, n):
+    # split the box with the largest range at the median of its widest channel
+    boxes = [pixels]
+    while len(boxes) < n:
+        ranges = [np.ptp(box, axis=0).max() if len(box) > 1 else -1 for box in boxes]
+        i = int(np.argmax(ranges))
+        if ranges[i] <= 0:
+            break
+        box = boxes.pop(i)
+        channel = np.ptp(box, axis=0).argmax()
+        half = len(box) // 2
+        box = box[np.argpartition(box[:, channel], half)]
+        boxes += [box[:half], box[half:]]
+    return np.array([box.mean(axis=0) for box in boxes])
+
+
+def _kmeans_init(pixels, n, rng):
+    # k-means++: each new center is drawn with a probability proportional to
+    # the squared distance to the nearest center already chosen
+    centers = [pixels[rng.integers(len(pixels))]]
+    distances = ((pixels - centers[0]) ** 2).sum(axis=1)
+    while len(centers) < n:
+        total = distances.sum()
+        if total <= 0:
+            break
+        center = pixels[rng.choice(len(pixels), p=distances / total)]
+        centers.append(center)
+        np.minimum(distances, ((pixels - center) ** 2).sum(axis=1), out=distances)
+    return np.array(centers)
+
+
+def _kmeans(pixels, palette, max_iter, tol):
+    for _ in range(max_iter):
+        labels = _nearest(pixels, palette)
+        counts = np.bincount(labels, minlength=len(palette))
+        sums = np.stack([np.bincount(labels, pixels[:, i], minlength=len(palette)) for i in range(3)], axis=1)
+        # empty clusters keep their color
+        updated = np.where(counts[:, None] > 0, sums / np.maximum(counts, 1)[:, None], palette)
+        shift = np.abs(updated - palette).max()
+        palette = updated
+        if shift < tol:
+            break
+    return palette
+
+
+def extract_palette(image, n, method="median_cut", sample=100000, max_iter=20, tol=1e-4, seed=0):
+    """Return a palette of *n* colors representative of an image
+
+    :param image: an (..., 3) image, uint8 (0-255) or float (0-1)
+    :param int n: number of colors
+    :param str method: "median_cut" or "kmeans" (initialised with k-means++)
+    :param int sample: number of pixels (randomly chosen) used to compute the
+        palette. None to use all pixels.
+    :param int seed: seed of the random sampling and of the k-means
+        initialisation
+    :return: an (n, 3) array of normalised RGB values (fewer colors if the
+        image has less than n distinct colors)
+    """
+    if method not in ("median_cut", "kmeans"):
+        raise ValueError(f"method must be 'median_cut' or 'kmeans'. You provided {method}")
+    pixels = _check_dtype(np.asarray(image)).reshape(-1, 3)
+    rng = np.random.default_rng(seed)
+    if sample is not None and len(pixels) > sample:
+        pixels = pixels[rng.choice(len(pixels), sample, replace=False)]
+    pixels = _as_float(pixels)
+    if method == "median_cut":
+        return _median_cut(pixels, n)
+    return _kmeans(pixels, _kmeans_init(pixels, n, rng), max_iter, tol)
@@ -14,8 +14,10 @@
 # Documentation: http://packages.python.org/colormap
 #
 ##############################################################################
+from collections import namedtuple
+from types import MappingProxyType
 
-__all__ = ["XFree86_colors"]
+__all__ = ["XFree86_colors", "XFree86_index"]
 
 # TC: I have added the "green" key, which is the same as green(x11)
 
@@ -167,3 +169,24 @@ XFree86_colors = {
     "Yellow": "#FFFF00",
     "Yellow Green": "#9ACD32",
 }
+
+
+#: read-only lookup tables built once from a color dictionary. *names* maps
+#: the official names to their hexadecimal value, *aliases* maps the valid
+#: names (official, lower case, without spaces) to the official name and
+#: *hexes* maps the hexadecimal values to an official name.
+ColorIndex = namedtuple("ColorIndex", ["names", "aliases", "hexes"])
+
+
+def _build_index(colors):
+    # names with spaces are also valid without spaces, in lower or upper case
+    aliases = {x.replace(" ", ""): x for x in colors.keys() if " " in x}
+    aliases.update((x.replace(" ", "").lower(), x) for x in colors.keys() if " " in x)
+    aliases.update((x.lower(), x) for x in colors.keys())
+    aliases.update((x, x) for x in colors.keys())
+    # if several names share the same hexadecimal value, the last one is used
+    hexes = dict(zip(colors.values(), colors.keys()))
+    return ColorIndex(MappingProxyType(dict(colors)), MappingProxyType(aliases), MappingProxyType(hexes))
+
+
+XFree86_index = _build_index(XFree86_colors)
@@ -0,0 +1,81 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from colormap.aio import RenderService, cmap_async, lut_async, render_async
+from colormap.cache import cmap_cache
+from colormap.colorize import apply_colormap
+from colormap.lut import lut_builder
+
+
+class CountingExecutor(ThreadPoolExecutor):
+    def __init__(self):
+        super().__init__(max_workers=2)
+        self.submitted = 0
+
+    def submit(self, *args, **kwargs):
+        self.submitted += 1
+        return super().submit(*args, **kwargs)
+
+
+def test_render_async():
+    data = np.random.default_rng(0).random((50, 40))
+    data[0, 0] = np.nan
+    result = asyncio.run(render_async(data, "viridis", chunksize=100))
+    assert (result == apply_colormap(data, "viridis")).all()
+    result = asyncio.run(render_async(data, ["red", "blue"], vmin=0.2, vmax=0.8, N=16))
+    assert (result == apply_colormap(data, ["red", "blue"], vmin=0.2, vmax=0.8, N=16)).all()
+    assert (asyncio.run(lut_async("jet", N=8)) == lut_builder("jet", N=8, dtype="uint8")).all()
+    assert asyncio.run(cmap_async("red", "white", "blue")).N == 256
+    try:
+        asyncio.run(render_async(data, "viridis", out=np.empty((2, 4), dtype=np.uint8)))
+        assert False
+    except ValueError:
+        assert True
+    try:
+        asyncio.run(render_async(data, "viridis", vmin=1, vmax=0))
+        assert False
+    except ValueError:
+        assert True
+
+
+def test_coalesce():
+    executor = CountingExecutor()
+    service = RenderService(executor=executor)
+    cmap_cache.clear()
+
+    async def main():
+        spec = ["red", "#123456", "blue"]
+        luts = await asyncio.gather(*[service.lut(spec, N=64) for _ in range(5)])
+        assert all(lut is luts[0] for lut in luts)
+        assert executor.submitted == 1
+        # cached: no thread involved
+        await service.lut(spec, N=64)
+        assert executor.submitted == 1
+        assert not service._pending
+
+    asyncio.run(main())
+    service.shutdown()
+    executor.shutdown()
+
+
+def test_cancel():
+    executor = CountingExecutor()
+    service = RenderService(executor=executor)
+    data = np.zeros((1000, 10))
+
+    async def main():
+        task = asyncio.ensure_future(service.render(data, "viridis", vmin=0, vmax=1, chunksize=10))
+        while executor.submitted == 0:
+            await asyncio.sleep(0)
+        task.cancel()
+        try:
+            await task
+            assert False
+        except asyncio.CancelledError:
+            assert True
+
+    asyncio.run(main())
+    executor.shutdown()
+    assert executor.submitted < 1000
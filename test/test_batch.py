@@ -0,0 +1,55 @@
+import os
+
+import numpy as np
+
+from colormap.batch import BatchColorizer, colorize_files
+from colormap.colorize import apply_colormap
+from colormap.lut import lut_builder
+
+
+def _inputs(tmp_path, n=5):
+    rng = np.random.default_rng(0)
+    inputs = []
+    for i in range(n):
+        data = rng.random((20 + i, 30)).astype("float32")
+        data[0, 0] = np.nan
+        filename = str(tmp_path / f"data{i}.npy")
+        np.save(filename, data)
+        inputs.append(filename)
+    return inputs
+
+
+def test_colorize_files(tmp_path):
+    inputs = _inputs(tmp_path)
+    outputs = colorize_files(inputs, "viridis", processes=2, files_per_task=2, chunksize=100)
+    assert outputs == [x.replace(".npy", "_rgba.npy") for x in inputs]
+    for source, target in zip(inputs, outputs):
+        assert (np.load(target) == apply_colormap(np.load(source), "viridis")).all()
+
+    outputs = [tmp_path / f"out{i}.npy" for i in range(len(inputs))]
+    colorize_files(inputs, ["red", "blue"], outputs, vmin=0.2, vmax=0.8, N=16, processes=1)
+    expected = apply_colormap(np.load(inputs[3]), ["red", "blue"], vmin=0.2, vmax=0.8, N=16)
+    assert (np.load(outputs[3]) == expected).all()
+    try:
+        colorize_files(inputs, "viridis", outputs[:2], processes=1)
+        assert False
+    except ValueError:
+        assert True
+
+
+def test_batch_colorizer(tmp_path):
+    inputs = _inputs(tmp_path, 3)
+    lut = lut_builder("jet", N=32, dtype="uint8")
+    with BatchColorizer(lut, vmin=0, vmax=1, processes=2, chunksize=100) as colorizer:
+        name = colorizer._shm.name
+        assert (colorizer.lut == lut).all()
+        outputs = list(colorizer.imap(inputs))
+        assert colorizer.map(inputs[:1]) == outputs[:1]
+    assert (np.load(outputs[2]) == apply_colormap(np.load(inputs[2]), lut, vmin=0, vmax=1)).all()
+    # the shared memory block is released
+    assert not os.path.exists(f"/dev/shm/{name.lstrip('/')}")
+    try:
+        colorizer.map(inputs)
+        assert False
+    except ValueError:
+        assert True
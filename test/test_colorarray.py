@@ -0,0 +1,70 @@
+import numpy as np
+from numpy.testing import assert_allclose
+
+from colormap import Color
+from colormap.colorarray import ColorArray
+
+
+def test_constructors():
+    names = ["red", "#00FF00", "Spring Green", "0xFFF", "springgreen", "red"]
+    colors = ColorArray(names)
+    assert len(colors) == 6
+    assert colors.hex.tolist() == [Color(x).hex for x in names]
+    assert colors.names.tolist() == [Color(x).name for x in names]
+    assert_allclose(colors.rgb, [Color(x).rgb for x in names])
+    assert_allclose(ColorArray([Color("red"), "blue"]).rgb, [[1, 0, 0], [0, 0, 1]])
+    assert_allclose(ColorArray(rgb=colors.rgb).rgb, colors.rgb)
+    assert_allclose(ColorArray(hls=colors.hls).rgb, colors.rgb)
+    assert_allclose(ColorArray(hsv=colors.hsv).rgb, colors.rgb)
+    assert_allclose(ColorArray(colors).rgb, colors.rgb)
+    for args, kwargs in (([["dummy"]], {}), ([], {}), ([], {"rgb": [[0, 0, 2]]})):
+        try:
+            ColorArray(*args, **kwargs)
+            assert False
+        except ValueError:
+            assert True
+
+
+def test_getters():
+    names = ["red", "yellow", "Ghost White", "#123456"]
+    colors = ColorArray(names)
+    assert_allclose(colors.hsv, [Color(x).hsv for x in names])
+    assert_allclose(colors.hls, [Color(x).hls for x in names])
+    assert_allclose(colors.yiq, [Color(x).yiq for x in names])
+    assert isinstance(colors[0], Color) and colors[0].name == "Red"
+    assert [c.hex for c in colors] == colors.hex.tolist()
+    assert len(colors[1:3]) == 2
+    assert "#FF0000" in repr(colors)
+
+
+def test_setters():
+    names = ["red", "yellow", "Ghost White", "#123456"]
+    for attribute, value in (
+        ("lightness", 0.3),
+        ("saturation_hls", 0.5),
+        ("hue", 0.25),
+        ("value", 0.5),
+        ("red", 0.1),
+        ("green", 0.2),
+        ("blue", 0.7),
+    ):
+        colors = ColorArray(names)
+        setattr(colors, attribute, value)
+        expected = []
+        for name in names:
+            c = Color(name)
+            setattr(c, attribute, value)
+            expected.append(c.rgb)
+        assert_allclose(colors.rgb, expected, atol=1e-12)
+        assert_allclose(getattr(colors, attribute), value)
+
+    colors = ColorArray(names)
+    colors.lightness = np.linspace(0, 1, 4)
+    assert_allclose(colors.lightness, np.linspace(0, 1, 4))
+    colors.hex = ["#FFF", "#000", "#F00", "#0F0"]
+    assert colors.names.tolist() == [Color(x).name for x in ["#FFF", "#000", "#F00", "#0F0"]]
+    try:
+        colors.lightness = 2
+        assert False
+    except ValueError:
+        assert True
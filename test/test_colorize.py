@@ -0,0 +1,91 @@
+import numpy as np
+from matplotlib.colors import Normalize
+
+from colormap import cmap_builder
+from colormap.colorize import apply_colormap
+from colormap.lut import lut_builder
+
+
+def test_apply_colormap():
+    rng = np.random.default_rng(0)
+    data = rng.normal(size=(50, 40))
+    expected = cmap_builder("viridis")(Normalize(-1, 1)(data), bytes=True)
+    for chunksize in (1, 100, 10**6):
+        assert (apply_colormap(data, "viridis", vmin=-1, vmax=1, chunksize=chunksize) == expected).all()
+
+    expected = cmap_builder("red", "white", "blue")(Normalize()(data), bytes=True)
+    assert (apply_colormap(data, ["red", "white", "blue"]) == expected).all()
+    lut = lut_builder("viridis", dtype="uint8")
+    assert (apply_colormap(data, lut, 0, 1) == apply_colormap(data, "viridis", 0, 1)).all()
+
+    d = {"blue": [0, 0, 0, 0, 1], "green": [0, 0.35, 0.7, 1, 1], "red": [1, 1, 1, 1, 1]}
+    assert apply_colormap(np.arange(10), d).shape == (10, 4)
+    assert apply_colormap(5, "jet").shape == (1, 4)
+    # constant data
+    assert (apply_colormap(np.ones(3), "jet") == lut_builder("jet", dtype="uint8")[0]).all()
+
+
+def test_apply_colormap_dtypes():
+    rng = np.random.default_rng(0)
+    cmap = cmap_builder("viridis")
+    for dtype in ("float32", "float16", "int16", "int32"):
+        data = (rng.normal(size=(200, 500)) * 100).astype(dtype)
+        expected = cmap(Normalize()(data), bytes=True)
+        assert (apply_colormap(data, "viridis", chunksize=1000) == expected).all()
+
+
+def test_apply_colormap_chunks():
+    from colormap.colorize import _chunks
+
+    # the chunks are bounded whatever the shape
+    for shape in ((1, 1000), (3, 500), (1000, 2), (2, 3, 100), (7,)):
+        chunks = list(_chunks(shape, 64))
+        assert all(np.empty(shape)[chunk].size <= 64 for chunk in chunks)
+        assert sum(np.empty(shape)[chunk].size for chunk in chunks) == np.prod(shape)
+    data = np.linspace(0, 1, 1000).reshape(1, 1000)
+    expected = cmap_builder("viridis")(data, bytes=True)
+    assert (apply_colormap(data, "viridis", 0, 1, chunksize=64) == expected).all()
+
+
+def test_apply_colormap_limits():
+    data = np.linspace(0, 1, 10)
+    for vmin, vmax in ((1, 0), (None, -1), (2, None)):
+        try:
+            apply_colormap(data, "jet", vmin=vmin, vmax=vmax)
+            assert False
+        except ValueError:
+            assert True
+    assert (apply_colormap(data, "jet", vmin=0.5, vmax=0.5)[:, 3] == 255).all()
+
+
+def test_apply_colormap_nan():
+    data = np.array([np.nan, 0, 1, np.inf, -np.inf])
+    rgba = apply_colormap(data, "viridis")
+    lut = lut_builder("viridis", dtype="uint8")
+    assert (rgba[0] == 0).all()
+    assert (rgba[1] == lut[0]).all() and (rgba[2] == lut[-1]).all()
+    assert (rgba[3] == lut[-1]).all() and (rgba[4] == lut[0]).all()
+    assert (apply_colormap(np.full(3, np.nan), "jet") == 0).all()
+
+
+def test_apply_colormap_memmap(tmp_path):
+    data = np.lib.format.open_memmap(tmp_path / "data.npy", mode="w+", dtype="float32", shape=(64, 32))
+    data[:] = np.linspace(0, 1, data.size).reshape(data.shape)
+    out = np.lib.format.open_memmap(tmp_path / "out.npy", mode="w+", dtype="uint8", shape=(64, 32, 4))
+    assert apply_colormap(data, "jet", out=out, chunksize=100) is out
+    out.flush()
+    assert (np.load(tmp_path / "out.npy") == apply_colormap(np.asarray(data), "jet")).all()
+    try:
+        apply_colormap(data, "jet", out=np.empty((64, 32, 4)))
+        assert False
+    except ValueError:
+        assert True
+
+
+def test_apply_colormap_workers():
+    rng = np.random.default_rng(1)
+    data = rng.normal(size=(300, 200))
+    data[10, 10] = np.nan
+    expected = apply_colormap(data, "jet", chunksize=1000)
+    for workers in (2, 4, None):
+        assert (apply_colormap(data, "jet", chunksize=1000, workers=workers) == expected).all()
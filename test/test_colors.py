@@ -1,3 +1,4 @@
+import pytest
 from pytest import approx as assert_list_almost_equal
 
 from colormap import colors
@@ -269,6 +270,52 @@ def test_colormap():
     c.test_colormap()  # no input plots the heat map
 
 
+def test_cmap_reverse_does_not_modify_input():
+    import numpy as np
+
+    c = Colormap()
+    d = {"blue": [0, 0, 1], "green": [0, 0.5, 1], "red": [1, 1, 1]}
+    reverse = c.cmap(d, reverse=True, N=10)
+    assert d == {"blue": [0, 0, 1], "green": [0, 0.5, 1], "red": [1, 1, 1]}
+    x = np.linspace(0, 1, 10)
+    assert np.allclose(reverse(x), c.cmap(d, reverse=True, N=10)(x))
+    forward = c.cmap(d, N=10)
+    assert np.allclose(reverse(x), forward(x[::-1]))
+    assert np.allclose(c.get_cmap_heat_r()(x), c.get_cmap_heat()(x[::-1]))
+    # unhashable specifications are not cached
+    d = {"blue": np.array([0, 1]), "green": np.array([0, 1]), "red": np.array([1, 1])}
+    assert np.allclose(c.cmap(d, reverse=True)(x), c.cmap(d)(x[::-1]))
+    assert d["blue"].tolist() == [0, 1]
+
+
+def test_cmap_colors():
+    import numpy as np
+    from matplotlib.colors import LinearSegmentedColormap, ListedColormap
+
+    c = Colormap()
+    cmap = c.cmap_colors(["red", "white", "blue", "black"], N=10)
+    assert isinstance(cmap, LinearSegmentedColormap) and cmap.N == 10
+    assert cmap(0.0)[:3] == (1, 0, 0) and cmap(1.0)[:3] == (0, 0, 0)
+    x = np.linspace(0, 1, 10)
+    assert np.allclose(c.cmap_bicolor("red", "blue")(x), c.cmap_colors(["red", "blue"])(x))
+
+    for space in ("lab", "oklab", "lch"):
+        cmap = c.cmap_linear("red", "white", "blue", interp_space=space, N=11)
+        assert isinstance(cmap, ListedColormap) and cmap.N == 11
+        assert np.allclose(cmap(0.0), (1, 0, 0, 1)) and np.allclose(cmap(1.0), (0, 0, 1, 1))
+        assert np.allclose(cmap(0.5), (1, 1, 1, 1))
+    cmap = c.cmap_bicolor(Color("red"), "#00FF00", interp_space="oklab", reverse=True)
+    assert np.allclose(cmap(0.0), (0, 1, 0, 1))
+    assert np.allclose(cmap(x), c.cmap_bicolor("red", "#0F0", interp_space="oklab", reverse=True)(x))
+    # the midpoint is brighter than in RGB
+    assert sum(cmap(0.5)[:3]) > sum(c.cmap_bicolor("red", "#0F0")(0.5)[:3])
+    try:
+        c.cmap_bicolor("red", "blue", interp_space="hsv")
+        assert False
+    except ValueError:
+        assert True
+
+
 def test_HEX():
 
     h = HEX()
@@ -302,3 +349,430 @@ def test_HEX():
         assert False
     except:
         assert True
+
+
+def test_parse_hex_color(capsys):
+    valid = {
+        "#FFF": "#FFFFFF",
+        "#fa1": "#FFAA11",
+        "0xFA1": "#FFAA11",
+        "0Xabcdef": "#ABCDEF",
+        "#00ff00": "#00FF00",
+        "#AABBCCDD": "#AABBCC",
+    }
+    for value, expected in valid.items():
+        assert parse_hex_color(value) == expected
+        assert HEX().get_standard_hex_color(value) == expected
+        assert HEX().is_valid_hex_color(value)
+    for value in ("red", "#FF", "#FFFF", "#FFFFFFF", "#AAAZZZ", "FFFFFF", "0x", "#FFF ", " #FFF", "#\u0661\u0662\u0663", 22, None):
+        assert parse_hex_color(value) is None
+        assert HEX().is_valid_hex_color(value, verbose=False) is False
+        try:
+            HEX().get_standard_hex_color(value)
+            assert False
+        except (TypeError, ValueError):
+            assert True
+    capsys.readouterr()
+    assert HEX().is_valid_hex_color("#AAAZZZ") is False
+    assert "invalid" in capsys.readouterr().out
+    assert HEX().is_valid_hex_color("red", verbose=False) is False
+    assert capsys.readouterr().out == ""
+
+    assert hex2rgb("0xfa1") == (255, 170, 17)
+    assert hex2web("#ffaa11") == "#FA1"
+    assert web2hex("#fa1") == "#FFAA11"
+    assert Color("#fa1").hex == "#FFAA11"
+    try:
+        Color("#AAAZZZ")
+        assert False
+    except AssertionError as err:
+        assert "valid name" in str(err)
+    try:
+        hex2rgb("#AAAZZZ")
+        assert False
+    except ValueError as err:
+        assert "invalid hexa character" in str(err)
+
+
+def test_hex2rgb_array():
+    import numpy as np
+
+    values = ["#FFF", "#0000FF", "0x0000FF", "0xFA1", "#ffaa1180", "0Xabcdef"]
+    rgb = hex2rgb_array(values)
+    assert rgb.dtype == np.uint8
+    assert rgb.tolist() == [list(hex2rgb(x)) for x in values]
+    assert hex2rgb_array(np.array(values).reshape(2, 3)).shape == (2, 3, 3)
+    assert_list_almost_equal(hex2rgb_array(values, normalise=True)[1], hex2rgb("#0000FF", normalise=True))
+    assert hex2rgb_array([]).shape == (0, 3)
+
+    for invalid in (["#FFF", "FFF"], ["#AAAZZZ"], ["#AAAA"], [1, 2]):
+        try:
+            hex2rgb_array(invalid)
+            assert False
+        except (ValueError, TypeError):
+            assert True
+
+
+def test_rgb2hex_array():
+    import numpy as np
+
+    rgb = np.array([[0, 0, 255], [255, 255, 255], [16, 1, 171]], dtype=np.uint8)
+    hexa = rgb2hex_array(rgb)
+    assert hexa.tolist() == [rgb2hex(*x) for x in rgb.tolist()]
+    assert rgb2hex_array([[0, 0, 1]], normalised=True).tolist() == [rgb2hex(0, 0, 1, normalised=True)]
+    assert (hex2rgb_array(hexa) == rgb).all()
+
+    for invalid in ([[0, 0, 1000]], [[0, 0, -1]], [[0, 0]]):
+        try:
+            rgb2hex_array(invalid)
+            assert False
+        except ValueError:
+            assert True
+    try:
+        rgb2hex_array([[0, 0, 10]], normalised=True)
+        assert False
+    except ValueError:
+        assert True
+
+
+def test_conversion_arrays():
+    import numpy as np
+    from numpy.testing import assert_allclose
+
+    rng = np.random.default_rng(0)
+    rgb = np.vstack([rng.random((200, 3)), [[0, 0, 0], [1, 1, 1], [0.5, 0.5, 0.5], [1, 0, 0], [0, 1, 1]]])
+
+    for func, func_array in [
+        (rgb2hsv, rgb2hsv_array),
+        (rgb2hls, rgb2hls_array),
+        (hsv2rgb, hsv2rgb_array),
+        (hls2rgb, hls2rgb_array),
+        (rgb2yuv, rgb2yuv_array),
+    ]:
+        expected = [func(*x) for x in rgb.tolist()]
+        assert_allclose(func_array(rgb), expected)
+
+    yuv = rgb2yuv_array(rgb)
+    yuv = yuv[(yuv >= 0).all(axis=1)]
+    assert_allclose(yuv2rgb_array(yuv), [yuv2rgb(*x) for x in yuv.tolist()])
+
+    rgb255 = np.round(rgb * 255)
+    assert_allclose(rgb2hsv_array(rgb255, normalised=False), [rgb2hsv(*x, normalised=False) for x in rgb255.tolist()])
+    assert rgb2yuv_int_array(rgb255).tolist() == [list(rgb2yuv_int(*x)) for x in rgb255.tolist()]
+    yuv = rgb2yuv_int_array(rgb255)
+    yuv = yuv[(yuv >= 0).all(axis=1)]
+    assert yuv2rgb_int_array(yuv).tolist() == [list(yuv2rgb_int(*x)) for x in yuv.tolist()]
+
+    hsv = np.array([[180, 100, 100], [360, 50, 20]])
+    assert_allclose(hsv2rgb_array(hsv, normalised=False), [hsv2rgb(*x, normalised=False) for x in hsv.tolist()])
+    assert_allclose(hls2rgb_array(hsv, normalised=False), [hls2rgb(*x, normalised=False) for x in hsv.tolist()])
+
+    # preallocated and in-place buffers
+    image = rng.random((4, 5, 3))
+    out = np.empty_like(image)
+    assert rgb2hls_array(image, out=out) is out
+    expected = out.copy()
+    hls2rgb_array(out, out=out)
+    assert_allclose(out, image)
+    assert_allclose(rgb2hls_array(image, out=image), expected)
+
+    for invalid in ([[0, 0, 2]], [[0, 0]], [[0, 0, np.nan]]):
+        try:
+            rgb2hsv_array(invalid)
+            assert False
+        except ValueError:
+            assert True
+    try:
+        rgb2hsv_array(image, out=np.empty((2, 3)))
+        assert False
+    except ValueError:
+        assert True
+
+
+def test_rgb2lab():
+    from numpy.testing import assert_allclose
+
+    assert_allclose(rgb2lab_array([1, 1, 1]), [100, 0, 0], atol=1e-3)
+    assert_allclose(rgb2lab_array([0, 0, 0]), [0, 0, 0], atol=1e-12)
+    assert_allclose(rgb2lab_array([1, 0, 0]), [53.2408, 80.0925, 67.2032], atol=1e-3)
+
+
+def test_perceptual_spaces():
+    import numpy as np
+    from numpy.testing import assert_allclose
+
+    # reference values of red, computed with the D65 white point
+    assert_allclose(rgb2xyz(1, 0, 0), (0.4124564, 0.2126729, 0.0193339))
+    assert_allclose(rgb2lab(255, 0, 0, normalised=False), (53.2408, 80.0925, 67.2032), atol=1e-4)
+    assert_allclose(rgb2lch(1, 0, 0), (53.2408, 104.5518, 39.9990), atol=1e-4)
+    assert_allclose(rgb2oklab(1, 0, 0), (0.62796, 0.22486, 0.12585), atol=1e-5)
+    assert_allclose(rgb2lab(1, 1, 1), (100, 0, 0), atol=1e-4)
+    assert_allclose(rgb2oklab(1, 1, 1), (1, 0, 0), atol=1e-6)
+
+    rng = np.random.default_rng(0)
+    rgb = np.vstack([rng.random((200, 3)), [[0, 0, 0], [1, 1, 1], [1, 0, 0]]])
+    for forward, backward, forward_array, backward_array in [
+        (rgb2xyz, xyz2rgb, rgb2xyz_array, xyz2rgb_array),
+        (rgb2lab, lab2rgb, rgb2lab_array, lab2rgb_array),
+        (rgb2lch, lch2rgb, rgb2lch_array, lch2rgb_array),
+        (rgb2oklab, oklab2rgb, rgb2oklab_array, oklab2rgb_array),
+    ]:
+        converted = forward_array(rgb)
+        assert_allclose(converted, [forward(*x) for x in rgb.tolist()], atol=1e-10)
+        assert_allclose(backward_array(converted), rgb, atol=1e-10)
+        assert_allclose([backward(*x) for x in converted.tolist()], rgb, atol=1e-10)
+
+    # out of gamut colors are clipped unless clip is False
+    assert max(lch2rgb(50, 150, 0)) <= 1 and min(lch2rgb(50, 150, 0)) >= 0
+    assert min(lch2rgb(50, 150, 0, clip=False)) < 0
+    assert (lab2rgb_array([[50, 120, 0], [50, -120, 0]]) >= 0).all()
+    out = np.empty((2, 3))
+    assert rgb2lab_array([[1, 0, 0], [0, 1, 0]], out=out) is out
+    try:
+        rgb2lab_array([[0, 0, 2]])
+        assert False
+    except ValueError:
+        assert True
+
+
+def test_delta_e2000():
+    import numpy as np
+    from numpy.testing import assert_allclose
+
+    # test data from Sharma et al. (2005)
+    data = [
+        ((50, 2.6772, -79.7751), (50, 0, -82.7485), 2.0425),
+        ((50, -1.3802, -84.2814), (50, 0, -82.7485), 1.0),
+        ((50, 0, 0), (50, -1, 2), 2.3669),
+        ((50, 2.5, 0), (73, 25, -18), 27.1492),
+        ((50, 2.49, -0.001), (50, -2.49, 0.0011), 7.2195),
+        ((60.2574, -34.0099, 36.2677), (60.4626, -34.1751, 39.4387), 1.2644),
+        ((2.0776, 0.0795, -1.135), (0.9033, -0.0636, -0.5514), 0.9082),
+    ]
+    lab1, lab2, expected = zip(*data)
+    assert_allclose(delta_e2000(lab1, lab2), expected, atol=1e-4)
+    assert isinstance(delta_e2000(lab1[0], lab2[0]), float)
+    assert delta_e2000((50, 10, 10), (50, 10, 10)) == 0
+    # broadcasting
+    assert delta_e2000(np.zeros((4, 5, 3)), (50, 0, 0)).shape == (4, 5)
+
+
+def test_color_perceptual_spaces():
+    from numpy.testing import assert_allclose
+
+    color = Color("red")
+    assert_allclose(color.lab, rgb2lab(1, 0, 0))
+    assert_allclose(color.lch, rgb2lch(1, 0, 0))
+    assert_allclose(color.oklab, rgb2oklab(1, 0, 0))
+    assert_allclose(color.xyz, rgb2xyz(1, 0, 0))
+    color.lab = (50, 0, 0)
+    assert color.hex == "#767676"
+    color.oklab = Color("blue").oklab
+    assert_allclose(color.rgb, (0, 0, 1), atol=1e-12)
+    color.lch = rgb2lch(1, 0, 0)
+    assert_allclose(color.rgb, (1, 0, 0), atol=1e-12)
+    assert color.delta_e("red") < 1e-6
+    assert color.delta_e(Color("darkred")) > 10
+
+
+def test_xfree86_index():
+    from colormap.xfree86 import XFree86_colors, XFree86_index
+
+    assert XFree86_index.names["Spring Green"] == XFree86_colors["Spring Green"]
+    for name in ("Spring Green", "spring green", "springgreen", "SpringGreen"):
+        assert XFree86_index.aliases[name] == "Spring Green"
+        assert Color(name).name == "Spring Green"
+    assert XFree86_index.hexes["#F8F8FF"] == Color("#F8F8FF").name
+    assert set(XFree86_index.names) == set(XFree86_colors)
+    try:
+        XFree86_index.names["dummy"] = "#FFFFFF"
+        assert False
+    except TypeError:
+        assert True
+    try:
+        Color("dummy")
+        assert False
+    except AssertionError:
+        assert True
+
+
+def test_colormap_registry():
+    import matplotlib
+    from matplotlib.colors import ListedColormap
+
+    registry = colors.colormap_registry
+    assert "viridis" in registry
+    assert "dummy" not in registry
+    assert {"red": [0, 1]} not in registry
+    assert registry.names == list(matplotlib.colormaps)
+    assert Colormap().colormaps == registry.names
+    assert len(registry) == len(registry.names)
+
+    matplotlib.colormaps.register(ListedColormap(["red", "blue"], name="colormap_test_registry"))
+    try:
+        assert "colormap_test_registry" in registry
+        assert "colormap_test_registry" in Colormap().colormaps
+    finally:
+        matplotlib.colormaps.unregister("colormap_test_registry")
+    assert "colormap_test_registry" not in registry
+
+    # same number of colormaps but different names
+    matplotlib.colormaps.register(ListedColormap(["red", "blue"], name="colormap_test_aaa1"))
+    try:
+        assert "colormap_test_aaa1" in registry.names
+        matplotlib.colormaps.unregister("colormap_test_aaa1")
+        matplotlib.colormaps.register(ListedColormap(["red", "blue"], name="colormap_test_aaa2"))
+        assert "colormap_test_aaa1" not in registry
+        assert "colormap_test_aaa2" in registry
+        assert "colormap_test_aaa1" not in registry.names and "colormap_test_aaa2" in registry.names
+        assert Colormap().cmap("colormap_test_aaa2").N == 2
+    finally:
+        matplotlib.colormaps.unregister("colormap_test_aaa1")
+        matplotlib.colormaps.unregister("colormap_test_aaa2")
+
+
+def test_lru_cache():
+    import threading
+
+    from colormap.cache import LRUCache
+
+    cache = LRUCache(maxsize=2)
+    assert cache.get_or_build("a", lambda: 1) == 1
+    assert cache.get_or_build("a", lambda: 2) == 1
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+    # b was the least recently used
+    assert "b" not in cache and "a" in cache and "c" in cache
+    assert cache.get("b", "missing") == "missing"
+    assert cache.info() == (2, 2, 2, 2)
+    try:
+        cache.maxsize = -1
+        assert False
+    except ValueError:
+        assert True
+
+    cache = LRUCache(maxsize=10)
+    threads = [threading.Thread(target=lambda: [cache.get_or_build(i % 20, object) for i in range(1000)]) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    info = cache.info()
+    assert info.hits + info.misses == 4000 and info.currsize == 10
+
+
+def test_cmap_is_cached():
+    import numpy as np
+
+    from colormap.cache import cmap_cache
+
+    c = Colormap()
+    x = np.linspace(0, 1, 20)
+    d = {"blue": [0, 0, 1], "green": [0, 1, 0], "red": [1, 0, 0]}
+    c.cmap(d)
+    hits = cmap_cache.info().hits
+    assert np.allclose(c.cmap(d)(x), c.cmap({"red": [1, 0, 0], "green": [0, 1, 0], "blue": [0, 0, 1]})(x))
+    assert cmap_cache.info().hits == hits + 2
+    assert np.allclose(c.cmap("heat", reverse=True)(x), c.get_cmap_heat_r()(x))
+    # the reversed colormap is a view of the table of the colormap
+    assert np.shares_memory(c.cmap(d, reverse=True).colors, c._cached_cmap(d, False, 256)._lut)
+    assert np.allclose(c.cmap(d, reverse=True)(x), c.cmap(d)(1 - x))
+    # the table is computed once, not by each copy
+    assert c.cmap(d)._isinit and c.cmap(d, reverse=True)._isinit
+
+
+def test_cmap_registered_again():
+    import matplotlib
+    from matplotlib.colors import ListedColormap
+
+    from colormap.lut import lut_builder
+
+    c = Colormap()
+    matplotlib.colormaps.register(ListedColormap(["red", "blue"], name="colormap_test_again"))
+    try:
+        assert c.cmap("colormap_test_again")(0.0) == (1, 0, 0, 1)
+        assert lut_builder("colormap_test_again", N=2)[0].tolist() == [1, 0, 0, 1]
+        matplotlib.colormaps.unregister("colormap_test_again")
+        matplotlib.colormaps.register(ListedColormap(["green", "blue"], name="colormap_test_again"))
+        assert c.cmap("colormap_test_again")(0.0) != (1, 0, 0, 1)
+        assert lut_builder("colormap_test_again", N=2)[0].tolist() != [1, 0, 0, 1]
+    finally:
+        matplotlib.colormaps.unregister("colormap_test_again")
+
+
+@pytest.mark.filterwarnings("ignore::PendingDeprecationWarning")
+def test_cmap_copies_are_independent():
+    import numpy as np
+
+    c = Colormap()
+    cmap = c.cmap("viridis")
+    assert cmap is not c.cmap("viridis")
+    cmap.set_bad("red")
+    assert c.cmap("viridis").get_bad().tolist() == [0, 0, 0, 0]
+    d = {"blue": [0, 0, 1], "green": [0, 1, 0], "red": [1, 0, 0]}
+    cmap = c.cmap(d, reverse=True)
+    cmap.set_under("black")
+    assert c.cmap(d, reverse=True)(-1.0) == (0, 0, 1, 1)
+    cmap = c.cmap_linear("red", "white", "blue", interp_space="oklab")
+    cmap.set_over("black")
+    assert np.allclose(c.cmap_linear("red", "white", "blue", interp_space="oklab")(2.0), (0, 0, 1, 1))
+    # colors differing by less than 1/255 give different colormaps
+    a = c.cmap_bicolor(Color(rgb=(0.5, 0, 0)), "blue", N=1024)
+    b = c.cmap_bicolor(Color(rgb=(0.501, 0, 0)), "blue", N=1024)
+    assert a(0.0)[0] != b(0.0)[0]
+
+
+def test_color_slots_and_cache():
+    import sys
+
+    c = Color("red")
+    assert not hasattr(c, "__dict__")
+    assert sys.getsizeof(c) < 128
+    try:
+        c.dummy = 1
+        assert False
+    except AttributeError:
+        assert True
+
+    hsv = c.hsv
+    assert c.hsv is hsv
+    c.hue = 0.5
+    assert c.hsv is not hsv
+    assert_list_almost_equal(c.hsv, rgb2hsv(*c.rgb))
+    hls = c.hls
+    c.hex = "#0000FF"
+    assert c.hls is not hls and c.hls == rgb2hls(0, 0, 1)
+    yiq = c.yiq
+    c.rgb = (1, 1, 0)
+    assert c.yiq != yiq and c.value == 1
+    str(c)
+
+
+def test_trusted():
+    for func, args in ((rgb2hex, (0, 0, 256)), (hls2rgb, (0, 2, 0)), (rgb2hsv, (-1, 0, 0)), (rgb2yuv, (0, 0, 2))):
+        try:
+            func(*args)
+            assert False
+        except ValueError:
+            assert True
+
+    color = Color("red")
+    reference = Color("red")
+    with trusted():
+        hls2rgb(0, 2, 0)
+        assert rgb2hsv(0.5, 0, 1) == (0.75, 1, 1)
+    for hue in (0.1, 0.5, 0.9):
+        with trusted():
+            color.hue = hue
+        reference.hue = hue
+        assert color.hex == reference.hex and color.name == reference.name and color.rgb == reference.rgb
+    with trusted():
+        color.rgb = (0, 0, 1)
+    assert color.name == "Blue" and color.hsv == (2 / 3, 1, 1)
+
+    try:
+        color.hue = 2
+        assert False
+    except ValueError:
+        assert True
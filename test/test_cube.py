@@ -0,0 +1,87 @@
+import os
+
+import numpy as np
+from numpy.testing import assert_allclose
+
+from colormap.colors import hls2rgb_array, rgb2hls_array, rgb2yuv_array
+from colormap.cube import ColorCube
+from colormap.nearest import nearest_name
+
+
+def _image():
+    return np.random.default_rng(0).integers(0, 256, (40, 30, 3), dtype=np.uint8)
+
+
+def test_cube():
+    cube = ColorCube.from_function(rgb2yuv_array, size=17)
+    assert cube.size == 17 and cube.table.shape == (17, 17, 17, 3)
+    image = _image()
+    # a linear transform is exactly interpolated
+    assert_allclose(cube.apply(image), rgb2yuv_array(image / 255), atol=1e-6)
+    assert_allclose(cube.apply(image / 255, chunksize=100), rgb2yuv_array(image / 255), atol=1e-6)
+    assert cube.apply(image[0, 0]).shape == (3,)
+
+    # grid points are exact with both interpolations
+    points = np.array([[0, 0, 0], [1, 0.5, 0.25], [1, 1, 1]])
+    func = lambda rgb: hls2rgb_array(rgb2hls_array(rgb) ** 2)
+    cube = ColorCube.from_function(func, size=5)
+    for interpolation in ("trilinear", "nearest"):
+        assert_allclose(cube.apply(points, interpolation=interpolation), func(points), atol=1e-12)
+
+    try:
+        cube.apply(image, interpolation="dummy")
+        assert False
+    except ValueError:
+        assert True
+    try:
+        ColorCube(np.zeros((3, 4, 3, 3)))
+        assert False
+    except ValueError:
+        assert True
+
+
+def test_cube_uint8():
+    cube = ColorCube.from_function(lambda rgb: rgb, size=256, dtype="uint8")
+    assert cube.table.dtype == np.uint8
+    image = _image()
+    assert (cube.apply(image) == image).all()
+    func = lambda rgb: hls2rgb_array(rgb2hls_array(rgb))
+    cube = ColorCube.from_function(func, size=9, dtype="uint8")
+    assert (cube.apply(image) == image).all()
+
+
+def test_cube_names():
+    cube = ColorCube.nearest_names(size=9)
+    assert cube.table.shape == (9, 9, 9, 1)
+    points = np.array([[255, 0, 0], [0, 0, 255], [255, 255, 255]], dtype=np.uint8)
+    indices = cube.apply(points, interpolation="nearest")
+    assert indices.shape == (3,)
+    from colormap.nearest import _get_index
+
+    assert list(_get_index("rgb").names[indices]) == list(nearest_name(points / 255)[0])
+
+    # index cubes are never interpolated
+    assert cube.kind == "index"
+    image = _image()
+    assert (cube.apply(image) == cube.apply(image, interpolation="nearest")).all()
+    try:
+        cube.apply(image, interpolation="trilinear")
+        assert False
+    except ValueError:
+        assert True
+    try:
+        ColorCube(cube.table, kind="dummy")
+        assert False
+    except ValueError:
+        assert True
+
+
+def test_save_load(tmpdir):
+    filename = os.path.join(str(tmpdir), "cube.npy")
+    cube = ColorCube.from_function(rgb2yuv_array, size=5, dtype="float32")
+    cube.save(filename)
+    loaded = ColorCube.load(filename)
+    assert isinstance(loaded.table, np.memmap)
+    assert (loaded.table == cube.table).all()
+    assert (loaded.apply(_image()) == cube.apply(_image())).all()
+    assert not isinstance(ColorCube.load(filename, mmap=False).table, np.memmap)
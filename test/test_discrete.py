@@ -0,0 +1,49 @@
+import numpy as np
+from numpy.testing import assert_allclose
+
+from colormap import Color, Colormap
+from colormap.discrete import DiscreteColormap
+
+
+def test_discrete():
+    dcmap = Colormap().cmap_discrete(["blue", Color("red"), "#00FF00"], [0, 1, 2.5, 10])
+    assert isinstance(dcmap, DiscreteColormap) and dcmap.N == 3
+    assert dcmap.lut.shape == (6, 4)
+    data = np.array([-1, 0, 0.5, 1, 2.5, 9.99, 10, 20, np.nan, np.inf, -np.inf])
+    assert dcmap.digitize(data).tolist() == [3, 0, 0, 1, 2, 2, 4, 4, 5, 4, 3]
+
+    rgba = dcmap(data)
+    assert_allclose(rgba, dcmap.lut[dcmap.digitize(data)])
+    assert_allclose(rgba[1], (0, 0, 1, 1))
+    assert_allclose(rgba[8], (0, 0, 0, 0))
+    assert dcmap(data, bytes=True).dtype == np.uint8
+    assert dcmap(data, bytes=True)[3].tolist() == [255, 0, 0, 255]
+    assert dcmap(5.0).tolist() == [0, 1, 0, 1]
+
+
+def test_discrete_matches_matplotlib():
+    dcmap = DiscreteColormap(["blue", "white", "red", "black"], [-5, -1, 0, 1, 5], under="yellow", over="cyan")
+    data = np.random.default_rng(0).normal(0, 3, (50, 40)).astype(np.float32)
+    data[0, :5] = np.nan
+    data[1, :4] = [-5, -1, 0, 5]
+    masked = np.ma.masked_invalid(data)
+    expected = dcmap.cmap(dcmap.norm(masked))
+    assert_allclose(dcmap(data, chunksize=100), expected)
+    assert (dcmap(data, bytes=True) == dcmap.cmap(dcmap.norm(masked), bytes=True)).all()
+
+    out = np.empty(data.shape + (4,), dtype=np.uint8)
+    assert dcmap(data, bytes=True, out=out) is out
+    try:
+        dcmap(data, out=np.empty((2, 2, 4)))
+        assert False
+    except ValueError:
+        assert True
+
+
+def test_discrete_errors():
+    for colors, boundaries in ((["red", "blue"], [0, 1]), (["red", "blue"], [0, 2, 1]), ([], [0])):
+        try:
+            DiscreteColormap(colors, boundaries)
+            assert False
+        except ValueError:
+            assert True
@@ -1,3 +1,5 @@
+import pytest
+
 from colormap import cmap_builder as get_cmap
 
 
@@ -14,3 +16,33 @@ def test_get_cmap():
 
     get_cmap('red', 'black', 'yellow')
     get_cmap('red', 'black')
+
+
+@pytest.mark.filterwarnings("ignore::PendingDeprecationWarning")
+def test_cmap_cache():
+    from colormap import cmap_cache
+
+    import numpy as np
+
+    x = np.linspace(0, 1, 20)
+    cmap_cache.clear()
+    cmap = get_cmap("red", "white", "blue")
+    info = cmap_cache.info()
+    # a single entry per colormap
+    assert info.currsize == 1
+    assert np.allclose(get_cmap("Red", "#FFFFFF", "blue")(x), cmap(x))
+    assert cmap_cache.info().hits == info.hits + 1
+    assert cmap_cache.info().misses == info.misses
+    assert np.allclose(get_cmap("red", "white", "blue", reverse=True)(x), cmap(x[::-1]))
+    assert get_cmap("red", "white", "blue", N=10).N == 10
+    assert np.allclose(get_cmap("heat", reverse=True)(x), get_cmap("heat_r")(x))
+    # the callers get their own copy
+    cmap.set_under("black")
+    assert get_cmap("red", "white", "blue")(-1.0) == (1, 0, 0, 1)
+
+    cmap_cache.maxsize = 1
+    assert len(cmap_cache) == 1
+    cmap_cache.maxsize = 128
+    cmap_cache.clear()
+    assert cmap_cache.info() == (0, 0, 128, 0)
+    assert get_cmap("red", "white", "blue") is not cmap
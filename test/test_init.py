@@ -0,0 +1,23 @@
+import subprocess
+import sys
+
+import colormap
+
+
+def test_lazy_attributes():
+    assert "Spectral" in colormap.colormap_names
+    assert "red_black_blue" in colormap.colormap_names
+    assert colormap.test_cmap == colormap.test_colormap
+    assert isinstance(colormap.version, str)
+    assert "colormap_names" in dir(colormap)
+    try:
+        colormap.dummy
+        assert False
+    except AttributeError:
+        assert True
+
+
+def test_import_does_not_load_matplotlib():
+    code = "import sys, colormap; colormap.hex2rgb('#FFF'); print('matplotlib' in sys.modules)"
+    output = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True)
+    assert output.stdout.strip() == "False"
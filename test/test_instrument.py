@@ -0,0 +1,80 @@
+import colormap
+from colormap import Color, Colormap, colors, instrument
+
+
+def test_disabled():
+    instrument.disable()
+    instrument.reset()
+    hex2rgb = colors.hex2rgb
+    Color("red")
+    assert instrument.snapshot()["calls"] == {}
+    assert instrument.is_enabled() is False
+
+    instrument.enable()
+    assert colors.hex2rgb is not hex2rgb
+    assert colormap.hex2rgb is colors.hex2rgb
+    instrument.disable()
+    assert colors.hex2rgb is hex2rgb and colormap.hex2rgb is hex2rgb
+
+
+def test_recording():
+    instrument.reset()
+    events = []
+    with instrument.recording(callback=lambda name, seconds: events.append(name)):
+        assert instrument.is_enabled()
+        Color("#FF0000")
+        colors.hex2rgb("#FFAA11")
+        "viridis" in colors.colormap_registry
+        colormap.cmap_builder("red", "white", "blue")
+        Colormap().cmap("viridis")
+    assert instrument.is_enabled() is False
+
+    snapshot = instrument.snapshot()
+    calls = snapshot["calls"]
+    assert set(calls) <= set(instrument.targets)
+    for name in ("Color.__init__", "hex2rgb", "parse_hex_color", "ColormapRegistry.__contains__", "cmap_builder", "Colormap.cmap"):
+        assert calls[name]["count"] >= 1
+        assert calls[name]["total"] >= calls[name]["mean"] > 0
+    assert calls["cmap_builder"]["count"] == 1
+    assert events.count("cmap_builder") == 1
+
+    cache = snapshot["caches"]["cmap_cache"]
+    assert cache["hits"] + cache["misses"] > 0
+    assert 0 <= cache["hit_rate"] <= 1
+    assert snapshot["caches"]["disk_cache"]["maxsize"] is None
+
+    instrument.reset()
+    assert instrument.snapshot()["calls"] == {}
+
+
+def test_errors_are_recorded():
+    instrument.reset()
+    with instrument.recording():
+        try:
+            colors.hex2rgb("dummy")
+            assert False
+        except Exception:
+            assert True
+    assert instrument.snapshot()["calls"]["hex2rgb"]["count"] == 1
+
+
+def test_module_imported_while_enabled():
+    import sys
+
+    hex2rgb = colors.hex2rgb
+    previous = sys.modules.pop("colormap.colorarray", None)
+    instrument.reset()
+    try:
+        instrument.enable()
+        try:
+            # a fresh import holds the timed functions
+            from colormap import colorarray
+        finally:
+            instrument.disable()
+        assert colorarray.hex2rgb_array is colors.hex2rgb_array
+        assert colors.hex2rgb is hex2rgb and "<locals>" not in colors.hex2rgb_array.__qualname__
+        colorarray.hex2rgb_array(["#FF0000"])
+        assert "hex2rgb_array" not in instrument.snapshot()["calls"]
+    finally:
+        if previous is not None:
+            sys.modules["colormap.colorarray"] = colormap.colorarray = previous
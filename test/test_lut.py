@@ -0,0 +1,165 @@
+import numpy as np
+from numpy.testing import assert_allclose
+
+from colormap import Color, Colormap, cmap_builder
+from colormap.lut import listed_cmap, lut_builder
+
+
+def _mpl_lut(cmap):
+    cmap._init()
+    return cmap._lut[: cmap.N]
+
+
+def test_lut_builder_dict():
+    d = {"blue": [0, 0, 0, 1, 1, 1, 0], "green": [0, 1, 1, 1, 0, 0, 0], "red": [1, 1, 0, 0, 0, 1, 1]}
+    for N in (256, 10):
+        lut = lut_builder(d, N=N)
+        assert lut.shape == (N, 4) and lut.dtype == np.float32
+        assert_allclose(lut, _mpl_lut(Colormap().cmap(d, N=N)), atol=1e-6)
+    assert_allclose(lut_builder(d, reverse=True), lut_builder(d)[::-1])
+    lut = lut_builder(dict(d, alpha=[0, 1]), N=3)
+    assert_allclose(lut[:, 3], [0, 0.5, 1])
+
+
+def test_lut_builder_colors():
+    lut = lut_builder(["red", "white", "#0000FF"], dtype="float64")
+    assert (lut == _mpl_lut(Colormap().cmap_linear("red", "white", "blue"))).all()
+    lut8 = lut_builder(["red", "white", "blue"], dtype=np.uint8)
+    assert lut8.dtype == np.uint8
+    assert (lut8 == cmap_builder("red", "white", "blue")(np.linspace(0, 1, 256), bytes=True)).all()
+    try:
+        lut_builder(["red"])
+        assert False
+    except ValueError:
+        assert True
+    try:
+        lut_builder(["red", "blue"], dtype=int)
+        assert False
+    except TypeError:
+        assert True
+
+
+def test_lut_builder_names():
+    lut = lut_builder("viridis")
+    assert_allclose(lut, _mpl_lut(cmap_builder("viridis")), atol=1e-6)
+    assert lut_builder("red_black_blue").shape == (256, 4)
+    assert lut_builder(cmap_builder("heat"), N=5).shape == (5, 4)
+
+
+def test_listed_cmap():
+    lut = lut_builder(["red", "white", "blue"])
+    cmap = listed_cmap(lut, name="test")
+    assert cmap.N == 256 and cmap.name == "test"
+    assert_allclose(cmap(np.arange(256)), lut, atol=1e-6)
+    cmap = listed_cmap(lut_builder(["red", "white", "blue"], dtype="uint8"))
+    assert_allclose(cmap(np.arange(256)), lut, atol=1 / 255)
+
+
+def test_lut_builder_interp_space():
+    from colormap.colors import lab2rgb_array, rgb2lab_array, rgb2lch_array, rgb2oklab_array
+
+    rgb = np.array([[0.8, 0.3, 0.2], [0.3, 0.5, 0.4], [0.2, 0.3, 0.7], [0.9, 0.9, 0.9]])
+    for space, to_space in [("lab", rgb2lab_array), ("oklab", rgb2oklab_array)]:
+        lut = lut_builder([Color(rgb=tuple(x)) for x in rgb], N=7, dtype="float64", interp_space=space)
+        assert lut.shape == (7, 4)
+        # anchors are preserved and midpoints are the average in that space
+        assert_allclose(lut[::2, :3], rgb, atol=1e-9)
+        expected = (to_space(rgb[:-1]) + to_space(rgb[1:])) / 2
+        assert_allclose(to_space(lut[1::2, :3]), expected, atol=1e-9)
+
+    # in LCh, hues follow the shortest arc and greys take the hue of the other anchor
+    lut = lut_builder(["red", "magenta"], N=3, dtype="float64", interp_space="lch")
+    hues = rgb2lch_array(lut[:, :3])[:, 2]
+    hues = (hues + 180) % 360 - 180
+    assert hues[2] < hues[1] < hues[0]
+    lut = lut_builder(["white", Color(rgb=(0.7, 0.4, 0.4))], N=3, dtype="float64", interp_space="lch")
+    assert_allclose(rgb2lch_array(lut[1, :3])[2], rgb2lch_array([0.7, 0.4, 0.4])[2], atol=1e-6)
+
+    # dictionaries, with an alpha channel
+    d = {"red": [1, 0], "green": [0, 0], "blue": [0, 1], "alpha": [1, 0]}
+    lut = lut_builder(d, N=3, dtype="float64", interp_space="lab")
+    assert_allclose(lut[1, :3], lab2rgb_array(rgb2lab_array([[1, 0, 0], [0, 0, 1]]).mean(axis=0)))
+    assert_allclose(lut[:, 3], [1, 0.5, 0])
+    assert_allclose(lut_builder(d, interp_space="rgb"), lut_builder(d))
+
+    for invalid in ({"red": [1, 0], "green": [0]}, "viridis"):
+        try:
+            lut_builder(invalid, interp_space="lab")
+            assert False
+        except ValueError:
+            assert True
+    try:
+        lut_builder(["red", "blue"], interp_space="hsv")
+        assert False
+    except ValueError:
+        assert True
+
+
+def test_lut_builder_reverse_shares_memory():
+    d = {"blue": [0, 0, 1], "green": [0, 0.5, 1], "red": [1, 1, 1]}
+    colors = ["red", "white", "blue"]
+    for spec in (d, colors, "heat"):
+        forward = lut_builder(spec, N=16)
+        reverse = lut_builder(spec, N=16, reverse=True)
+        assert np.shares_memory(forward, reverse)
+        assert (reverse == forward[::-1]).all()
+        assert forward is lut_builder(spec, N=16)
+        assert not forward.flags.writeable and not reverse.flags.writeable
+    assert d == {"blue": [0, 0, 1], "green": [0, 0.5, 1], "red": [1, 1, 1]}
+    assert colors == ["red", "white", "blue"]
+    assert lut_builder(d, N=16) is not lut_builder(d, N=16, dtype="uint8")
+
+
+def test_disk_cache(tmpdir):
+    import os
+
+    from colormap.cache import DiskCache, cmap_cache, disk_cache
+
+    cache = DiskCache(str(tmpdir))
+    table = np.arange(12.0).reshape(3, 4)
+    assert cache.get(("a", 1)) is None
+    assert cache.get_or_build(("a", 1), lambda: table) is table
+    loaded = cache.get(("a", 1))
+    assert isinstance(loaded, np.memmap) and not loaded.flags.writeable
+    assert (loaded == table).all()
+    assert cache.filename(("a", 1)).startswith(cache.path)
+    assert cache.info().currsize == 1 and cache.info().hits == 1
+    # only the files of the cache are removed
+    tmpdir.mkdir("other").join("data.npy").write("x")
+    tmpdir.join("notes.txt").write("x")
+    with open(os.path.join(cache.path, "notes.txt"), "w") as fout:
+        fout.write("x")
+    cache.clear()
+    assert cache.get(("a", 1)) is None and cache.info().currsize == 0
+    assert tmpdir.join("other", "data.npy").check() and tmpdir.join("notes.txt").check()
+    assert os.listdir(cache.path) == ["notes.txt"]
+    os.unlink(os.path.join(cache.path, "notes.txt"))
+    cache.clear()
+    assert not os.path.exists(cache.path)
+
+    # a new version does not see the tables of the previous one
+    cache.put(("a", 1), table)
+    cache._version = "0.0.0"
+    assert cache.get(("a", 1)) is None
+
+    # disabled cache
+    cache = DiskCache()
+    assert not cache.enabled and cache.get_or_build("a", lambda: 1) == 1
+
+    # lookup tables built by lut_builder are stored on disk and memory-mapped
+    previous = disk_cache.directory
+    disk_cache.directory = str(tmpdir)
+    try:
+        lut = lut_builder(["red", "black", "blue"], N=32)
+        cmap_cache.clear()
+        loaded = lut_builder(["red", "black", "blue"], N=32)
+        assert isinstance(loaded, np.memmap) and (loaded == lut).all()
+        assert np.shares_memory(loaded, lut_builder(["red", "black", "blue"], N=32, reverse=True))
+        # named colormaps depend on matplotlib: not stored on disk
+        n = disk_cache.info().currsize
+        lut_builder("heat", N=32)
+        lut_builder("viridis", N=32)
+        assert disk_cache.info().currsize == n
+    finally:
+        disk_cache.directory = previous
+        cmap_cache.clear()
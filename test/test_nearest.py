@@ -0,0 +1,47 @@
+import numpy as np
+from numpy.testing import assert_allclose
+
+from colormap import Color
+from colormap.nearest import NamedColorIndex, nearest_name
+from colormap.xfree86 import XFree86_index
+
+
+def test_nearest_name():
+    # exact matches
+    for hexa, name in list(XFree86_index.hexes.items())[:20]:
+        assert nearest_name(Color(hexa).rgb) == (name, 0)
+        assert nearest_name(Color(hexa).rgb, space="lab")[0] == name
+
+    name, distance = nearest_name((1, 0.1, 0))
+    assert name == "Red" and np.isclose(distance, 0.1)
+
+    rgb = np.random.default_rng(0).random((10, 20, 3))
+    names, distances = nearest_name(rgb)
+    assert names.shape == distances.shape == (10, 20)
+    names, distances = nearest_name(rgb * 255, normalised=False, space="lab")
+    assert names.shape == (10, 20)
+
+    try:
+        nearest_name([0, 0])
+        assert False
+    except ValueError:
+        assert True
+
+
+def test_named_color_index():
+    rgb = np.random.default_rng(1).random((1000, 3))
+    for space in ("rgb", "lab"):
+        index = NamedColorIndex(space=space)
+        indices, distances = index.query(rgb)
+        # vectorised search without KD-tree
+        index._tree = None
+        indices2, distances2 = index.query(rgb, chunksize=100)
+        assert_allclose(distances, distances2)
+
+    index = NamedColorIndex({"#FF0000": "red", "#0000FF": "blue"})
+    assert index.names[index.query([[0.9, 0, 0.1]])[0]].tolist() == ["red"]
+    try:
+        NamedColorIndex(space="dummy")
+        assert False
+    except ValueError:
+        assert True
@@ -0,0 +1,93 @@
+import numpy as np
+from numpy.testing import assert_allclose
+
+from colormap import Color
+from colormap.quantize import Quantizer, _nearest, extract_palette, get_palette, quantize
+
+
+def _image():
+    return np.random.default_rng(0).integers(0, 256, (60, 50, 3), dtype=np.uint8)
+
+
+def test_get_palette():
+    assert get_palette("Set1").shape == (9, 3)
+    assert len(get_palette("xfree86")) > 100
+    assert_allclose(get_palette(["red", Color("blue")]), [[1, 0, 0], [0, 0, 1]])
+    assert_allclose(get_palette(np.array([[255, 0, 0]], dtype=np.uint8)), [[1, 0, 0]])
+    try:
+        get_palette("jet")
+        assert False
+    except ValueError:
+        assert True
+
+
+def test_quantize():
+    image = _image()
+    palette = get_palette("Set1")
+    result = quantize(image, "Set1", chunksize=100)
+    assert result.shape == image.shape and result.dtype == np.uint8
+
+    # brute force reference
+    pixels = image.reshape(-1, 1, 3) / 255
+    expected = ((pixels - palette[None]) ** 2).sum(axis=-1).argmin(axis=1).reshape(60, 50)
+    assert (Quantizer("Set1").indices(image) == expected).all()
+    assert (result == np.round(palette * 255).astype(np.uint8)[expected]).all()
+    # the distances are computed by blocks of about chunksize values
+    quantizer = Quantizer("xfree86", chunksize=500)
+    assert (quantizer.indices(image) == Quantizer("xfree86").indices(image)).all()
+    assert (_nearest(pixels[:, 0], palette, chunksize=4) == expected.ravel()).all()
+
+    result = quantize(image / 255, ["red", "green", "blue"])
+    assert result.dtype == float
+    expected = {tuple(Color(x).rgb) for x in ("red", "green", "blue")}
+    assert set(map(tuple, result.reshape(-1, 3).tolist())) <= expected
+
+
+def test_quantize_integer_types():
+    image = _image().astype(np.uint16)
+    for func in (
+        lambda: quantize(image, "Set1"),
+        lambda: quantize(image, "Set1", cube_bits=5),
+        lambda: extract_palette(image.astype(np.int32), 4),
+        lambda: get_palette(np.array([[255, 0, 0]])),
+    ):
+        try:
+            func()
+            assert False
+        except TypeError:
+            assert True
+
+
+def test_quantize_cube():
+    image = _image()
+    quantizer = Quantizer("xfree86", cube_bits=5)
+    assert quantizer.cube.shape == (32, 32, 32)
+    indices = quantizer.indices(image)
+    exact = Quantizer("xfree86").indices(image)
+    # pixels of a cell share the color of the cell center
+    assert (indices == exact).mean() > 0.5
+    assert (quantizer.indices(image / 255) == indices).all()
+    assert (Quantizer(["red", "blue"], cube_bits=8).indices(image) == Quantizer(["red", "blue"]).indices(image)).mean() > 0.99
+    try:
+        Quantizer("Set1", cube_bits=9)
+        assert False
+    except ValueError:
+        assert True
+
+
+def test_extract_palette():
+    rng = np.random.default_rng(0)
+    centers = np.array([[0.9, 0.1, 0.1], [0.1, 0.9, 0.1], [0.1, 0.1, 0.9]])
+    image = centers[rng.integers(0, 3, 5000)] + rng.normal(0, 0.01, (5000, 3))
+    palette = extract_palette(image, 3, method="median_cut")
+    assert palette.shape == (3, 3)
+    assert palette.min() >= 0 and palette.max() <= 1
+    palette = extract_palette(image, 3, method="kmeans")
+    assert_allclose(sorted(np.round(palette, 1).tolist()), sorted(centers.tolist()), atol=0.02)
+    assert len(extract_palette(np.zeros((10, 10, 3)), 4)) == 1
+    assert extract_palette(_image(), 8, method="kmeans", sample=1000).shape == (8, 3)
+    try:
+        extract_palette(image, 3, method="dummy")
+        assert False
+    except ValueError:
+        assert True